@@ -60,37 +60,11 @@ def create_app():
         
         # Run Database Migrations
         try:
-            from sqlalchemy import text
+            from migrations import run_migrations
             with app.app_context():
-                print("[PROCESS] Running automatic database migration...")
-                migration_configs = [
-                    # users table
-                    ("users", "resume_text", "TEXT"),
-                    ("users", "resume_link", "VARCHAR(500)"),
-                    ("users", "resume_updated_at", "DATETIME"),
-                    ("users", "email_verified", "BOOLEAN DEFAULT FALSE"),
-                    ("users", "two_factor_enabled", "BOOLEAN DEFAULT FALSE"),
-                    
-                    # tracked_events table
-                    ("tracked_events", "match_score", "INTEGER"),
-                    ("tracked_events", "match_explanation", "TEXT"),
-                ]
-                
-                for table, col, type_def in migration_configs:
-                    try:
-                        if 'sqlite' in app.config['SQLALCHEMY_DATABASE_URI']:
-                            res = db.session.execute(text(f"PRAGMA table_info({table})")).fetchall()
-                            if not any(row[1] == col for row in res):
-                                db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN {col} {type_def}"))
-                                db.session.commit()
-                                print(f"[SUCCESS] Added column {col} to {table}")
-                        else:
-                            db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {col} {type_def}"))
-                            db.session.commit()
-                    except Exception as col_e:
-                        print(f"[INFO] Column {col} in {table} skipped: {col_e}")
-
-                print("[SUCCESS] Database migration finished")
+                print("[PROCESS] Running database migrations...")
+                applied = run_migrations(db.engine)
+                print(f"[SUCCESS] Database migration finished ({len(applied)} applied)")
         except Exception as e:
             print(f"[ERROR] Automatic migration failed: {e}")
         
@@ -102,6 +76,15 @@ def create_app():
         except Exception as e:
             print(f"Warning: Scheduler could not be started: {e}")
 
+        # Scans and cleanups only run where the job queue is consumed: `python worker.py`,
+        # or this thread when JOB_WORKER_EMBEDDED is on (local development)
+        if Config.JOB_WORKER_EMBEDDED:
+            try:
+                from services.job_queue import start_embedded_worker
+                start_embedded_worker(app)
+            except Exception as e:
+                print(f"Warning: Embedded job worker could not be started: {e}")
+
     # Run startup tasks in background thread so server starts immediately
     import threading
     startup_thread = threading.Thread(target=run_startup_tasks, daemon=True)
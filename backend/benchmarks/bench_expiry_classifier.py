@@ -0,0 +1,129 @@
+"""
+CPU cost of expiry classification per page: the old per-pattern re.search
+loop over a lowercased slice against the anchor-filtered ExpiryClassifier.
+Pages come from a directory of saved pages (.html is cleaned the way the page
+cache does it, .txt is used as is) or, without --corpus, from a generated one.
+Both classifiers must agree on every page; disagreements are listed.
+
+    cd backend && python -m benchmarks.bench_expiry_classifier [--corpus DIR] [--repeat 50]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.page_cache import clean_html_text
+from services.expiry_classifier import ExpiryClassifier
+
+# The patterns and loop is_opportunity_expired_centralized used before the classifier
+LEGACY_SIGNALS = [
+    r'registration[s]?\s+(is|are|have been)\s+closed',
+    r'no longer accepting\s+(responses|applications|entries)',
+    r'applications\s+are\s+closed',
+    r'this form is no longer accepting responses',
+    r'opportunity has expired',
+    r'registrations?\s+closed',
+    r'event is no longer active',
+    r'not accepting any more entries',
+]
+
+FILLER = ("Join developers from around the world for a weekend of building. Prizes worth $10,000, "
+          "mentorship sessions, workshops and swag. Teams of up to four members. Judging criteria: "
+          "impact, technical depth, design and presentation. Eligibility: students and professionals.")
+
+CLOSING = [
+    "Registrations are closed for this edition.",
+    "This form is no longer accepting responses",
+    "Applications are closed. Thank you for your interest!",
+    "This opportunity has expired.",
+    "The event is no longer active.",
+]
+
+URLS = [
+    'https://example-hackathon.dev/register',
+    'https://docs.google.com/forms/d/e/abc/viewform',
+    'https://some-event.devfolio.co/',
+    'https://unstop.com/hackathons/some-hackathon-123',
+]
+
+
+def legacy_classify(text):
+    text = text[:4000].lower()
+    matches = 0
+    for pattern in LEGACY_SIGNALS:
+        if re.search(pattern, text):
+            matches += 1
+    return matches >= 1
+
+
+def load_corpus(directory):
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        with open(path, encoding='utf-8', errors='replace') as handle:
+            content = handle.read()
+        if name.endswith(('.html', '.htm')):
+            content = clean_html_text(content, max_chars=8000)
+        elif not name.endswith('.txt'):
+            continue
+        pages.append((name, URLS[0], content))
+    return pages
+
+
+def generate_corpus(count):
+    """Mostly open pages; a fifth carry a closure notice somewhere in the first 4000 chars"""
+    rng = random.Random(7)
+    pages = []
+    for i in range(count):
+        lines = [FILLER[rng.randint(0, 40):] for _ in range(rng.randint(10, 40))]
+        if i % 5 == 0:
+            lines.insert(rng.randint(0, min(len(lines), 15)), rng.choice(CLOSING))
+        pages.append((f'page-{i}', URLS[i % len(URLS)], '\n'.join(lines)))
+    return pages
+
+
+def timed(label, func, pages, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for _, url, text in pages:
+            func(text, url)
+    per_page_us = (time.perf_counter() - started) * 1e6 / (repeat * len(pages))
+    print(f"{label:<34} {per_page_us:8.2f} us/page")
+    return per_page_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', help='directory of saved pages (.html or .txt)')
+    parser.add_argument('--pages', type=int, default=500, help='generated pages when no --corpus is given')
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus) if args.corpus else generate_corpus(args.pages)
+    if not pages:
+        sys.exit('No pages to classify')
+    classifier = ExpiryClassifier()
+    print(f"{len(pages)} pages, {sum(len(text) for _, _, text in pages) // len(pages)} chars on average")
+
+    legacy = timed('legacy (8 x re.search, lower())', lambda text, url: legacy_classify(text), pages, args.repeat)
+    current = timed('ExpiryClassifier.classify', classifier.classify, pages, args.repeat)
+    print(f"speedup: {legacy / current:.1f}x")
+
+    expired = 0
+    signals = {}
+    for name, url, text in pages:
+        verdict = classifier.classify(text, url)
+        if verdict:
+            expired += 1
+            signals[verdict.signal] = signals.get(verdict.signal, 0) + 1
+        if verdict.expired != legacy_classify(text):
+            print(f"  differs on {name} ({url}): classifier={verdict.expired} signal={verdict.signal}")
+    print(f"expired: {expired}/{len(pages)} {signals}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Page text extraction: the previous BeautifulSoup version of clean_html_text
+(full tree, then cut to max_chars) against the streaming extractor in
+services.html_text, which stops parsing once max_chars of text are in.
+Pages come from a directory of saved .html files or, without --corpus, from
+generated listing pages shaped like Devpost/Internshala (inline scripts,
+navigation, hundreds of cards). Outputs are compared for every page.
+
+    cd backend && python -m benchmarks.bench_html_text [--corpus DIR] [--max-chars 8000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from services.html_text import html_to_text
+
+
+def legacy_clean_html_text(html, max_chars=None):
+    """clean_html_text as it was before the streaming extractor"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for element in soup(["script", "style", "nav", "footer", "header"]):
+        element.extract()
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = '\n'.join(chunk for chunk in chunks if chunk)
+    return text[:max_chars] if max_chars else text
+
+
+def load_corpus(directory):
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(('.html', '.htm')):
+            with open(os.path.join(directory, name), encoding='utf-8', errors='replace') as handle:
+                pages.append((name, handle.read()))
+    return pages
+
+
+def generate_page(rng, cards):
+    parts = [
+        '<!DOCTYPE html><html><head><title>Hackathons</title>',
+        '<script>window.__STATE__ = %s;</script>' % ('{"k": "%s"}' % ('x' * rng.randint(50000, 200000))),
+        '<style>.card{display:flex}</style></head><body>',
+        '<header><nav>' + ''.join(f'<a href="/n{i}">Link {i}</a>' for i in range(60)) + '</nav></header>',
+        '<main>'
+    ]
+    for i in range(cards):
+        parts.append(
+            f'<div class="card"><h3>  Hackathon {i}  </h3>\n<p class="meta">Online &middot; '
+            f'{rng.randint(100, 5000)} participants</p>\n<p>Prizes worth ${rng.randint(1, 50)},000. '
+            f'Register before {rng.randint(1, 28)} Nov.</p><script>track({i})</script></div>\n'
+        )
+    parts.append('</main><footer>About &copy; 2025</footer></body></html>')
+    return ''.join(parts)
+
+
+def timed(label, func, pages, max_chars, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for _, html in pages:
+            func(html, max_chars)
+    per_page_ms = (time.perf_counter() - started) * 1000 / (repeat * len(pages))
+    print(f"{label:<34} {per_page_ms:9.2f} ms/page")
+    return per_page_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', help='directory of saved .html pages')
+    parser.add_argument('--pages', type=int, default=10, help='generated pages when no --corpus is given')
+    parser.add_argument('--max-chars', type=int, default=8000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = load_corpus(args.corpus)
+    else:
+        rng = random.Random(7)
+        pages = [(f'listing-{i}', generate_page(rng, rng.randint(300, 1500))) for i in range(args.pages)]
+    if not pages:
+        sys.exit('No pages to extract')
+    print(f"{len(pages)} pages, {sum(len(html) for _, html in pages) // len(pages) // 1024} KB on average, "
+          f"max_chars={args.max_chars}")
+
+    legacy = timed('BeautifulSoup (legacy)', legacy_clean_html_text, pages, args.max_chars, args.repeat)
+    current = timed('streaming html_to_text', html_to_text, pages, args.max_chars, args.repeat)
+    print(f"speedup: {legacy / current:.1f}x")
+
+    for name, html in pages:
+        if legacy_clean_html_text(html, args.max_chars) != html_to_text(html, args.max_chars):
+            print(f"  output differs on {name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Query plans and timings for the hot filter queries, before and after the
+m0002 index migration. Builds a throwaway SQLite database, seeds it, drops
+the indexes, measures, applies the migration and measures again.
+
+    cd backend && python -m benchmarks.bench_index_plans [--rows 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from models import db
+from migrations import m0002_hot_filter_indexes as index_migration
+
+QUERIES = [
+    ('approved hackathons by deadline',
+     "SELECT id FROM hackathons WHERE status = 'approved' ORDER BY deadline LIMIT 20", {}),
+    ('newest approved internships',
+     "SELECT id FROM internships WHERE status = 'approved' ORDER BY created_at DESC LIMIT 20", {}),
+    ('scanner duplicate check (hackathon title)',
+     "SELECT id FROM hackathons WHERE title = :title LIMIT 1", {'title': 'Hackathon 777'}),
+    ('scanner duplicate check (internship title + company)',
+     "SELECT id FROM internships WHERE title = :title AND company = :company LIMIT 1",
+     {'title': 'Intern 777', 'company': 'Company 7'}),
+    ('unread-count poll',
+     "SELECT count(*) FROM notifications WHERE user_id = :user_id AND is_read = 0", {'user_id': 42}),
+    ('notification list',
+     "SELECT id FROM notifications WHERE user_id = :user_id ORDER BY created_at DESC LIMIT 50", {'user_id': 42}),
+    ('tracker lookup',
+     "SELECT id FROM tracked_events WHERE user_id = :user_id AND event_type = 'hackathon' AND event_id = :event_id",
+     {'user_id': 42, 'event_id': 777}),
+    ('applications for an event',
+     "SELECT id FROM applications WHERE event_type = 'internship' AND event_id = :event_id", {'event_id': 777}),
+]
+
+
+def seed(conn, rows):
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    statuses = ['approved', 'approved', 'approved', 'pending', 'rejected']
+    users = max(rows // 100, 50)
+
+    conn.execute(text("INSERT INTO users (id, username, email) VALUES (:id, :u, :e)"),
+                 [{'id': i, 'u': f'user{i}', 'e': f'user{i}@example.com'} for i in range(1, users + 1)])
+    conn.execute(text(
+        "INSERT INTO hackathons (title, description, location, status, deadline, created_at) "
+        "VALUES (:title, 'd', 'Online', :status, :deadline, :created)"),
+        [{'title': f'Hackathon {i}', 'status': rng.choice(statuses),
+          'deadline': now + timedelta(days=rng.randint(-60, 120)),
+          'created': now - timedelta(minutes=i)} for i in range(rows)])
+    conn.execute(text(
+        "INSERT INTO internships (title, company, description, location, status, deadline, created_at) "
+        "VALUES (:title, :company, 'd', 'Remote', :status, :deadline, :created)"),
+        [{'title': f'Intern {i}', 'company': f'Company {i % 50}', 'status': rng.choice(statuses),
+          'deadline': now + timedelta(days=rng.randint(-60, 120)),
+          'created': now - timedelta(minutes=i)} for i in range(rows)])
+    conn.execute(text(
+        "INSERT INTO notifications (user_id, event_type, event_id, title, message, is_read, created_at) "
+        "VALUES (:user_id, 'hackathon', :event_id, 't', 'm', :is_read, :created)"),
+        [{'user_id': rng.randint(1, users), 'event_id': i, 'is_read': rng.random() < 0.7,
+          'created': now - timedelta(minutes=i)} for i in range(rows * 5)])
+    conn.execute(text(
+        "INSERT INTO tracked_events (user_id, event_type, event_id, status, created_at) "
+        "VALUES (:user_id, :event_type, :event_id, 'interested', :created)"),
+        [{'user_id': rng.randint(1, users), 'event_type': rng.choice(['hackathon', 'internship']),
+          'event_id': rng.randint(0, rows), 'created': now} for i in range(rows)])
+    conn.execute(text(
+        "INSERT INTO applications (user_id, event_type, event_id, name, email, created_at) "
+        "VALUES (:user_id, :event_type, :event_id, 'n', 'e', :created)"),
+        [{'user_id': rng.randint(1, users), 'event_type': rng.choice(['hackathon', 'internship']),
+          'event_id': rng.randint(0, rows), 'created': now} for i in range(rows)])
+
+
+def measure(conn, label, repeat):
+    print(f"\n=== {label} ===")
+    for name, sql, params in QUERIES:
+        plan = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params).fetchall()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(text(sql), params).fetchall()
+        elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+        print(f"{name:<52} {elapsed_ms:8.3f} ms")
+        for row in plan:
+            print(f"    {row[-1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine('sqlite://')
+    db.metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        index_migration.downgrade(conn)
+        seed(conn, args.rows)
+        conn.execute(text("ANALYZE"))
+        measure(conn, f"without indexes ({args.rows} rows per table)", args.repeat)
+
+        index_migration.upgrade(conn)
+        conn.execute(text("ANALYZE"))
+        measure(conn, "with m0002 indexes", args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -51,7 +51,106 @@ class Config:
     
     # Gemini AI settings
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
-    
+    # Re-list available Gemini models after this long, or after this many 404s from cached choices
+    MODEL_DISCOVERY_TTL_SECONDS = int(os.getenv('MODEL_DISCOVERY_TTL_SECONDS', 21600))
+    MODEL_REFRESH_AFTER_404S = int(os.getenv('MODEL_REFRESH_AFTER_404S', 3))
+    # Per-model circuit breaker: failures in a row before tripping, backoff range and how long
+    # a model that answered 403/404 stays out of rotation (seconds)
+    MODEL_BREAKER_FAILURES = int(os.getenv('MODEL_BREAKER_FAILURES', 3))
+    MODEL_BREAKER_BASE_SECONDS = float(os.getenv('MODEL_BREAKER_BASE_SECONDS', 5))
+    MODEL_BREAKER_MAX_SECONDS = float(os.getenv('MODEL_BREAKER_MAX_SECONDS', 600))
+    MODEL_UNAVAILABLE_SECONDS = float(os.getenv('MODEL_UNAVAILABLE_SECONDS', 3600))
+
+    # Batch match scoring (/api/tracker/match-all): opportunities per Gemini prompt, prompts in flight
+    MATCH_BATCH_SIZE = int(os.getenv('MATCH_BATCH_SIZE', 5))
+    MATCH_BATCH_CONCURRENCY = int(os.getenv('MATCH_BATCH_CONCURRENCY', 2))
+    # Local TF-IDF match index: how often (seconds) each process reads the catalog changes other
+    # processes committed (approvals, expiries, deletions)
+    MATCH_INDEX_CHECK_SECONDS = int(os.getenv('MATCH_INDEX_CHECK_SECONDS', 60))
+    # Opportunities kept per user in the "Recommended for you" feed
+    RECOMMEND_FEED_SIZE = int(os.getenv('RECOMMEND_FEED_SIZE', 100))
+    # Resume links: download cap (bytes), PDF pages and characters extracted, and how long the
+    # stored text is trusted before it is revalidated with a conditional GET (hours)
+    RESUME_MAX_BYTES = int(os.getenv('RESUME_MAX_BYTES', 5 * 1024 * 1024))
+    RESUME_MAX_PAGES = int(os.getenv('RESUME_MAX_PAGES', 10))
+    RESUME_MAX_CHARS = int(os.getenv('RESUME_MAX_CHARS', 20000))
+    RESUME_REVALIDATE_HOURS = int(os.getenv('RESUME_REVALIDATE_HOURS', 24))
+
+    # AI Scanner concurrency (thread pool size and max in-flight tasks per domain)
+    SCAN_MAX_WORKERS = int(os.getenv('SCAN_MAX_WORKERS', 8))
+    SCAN_PER_DOMAIN_LIMIT = int(os.getenv('SCAN_PER_DOMAIN_LIMIT', 2))
+
+    # Background job queue (background_jobs table) consumed by `python worker.py`: how often an
+    # idle worker polls, how long a claim lasts without a heartbeat, heartbeat interval, attempts
+    # per job and the first retry delay (doubles per attempt), all in seconds
+    JOB_POLL_SECONDS = float(os.getenv('JOB_POLL_SECONDS', 5))
+    JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', 120))
+    JOB_HEARTBEAT_SECONDS = int(os.getenv('JOB_HEARTBEAT_SECONDS', 30))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+    JOB_RETRY_BASE_SECONDS = int(os.getenv('JOB_RETRY_BASE_SECONDS', 60))
+    # Run a worker thread inside the web process too (local development; on Render the separate
+    # worker service consumes the queue)
+    JOB_WORKER_EMBEDDED = os.getenv('JOB_WORKER_EMBEDDED', 'false' if os.getenv('RENDER') else 'true').lower() == 'true'
+    # Only the process holding the scheduler lease (a row in app_settings) runs the scheduled
+    # jobs; if it stops renewing, another process takes over after this many seconds
+    SCHEDULER_LEASE_SECONDS = int(os.getenv('SCHEDULER_LEASE_SECONDS', 90))
+
+    # Link expiry sweeper (scheduled cleanup and admin purge): links fetched per sweep (the rest
+    # wait for the next one), rows per commit, fetch threads and concurrent fetches per host
+    EXPIRY_SWEEP_MAX_CHECKS = int(os.getenv('EXPIRY_SWEEP_MAX_CHECKS', 500))
+    EXPIRY_SWEEP_CHUNK = int(os.getenv('EXPIRY_SWEEP_CHUNK', 50))
+    EXPIRY_SWEEP_WORKERS = int(os.getenv('EXPIRY_SWEEP_WORKERS', 8))
+    EXPIRY_SWEEP_PER_HOST = int(os.getenv('EXPIRY_SWEEP_PER_HOST', 2))
+
+    # Shared outbound HTTP client (host pools kept, connections per host, timeouts in seconds)
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 20))
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 10))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 5))
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 15))
+
+    # Per-host politeness for scraping and link checks: requests per second and burst per host,
+    # longest a caller queues for a slot, backoff after a 429/503 without Retry-After (doubles per
+    # failure, capped) and how long a host's robots.txt Crawl-delay is kept (all in seconds)
+    HOST_RATE_PER_SECOND = float(os.getenv('HOST_RATE_PER_SECOND', 1.0))
+    HOST_BURST = int(os.getenv('HOST_BURST', 3))
+    HOST_MAX_WAIT_SECONDS = float(os.getenv('HOST_MAX_WAIT_SECONDS', 60))
+    HOST_BACKOFF_BASE_SECONDS = float(os.getenv('HOST_BACKOFF_BASE_SECONDS', 5))
+    HOST_BACKOFF_MAX_SECONDS = float(os.getenv('HOST_BACKOFF_MAX_SECONDS', 300))
+    ROBOTS_TTL_SECONDS = int(os.getenv('ROBOTS_TTL_SECONDS', 86400))
+    ROBOTS_MAX_CRAWL_DELAY = float(os.getenv('ROBOTS_MAX_CRAWL_DELAY', 30))
+
+    # Page-fetch cache (cleaned text per URL, revalidated with ETag/Last-Modified once stale)
+    PAGE_CACHE_MAX_ENTRIES = int(os.getenv('PAGE_CACHE_MAX_ENTRIES', 2000))
+    PAGE_CACHE_TTL_SECONDS = int(os.getenv('PAGE_CACHE_TTL_SECONDS', 1800))
+    PAGE_CACHE_ERROR_TTL_SECONDS = int(os.getenv('PAGE_CACHE_ERROR_TTL_SECONDS', 300))
+    PAGE_CACHE_MAX_CHARS = int(os.getenv('PAGE_CACHE_MAX_CHARS', 8000))
+    # Page downloads stop after this many bytes even if the text budget isn't filled yet
+    PAGE_MAX_BYTES = int(os.getenv('PAGE_MAX_BYTES', 2 * 1024 * 1024))
+
+    # Link health verdicts (per canonical URL): entries kept, how long alive / dead (404, 410) /
+    # error verdicts are trusted (seconds) and the timeout of one HEAD or ranged GET
+    LINK_HEALTH_MAX_ENTRIES = int(os.getenv('LINK_HEALTH_MAX_ENTRIES', 5000))
+    LINK_HEALTH_ALIVE_TTL_SECONDS = int(os.getenv('LINK_HEALTH_ALIVE_TTL_SECONDS', 21600))
+    LINK_HEALTH_DEAD_TTL_SECONDS = int(os.getenv('LINK_HEALTH_DEAD_TTL_SECONDS', 86400))
+    LINK_HEALTH_ERROR_TTL_SECONDS = int(os.getenv('LINK_HEALTH_ERROR_TTL_SECONDS', 900))
+    LINK_HEALTH_TIMEOUT = float(os.getenv('LINK_HEALTH_TIMEOUT', 5))
+
+    # Gemini response cache (ai_cache table)
+    AI_CACHE_TTL_HOURS = int(os.getenv('AI_CACHE_TTL_HOURS', 24))
+    AI_CACHE_MAX_ENTRIES = int(os.getenv('AI_CACHE_MAX_ENTRIES', 5000))
+    AI_CACHE_MAX_RESPONSE_CHARS = int(os.getenv('AI_CACHE_MAX_RESPONSE_CHARS', 20000))
+
+    # Notification stream (SSE): comment heartbeat interval, how often each web process polls the
+    # notifications table for new rows while streams are open, stream lifetime before the client
+    # reconnects, per-process stream cap, replay buffer size and how long an id skipped by the poller
+    # (a row whose transaction has not committed yet) is looked up again
+    SSE_HEARTBEAT_SECONDS = int(os.getenv('SSE_HEARTBEAT_SECONDS', 15))
+    SSE_POLL_SECONDS = float(os.getenv('SSE_POLL_SECONDS', 2))
+    SSE_MAX_STREAM_SECONDS = int(os.getenv('SSE_MAX_STREAM_SECONDS', 300))
+    SSE_MAX_STREAMS = int(os.getenv('SSE_MAX_STREAMS', 50))
+    NOTIFICATION_BUS_BUFFER = int(os.getenv('NOTIFICATION_BUS_BUFFER', 1000))
+    NOTIFICATION_BUS_LOOKBACK_SECONDS = float(os.getenv('NOTIFICATION_BUS_LOOKBACK_SECONDS', 30))
+
     # Email settings - Mailgun API
     MAIL_SERVICE = os.getenv('MAIL_SERVICE', 'brevo')  # 'smtp', 'mailgun', or 'brevo'
     
@@ -0,0 +1,10 @@
+"""
+Versioned schema migrations
+Each mNNNN_*.py module in this package defines VERSION, DESCRIPTION and
+upgrade(conn). Applied versions are recorded in the schema_migrations table,
+so every migration runs once per database. Run with `python -m migrations`
+or let app startup call run_migrations().
+"""
+from migrations.runner import run_migrations, pending_migrations, load_migrations
+
+__all__ = ['run_migrations', 'pending_migrations', 'load_migrations']
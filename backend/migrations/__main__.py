@@ -0,0 +1,25 @@
+"""Apply pending migrations: python -m migrations [--list]"""
+import sys
+from flask import Flask
+from config import Config
+from models import db
+from migrations import run_migrations, pending_migrations
+
+
+def main():
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        if '--list' in sys.argv:
+            for module in pending_migrations(db.engine):
+                print(f"{module.VERSION:04d}  {module.DESCRIPTION}")
+            return
+        applied = run_migrations(db.engine)
+        print(f"[SUCCESS] Applied {len(applied)} migration(s)")
+
+
+if __name__ == '__main__':
+    main()
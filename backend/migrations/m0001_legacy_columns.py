@@ -0,0 +1,33 @@
+"""
+Columns previously added by the ad-hoc ALTER list in create_app.
+Only adds what is missing, so it is safe on databases that already ran the old list.
+"""
+from sqlalchemy import inspect, text
+
+VERSION = 1
+DESCRIPTION = 'Add resume, verification, 2FA and match score columns'
+
+COLUMNS = [
+    # users table
+    ('users', 'resume_text', 'TEXT'),
+    ('users', 'resume_link', 'VARCHAR(500)'),
+    ('users', 'resume_updated_at', 'TIMESTAMP'),
+    ('users', 'email_verified', 'BOOLEAN DEFAULT FALSE'),
+    ('users', 'two_factor_enabled', 'BOOLEAN DEFAULT FALSE'),
+
+    # tracked_events table
+    ('tracked_events', 'match_score', 'INTEGER'),
+    ('tracked_events', 'match_explanation', 'TEXT'),
+]
+
+
+def upgrade(conn):
+    inspector = inspect(conn)
+    existing = {}
+    for table, column, type_def in COLUMNS:
+        if table not in existing:
+            existing[table] = {col['name'] for col in inspector.get_columns(table)}
+        if column not in existing[table]:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {type_def}"))
+            existing[table].add(column)
+            print(f"[SUCCESS] Added column {column} to {table}")
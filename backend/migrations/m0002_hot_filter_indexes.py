@@ -0,0 +1,51 @@
+"""
+Indexes for the columns every list endpoint, the unread-count poll and the
+scanner's duplicate checks filter on. Names match __table_args__ in models.py,
+so fresh databases (created by db.create_all) are left untouched.
+"""
+from sqlalchemy import inspect, text
+from migrations.runner import if_not_exists
+
+VERSION = 2
+DESCRIPTION = 'Index hot filter columns (status/deadline, notifications, tracker)'
+
+INDEXES = [
+    ('hackathons', 'ix_hackathons_status_deadline', ['status', 'deadline']),
+    ('hackathons', 'ix_hackathons_status_created', ['status', 'created_at']),
+    ('hackathons', 'ix_hackathons_deadline', ['deadline']),
+    ('hackathons', 'ix_hackathons_title', ['title']),
+
+    ('internships', 'ix_internships_status_deadline', ['status', 'deadline']),
+    ('internships', 'ix_internships_status_created', ['status', 'created_at']),
+    ('internships', 'ix_internships_deadline', ['deadline']),
+    ('internships', 'ix_internships_title_company', ['title', 'company']),
+    ('internships', 'ix_internships_company', ['company']),
+
+    ('notifications', 'ix_notifications_user_read_created', ['user_id', 'is_read', 'created_at']),
+    ('notifications', 'ix_notifications_user_created', ['user_id', 'created_at']),
+
+    ('tracked_events', 'ix_tracked_events_user_event', ['user_id', 'event_type', 'event_id']),
+    ('tracked_events', 'ix_tracked_events_event', ['event_type', 'event_id']),
+
+    ('applications', 'ix_applications_user_created', ['user_id', 'created_at']),
+    ('applications', 'ix_applications_event', ['event_type', 'event_id']),
+]
+
+
+def upgrade(conn):
+    inspector = inspect(conn)
+    existing = {}
+    for table, name, columns in INDEXES:
+        if table not in existing:
+            existing[table] = {index['name'] for index in inspector.get_indexes(table)}
+        if name not in existing[table]:
+            conn.execute(text(f"CREATE INDEX {if_not_exists(conn)}{name} ON {table} ({', '.join(columns)})"))
+            print(f"[SUCCESS] Created index {name}")
+
+
+def downgrade(conn):
+    for table, name, _ in INDEXES:
+        if conn.dialect.name == 'mysql':
+            conn.execute(text(f"DROP INDEX {name} ON {table}"))
+        else:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
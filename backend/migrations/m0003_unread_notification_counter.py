@@ -0,0 +1,20 @@
+"""
+Per-user unread notification counter, backfilled from the notifications table.
+"""
+from sqlalchemy import inspect, text
+
+VERSION = 3
+DESCRIPTION = 'Add users.unread_notification_count and backfill it'
+
+
+def upgrade(conn):
+    columns = {col['name'] for col in inspect(conn).get_columns('users')}
+    if 'unread_notification_count' not in columns:
+        conn.execute(text("ALTER TABLE users ADD COLUMN unread_notification_count INTEGER NOT NULL DEFAULT 0"))
+        print("[SUCCESS] Added column unread_notification_count to users")
+
+    conn.execute(text(
+        "UPDATE users SET unread_notification_count = ("
+        "SELECT COUNT(*) FROM notifications "
+        "WHERE notifications.user_id = users.id AND notifications.is_read = :is_read)"
+    ), {'is_read': False})
@@ -0,0 +1,40 @@
+"""
+Per-opportunity schedule for the link expiry sweeper: when each link was last
+checked and when it is due again. Names match models.py, so fresh databases
+(created by db.create_all) are left untouched.
+"""
+from sqlalchemy import inspect, text
+from migrations.runner import if_not_exists
+
+VERSION = 4
+DESCRIPTION = 'Add expiry check schedule columns to hackathons and internships'
+
+TABLES = ['hackathons', 'internships']
+COLUMNS = [
+    ('expiry_checked_at', 'TIMESTAMP'),
+    ('next_expiry_check_at', 'TIMESTAMP'),
+]
+
+
+def upgrade(conn):
+    inspector = inspect(conn)
+    for table in TABLES:
+        existing = {col['name'] for col in inspector.get_columns(table)}
+        for column, type_def in COLUMNS:
+            if column not in existing:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {type_def}"))
+                print(f"[SUCCESS] Added column {column} to {table}")
+
+        index = f'ix_{table}_status_next_check'
+        if index not in {ix['name'] for ix in inspector.get_indexes(table)}:
+            conn.execute(text(f"CREATE INDEX {if_not_exists(conn)}{index} ON {table} (status, next_expiry_check_at)"))
+            print(f"[SUCCESS] Created index {index}")
+
+
+def downgrade(conn):
+    for table in TABLES:
+        index = f'ix_{table}_status_next_check'
+        if conn.dialect.name == 'mysql':
+            conn.execute(text(f"DROP INDEX {index} ON {table}"))
+        else:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
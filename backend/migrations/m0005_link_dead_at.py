@@ -0,0 +1,19 @@
+"""
+When the expiry sweeper first found an opportunity's link dead (404/410). A
+second dead check in a row is needed before the item is expired. Names match
+models.py, so fresh databases (created by db.create_all) are left untouched.
+"""
+from sqlalchemy import inspect, text
+
+VERSION = 5
+DESCRIPTION = 'Add link_dead_at to hackathons and internships'
+
+TABLES = ['hackathons', 'internships']
+
+
+def upgrade(conn):
+    inspector = inspect(conn)
+    for table in TABLES:
+        if 'link_dead_at' not in {col['name'] for col in inspector.get_columns(table)}:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN link_dead_at TIMESTAMP"))
+            print(f"[SUCCESS] Added column link_dead_at to {table}")
@@ -0,0 +1,102 @@
+"""
+Migration runner
+Discovers mNNNN_*.py modules, applies the ones missing from schema_migrations
+in version order, each inside its own transaction. Runners in different
+processes (web workers, job workers) are serialized with an advisory lock on
+PostgreSQL; SQLite serializes schema writes by itself.
+"""
+import importlib
+import pkgutil
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import text, inspect
+
+import migrations
+
+MIGRATIONS_TABLE = 'schema_migrations'
+# pg_advisory_lock key shared by every runner ("DVAL")
+LOCK_KEY = 0x4456414C
+
+
+def if_not_exists(conn):
+    """IF NOT EXISTS for CREATE INDEX, except on MySQL, which has no such clause"""
+    return '' if conn.dialect.name == 'mysql' else 'IF NOT EXISTS '
+
+
+def load_migrations():
+    """Return migration modules sorted by VERSION"""
+    modules = []
+    for info in pkgutil.iter_modules(migrations.__path__):
+        if info.name.startswith('m') and info.name[1:5].isdigit():
+            modules.append(importlib.import_module(f'migrations.{info.name}'))
+    return sorted(modules, key=lambda module: module.VERSION)
+
+
+def _ensure_table(engine):
+    with engine.begin() as conn:
+        if not inspect(conn).has_table(MIGRATIONS_TABLE):
+            conn.execute(text(
+                f"CREATE TABLE {MIGRATIONS_TABLE} ("
+                "version INTEGER PRIMARY KEY, "
+                "description VARCHAR(200), "
+                "applied_at TIMESTAMP)"
+            ))
+
+
+def _applied_versions(engine):
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"SELECT version FROM {MIGRATIONS_TABLE}")).fetchall()
+    return {row[0] for row in rows}
+
+
+def pending_migrations(engine):
+    _ensure_table(engine)
+    applied = _applied_versions(engine)
+    return [module for module in load_migrations() if module.VERSION not in applied]
+
+
+@contextmanager
+def _migration_lock(engine):
+    """Hold the runner lock for the duration of the block (a no-op off PostgreSQL)"""
+    if engine.dialect.name != 'postgresql':
+        yield
+        return
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {'key': LOCK_KEY})
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': LOCK_KEY})
+            conn.commit()
+
+
+def run_migrations(engine):
+    """Apply every pending migration. Returns the list of versions applied.
+
+    Concurrent runners wait on the migration lock and then find the versions
+    already recorded, so a migration's check-then-create steps never race.
+    Indexes are also created with IF NOT EXISTS where the database supports it.
+    """
+    with _migration_lock(engine):
+        return _apply_pending(engine)
+
+
+def _apply_pending(engine):
+    applied = []
+    for module in pending_migrations(engine):
+        print(f"[PROCESS] Applying migration {module.VERSION:04d}: {module.DESCRIPTION}")
+        with engine.begin() as conn:
+            module.upgrade(conn)
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    text(f"INSERT INTO {MIGRATIONS_TABLE} (version, description, applied_at) "
+                         "VALUES (:version, :description, :applied_at)"),
+                    {'version': module.VERSION, 'description': module.DESCRIPTION,
+                     'applied_at': datetime.utcnow()}
+                )
+        except Exception as e:
+            print(f"[INFO] Migration {module.VERSION:04d} already recorded: {e}")
+        applied.append(module.VERSION)
+    return applied
@@ -1,9 +1,39 @@
 from flask_sqlalchemy import SQLAlchemy
+import json
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 
 db = SQLAlchemy()
 
+# Ids per IN (...) when batch-loading the events referenced by tracker items/applications
+EVENT_LOAD_CHUNK = 500
+
+
+def _event_key(event_type, event_id):
+    # Anything that isn't a hackathon has always been looked up as an internship
+    return ('hackathon' if event_type == 'hackathon' else 'internship', event_id)
+
+
+def load_events(items):
+    """Fetch the hackathons/internships referenced by items (anything with
+    event_type/event_id) with one IN query per event type.
+
+    Returns {(event_type, event_id): event}; missing events are simply absent.
+    """
+    ids = {'hackathon': set(), 'internship': set()}
+    for item in items:
+        event_type, event_id = _event_key(item.event_type, item.event_id)
+        ids[event_type].add(event_id)
+
+    events = {}
+    for event_type, Model in (('hackathon', Hackathon), ('internship', Internship)):
+        wanted = sorted(ids[event_type])
+        for start in range(0, len(wanted), EVENT_LOAD_CHUNK):
+            chunk = wanted[start:start + EVENT_LOAD_CHUNK]
+            for event in Model.query.filter(Model.id.in_(chunk)).all():
+                events[(event_type, event.id)] = event
+    return events
+
 class User(db.Model):
     """User model for authentication and authorization"""
     __tablename__ = 'users'
@@ -52,6 +82,9 @@ class User(db.Model):
     resume_text = db.Column(db.Text, nullable=True)
     resume_link = db.Column(db.String(500), nullable=True)
     resume_updated_at = db.Column(db.DateTime, nullable=True)
+
+    # Unread notifications, maintained by services.notification_service so the poll never counts rows
+    unread_notification_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
     
     # Relationships
     applications = db.relationship('Application', backref='user', lazy=True, cascade='all, delete-orphan')
@@ -95,6 +128,10 @@ class User(db.Model):
 class Application(db.Model):
     """Application tracking model for DevAlert-hosted events"""
     __tablename__ = 'applications'
+    __table_args__ = (
+        db.Index('ix_applications_user_created', 'user_id', 'created_at'),
+        db.Index('ix_applications_event', 'event_type', 'event_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)  # Optional for non-logged users
@@ -110,8 +147,8 @@ class Application(db.Model):
     status = db.Column(db.String(20), default='pending')  # pending, reviewed, accepted, rejected
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    def to_dict(self):
-        """Convert to dictionary"""
+    def to_dict(self, events=None):
+        """Convert to dictionary. events: optional map from load_events() to avoid a query per row"""
         data = {
             'id': self.id,
             'user_id': self.user_id,
@@ -127,22 +164,35 @@ class Application(db.Model):
         
         # Try to add event title for easier display
         try:
-            from models import Hackathon, Internship
+            if events is None:
+                events = load_events([self])
+            event = events.get(_event_key(self.event_type, self.event_id))
             if self.event_type == 'hackathon':
-                event = Hackathon.query.get(self.event_id)
                 data['event_title'] = event.title if event else 'Deleted Hackathon'
             else:
-                event = Internship.query.get(self.event_id)
                 data['event_title'] = event.title if event else 'Deleted Internship'
         except:
             data['event_title'] = 'Multiple Events'
             
         return data
 
+    @classmethod
+    def serialize_many(cls, applications):
+        """to_dict() for a list of applications with a constant number of queries"""
+        events = load_events(applications)
+        return [application.to_dict(events) for application in applications]
+
 
 class Hackathon(db.Model):
     """Hackathon opportunity model"""
     __tablename__ = 'hackathons'
+    __table_args__ = (
+        db.Index('ix_hackathons_status_deadline', 'status', 'deadline'),
+        db.Index('ix_hackathons_status_created', 'status', 'created_at'),
+        db.Index('ix_hackathons_deadline', 'deadline'),
+        db.Index('ix_hackathons_title', 'title'),
+        db.Index('ix_hackathons_status_next_check', 'status', 'next_expiry_check_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -156,6 +206,10 @@ class Hackathon(db.Model):
     prize_pool = db.Column(db.String(100))
     registration_link = db.Column(db.String(500))
     status = db.Column(db.String(20), default='pending')  # pending, approved, rejected
+    # Link expiry sweeper schedule (see services/expiry_sweeper.py)
+    expiry_checked_at = db.Column(db.DateTime, nullable=True)
+    next_expiry_check_at = db.Column(db.DateTime, nullable=True)
+    link_dead_at = db.Column(db.DateTime, nullable=True)  # first of two 404/410 checks in a row
     source = db.Column(db.String(100), default='manual')  # manual, ai_scan
     host_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True) # ID of user who posted
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -192,6 +246,14 @@ class Hackathon(db.Model):
 class Internship(db.Model):
     """Internship opportunity model"""
     __tablename__ = 'internships'
+    __table_args__ = (
+        db.Index('ix_internships_status_deadline', 'status', 'deadline'),
+        db.Index('ix_internships_status_created', 'status', 'created_at'),
+        db.Index('ix_internships_deadline', 'deadline'),
+        db.Index('ix_internships_title_company', 'title', 'company'),
+        db.Index('ix_internships_company', 'company'),
+        db.Index('ix_internships_status_next_check', 'status', 'next_expiry_check_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -206,6 +268,10 @@ class Internship(db.Model):
     skills_required = db.Column(db.Text)  # Comma-separated skills
     application_link = db.Column(db.String(500))
     status = db.Column(db.String(20), default='pending')  # pending, approved, rejected
+    # Link expiry sweeper schedule (see services/expiry_sweeper.py)
+    expiry_checked_at = db.Column(db.DateTime, nullable=True)
+    next_expiry_check_at = db.Column(db.DateTime, nullable=True)
+    link_dead_at = db.Column(db.DateTime, nullable=True)  # first of two 404/410 checks in a row
     source = db.Column(db.String(100), default='manual')  # manual, ai_scan
     host_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True) # ID of user who posted
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -243,6 +309,10 @@ class Internship(db.Model):
 class Notification(db.Model):
     """Notification model for alerting users about new opportunities"""
     __tablename__ = 'notifications'
+    __table_args__ = (
+        db.Index('ix_notifications_user_read_created', 'user_id', 'is_read', 'created_at'),
+        db.Index('ix_notifications_user_created', 'user_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -268,6 +338,10 @@ class Notification(db.Model):
 class TrackedEvent(db.Model):
     """Model for tracking user interest and application status for opportunities"""
     __tablename__ = 'tracked_events'
+    __table_args__ = (
+        db.Index('ix_tracked_events_user_event', 'user_id', 'event_type', 'event_id'),
+        db.Index('ix_tracked_events_event', 'event_type', 'event_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -288,8 +362,8 @@ class TrackedEvent(db.Model):
     # Relationship to user
     user_rel = db.relationship('User', backref=db.backref('tracked_items', lazy=True))
 
-    def to_dict(self):
-        """Convert to dictionary with event details"""
+    def to_dict(self, events=None):
+        """Convert to dictionary with event details. events: optional map from load_events()"""
         data = {
             'id': self.id,
             'user_id': self.user_id,
@@ -305,8 +379,10 @@ class TrackedEvent(db.Model):
         
         # Add event details
         try:
+            if events is None:
+                events = load_events([self])
+            event = events.get(_event_key(self.event_type, self.event_id))
             if self.event_type == 'hackathon':
-                event = Hackathon.query.get(self.event_id)
                 if event:
                     data['event_details'] = {
                         'title': event.title,
@@ -316,7 +392,6 @@ class TrackedEvent(db.Model):
                         'global_status': event.status
                     }
             else:
-                event = Internship.query.get(self.event_id)
                 if event:
                     data['event_details'] = {
                         'title': event.title,
@@ -336,6 +411,12 @@ class TrackedEvent(db.Model):
             
         return data
 
+    @classmethod
+    def serialize_many(cls, tracked_items):
+        """to_dict() for a list of tracked items with a constant number of queries"""
+        events = load_events(tracked_items)
+        return [item.to_dict(events) for item in tracked_items]
+
 
 class AppSetting(db.Model):
     """Key-value store for app settings that must persist across restarts"""
@@ -362,3 +443,110 @@ class AppSetting(db.Model):
             db.session.add(row)
         db.session.commit()
         return row
+
+
+class AICacheEntry(db.Model):
+    """Cached Gemini responses keyed by a hash of the prompt version and normalized input"""
+    __tablename__ = 'ai_cache'
+
+    key = db.Column(db.String(64), primary_key=True)  # sha256 hex digest
+    prompt_version = db.Column(db.String(50), nullable=False)
+    response = db.Column(db.Text, nullable=False)
+    hits = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+
+class ResumeExtract(db.Model):
+    """Text extracted from a user's resume_link, with the validators needed to revalidate it"""
+    __tablename__ = 'resume_extracts'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    source_url = db.Column(db.String(500), nullable=False)
+    text = db.Column(db.Text, nullable=True)  # None when nothing could be extracted (see error)
+    error = db.Column(db.String(300), nullable=True)
+    etag = db.Column(db.String(255), nullable=True)
+    last_modified = db.Column(db.String(100), nullable=True)
+    content_hash = db.Column(db.String(64), nullable=True)  # sha256 of the downloaded bytes
+    content_type = db.Column(db.String(100), nullable=True)
+    truncated = db.Column(db.Boolean, default=False)  # page/character cap reached
+    extracted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    checked_at = db.Column(db.DateTime, default=datetime.utcnow)  # last download or 304 revalidation
+
+
+class BackgroundJob(db.Model):
+    """Durable queue entry for work the job worker runs outside the web process (scans, cleanups)"""
+    __tablename__ = 'background_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False, index=True)  # handler name, e.g. 'scan'
+    payload = db.Column(db.Text, nullable=True)  # JSON arguments for the handler
+    status = db.Column(db.String(20), default='queued', index=True)  # queued, running, done, failed
+    # Equals kind while the job is queued or running, NULL afterwards; the unique
+    # constraint is what guarantees a single active job per kind
+    singleton_key = db.Column(db.String(50), unique=True, nullable=True)
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=3)
+    run_after = db.Column(db.DateTime, default=datetime.utcnow)  # retry backoff
+    lease_owner = db.Column(db.String(100), nullable=True)  # worker id holding the job
+    lease_expires_at = db.Column(db.DateTime, nullable=True)  # reclaimable once passed
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    result = db.Column(db.Text, nullable=True)  # JSON returned by the handler
+    error = db.Column(db.Text, nullable=True)
+    requested_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'lease_owner': self.lease_owner,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class ScanRun(db.Model):
+    """One AI scanner run with its per-stage timing and network/Gemini measurements"""
+    __tablename__ = 'scan_runs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.String(20), default='running')  # running, success, failed
+    error = db.Column(db.Text, nullable=True)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    duration_seconds = db.Column(db.Float, nullable=True)
+    new_hackathons = db.Column(db.Integer, default=0)
+    new_internships = db.Column(db.Integer, default=0)
+    rows_written = db.Column(db.Integer, default=0)
+    dedup_hits = db.Column(db.Integer, default=0)
+    stages = db.Column(db.Text, nullable=True)  # JSON list: name, event_type, seconds, candidates, dedup_hits, saved
+    fetch_stats = db.Column(db.Text, nullable=True)  # JSON: latency percentiles, errors, per kind, slowest URLs
+    gemini_stats = db.Column(db.Text, nullable=True)  # JSON: requests, calls, cache hits, errors, latency
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'error': self.error,
+            'timestamp': self.started_at.isoformat() if self.started_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration_seconds': self.duration_seconds,
+            'new_hackathons': self.new_hackathons,
+            'new_internships': self.new_internships,
+            'rows_written': self.rows_written,
+            'dedup_hits': self.dedup_hits,
+            'stages': json.loads(self.stages) if self.stages else [],
+            'fetch_stats': json.loads(self.fetch_stats) if self.fetch_stats else None,
+            'gemini_stats': json.loads(self.gemini_stats) if self.gemini_stats else None
+        }
@@ -1,12 +1,13 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, Hackathon, Internship, User, Notification, Application, AppSetting
+from models import db, Hackathon, Internship, User, Notification, Application, AppSetting, ResumeExtract
 from sqlalchemy import func
-from datetime import datetime
-import threading
 import sys
-from .scanner import ai_scan_and_save, fetch_page_text
+from .scanner import fetch_page_text
+from services.job_queue import enqueue, active_job
 from services.opportunity_service import is_opportunity_expired_centralized
+from services.notification_service import notify_user
+from services.recommendations import opportunity_changed
 import re
 import json
 
@@ -91,6 +92,7 @@ def approve_opportunity(opportunity_type, id):
         # Update status
         opportunity.status = 'approved'
         db.session.commit()
+        opportunity_changed(opportunity_type, opportunity)
         
         return jsonify({
             'message': f'{opportunity_type.capitalize()} approved successfully',
@@ -127,6 +129,7 @@ def reject_opportunity(opportunity_type, id):
         # Update status
         opportunity.status = 'rejected'
         db.session.commit()
+        opportunity_changed(opportunity_type, opportunity)
         
         return jsonify({
             'message': f'{opportunity_type.capitalize()} rejected successfully',
@@ -261,6 +264,7 @@ def delete_user(user_id):
         # 2. Delete user's applications (CASCADE)
         from models import Application
         Application.query.filter_by(user_id=user_id).delete()
+        ResumeExtract.query.filter_by(user_id=user_id).delete()
 
         # 3. Unlink hosted opportunities (Set host_id = NULL)
         Hackathon.query.filter_by(host_id=user_id).update({'host_id': None})
@@ -323,7 +327,7 @@ def get_stats():
 @admin_bp.route('/trigger-scan', methods=['POST'])
 @jwt_required()
 def trigger_ai_scan():
-    """Manually trigger AI scan (admin only) - Background version to prevent 502"""
+    """Manually trigger AI scan (admin only) - queued for the job worker so the request returns at once"""
     print(">>> [Admin] trigger_ai_scan called", flush=True)
     try:
         user_id = int(get_jwt_identity())
@@ -334,31 +338,19 @@ def trigger_ai_scan():
             print(">>> [Admin] Unauthorized access attempt", flush=True)
             return jsonify({'error': 'Unauthorized'}), 403
             
-        print(">>> [Admin] Identity verified, launching background thread...", flush=True)
-        
-        # Check if already scanning or purging
-        if AppSetting.get('is_scanning', 'false') == 'true':
-            return jsonify({'error': 'A scan is already in progress.'}), 409
-        if AppSetting.get('is_purging', 'false') == 'true':
+        if active_job('purge_expired') is not None:
             return jsonify({'error': 'A purge is in progress. Please wait.'}), 409
 
-        # Get the real app object to pass to the thread
-        from flask import current_app
-        app_obj = current_app._get_current_object()
-        
-        # CRITICAL: Prepare for thread isolation
-        db.session.remove()
-        db.engine.dispose()
-        
-        # Run in background to avoid 502 timeout
-        thread = threading.Thread(target=ai_scan_and_save, args=(app_obj,))
-        thread.daemon = True
-        thread.start()
-        
-        print(">>> [Admin] Background thread started, returning response", flush=True)
+        # The queue keeps a single active scan job
+        job, created = enqueue('scan', requested_by=user.id)
+        if not created:
+            return jsonify({'error': 'A scan is already in progress.', 'job': job.to_dict()}), 409
+
+        print(f">>> [Admin] Scan job {job.id} queued, returning response", flush=True)
         return jsonify({
-            'message': 'AI scan triggered successfully in background. Results will appear soon.',
-            'status': 'success'
+            'message': 'AI scan queued successfully. Results will appear soon.',
+            'status': 'success',
+            'job': job.to_dict()
         }), 200
         
     except Exception as e:
@@ -415,18 +407,14 @@ def approve_host(user_id):
         target_user.requested_host_access = False
         
         # Create notification for the user
-        notification = Notification(
-            user_id=target_user.id,
-            event_type='system',
-            event_id=0,
-            title='Host Account Approved',
-            message='Your request to become a host has been approved! You can now post hackathons and internships.',
-            is_read=False
+        notify_user(
+            target_user.id,
+            'system',
+            0,
+            'Host Account Approved',
+            'Your request to become a host has been approved! You can now post hackathons and internships.'
         )
         
-        db.session.add(notification)
-        db.session.commit()
-        
         return jsonify({'message': 'Host request approved successfully'}), 200
         
     except Exception as e:
@@ -724,6 +712,7 @@ def auto_approve_oldest():
             
         count_h = 0
         count_i = 0
+        changed = []
         
         # Approve only non-expired ones, up to 5 total
         for h in pending_hackathons:
@@ -733,6 +722,7 @@ def auto_approve_oldest():
                 count_h += 1
             else:
                 h.status = 'rejected' # Auto-reject if expired
+            changed.append(('hackathon', h))
             
         for i in pending_internships:
             if count_i >= 5: break
@@ -741,8 +731,11 @@ def auto_approve_oldest():
                 count_i += 1
             else:
                 i.status = 'rejected' # Auto-reject if expired
+            changed.append(('internship', i))
             
         db.session.commit()
+        for opportunity_type, opportunity in changed:
+            opportunity_changed(opportunity_type, opportunity)
         
         return jsonify({
             'message': f'Auto-approved {count_h} hackathons and {count_i} internships. Expired items were automatically rejected.',
@@ -757,7 +750,11 @@ def auto_approve_oldest():
 @admin_bp.route('/purge-expired', methods=['POST'])
 @jwt_required()
 def purge_expired():
-    """Manually trigger a purge of expired/closed opportunities (admin only)"""
+    """Queue a purge of expired/closed opportunities (admin only).
+
+    Returns 202 with the job; poll /api/scanner/jobs/<id> for the outcome.
+    ?full=true checks every approved link instead of only the ones due.
+    """
     try:
         user_id = int(get_jwt_identity())
         user = User.query.get(user_id)
@@ -766,55 +763,20 @@ def purge_expired():
             return jsonify({'error': 'Unauthorized'}), 403
             
         # Concurrency check
-        if AppSetting.get('is_scanning', 'false') == 'true':
+        if active_job('scan') is not None:
             return jsonify({'error': 'Cannot purge while a scan is in progress.'}), 409
-        
-        AppSetting.set('is_purging', 'true')
-        db.session.commit()
-        
-        # 1. Fetch only APPROVED hackathons and internships
-        hackathons = Hackathon.query.filter_by(status='approved').all()
-        internships = Internship.query.filter_by(status='approved').all()
-        
-        purged_h_ids = []
-        purged_i_ids = []
-        now = datetime.utcnow()
-        
-        for h in hackathons:
-            # Check deadline first (faster than web request)
-            if (h.deadline and h.deadline < now) or is_opportunity_expired_centralized(h.registration_link):
-                h.status = 'rejected'
-                purged_h_ids.append(h.id)
-                
-        for i in internships:
-            # Check deadline or web content
-            if (i.deadline and i.deadline < now) or is_opportunity_expired_centralized(i.application_link):
-                i.status = 'rejected'
-                purged_i_ids.append(i.id)
-                
-        # Save for undo
-        undo_data = {
-            'hackathons': purged_h_ids,
-            'internships': purged_i_ids,
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        AppSetting.set('last_purge_data', json.dumps(undo_data))
-        
-        db.session.commit()
-        
-        AppSetting.set('is_purging', 'false')
-        db.session.commit()
-        
+
+        full = request.args.get('full', 'false').lower() == 'true'
+        job, created = enqueue('purge_expired', {'full': full}, requested_by=user.id)
+        if not created:
+            return jsonify({'error': 'A purge is already in progress.', 'job': job.to_dict()}), 409
+
         return jsonify({
-            'message': f'Purged {len(purged_h_ids)} hackathons and {len(purged_i_ids)} internships (moved to rejected status).',
-            'purged_hackathons_count': len(purged_h_ids),
-            'purged_internships_count': len(purged_i_ids),
-            'can_undo': True
-        }), 200
+            'message': 'Purge started. Expired items will be moved to rejected status.',
+            'job': job.to_dict()
+        }), 202
         
     except Exception as e:
-        AppSetting.set('is_purging', 'false')
-        db.session.commit()
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
@@ -74,7 +74,7 @@ def get_my_applications():
         user_id = get_jwt_identity()
         applications = Application.query.filter_by(user_id=user_id).order_by(Application.created_at.desc()).all()
         
-        return jsonify([app.to_dict() for app in applications]), 200
+        return jsonify(Application.serialize_many(applications)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -106,7 +106,7 @@ def get_event_applications(event_type, event_id):
             event_id=event_id
         ).order_by(Application.created_at.desc()).all()
         
-        return jsonify([app.to_dict() for app in applications]), 200
+        return jsonify(Application.serialize_many(applications)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -139,7 +139,7 @@ def get_hosted_applications():
             applications = hack_apps + int_apps
             applications.sort(key=lambda x: x.created_at, reverse=True)
             
-        return jsonify([app.to_dict() for app in applications]), 200
+        return jsonify(Application.serialize_many(applications)), 200
     except Exception as e:
         print(f"Error fetching hosted apps: {e}")
         return jsonify({'error': str(e)}), 500
@@ -4,6 +4,8 @@ import json
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from models import db, User
 from services.email_service import send_verification_email, send_password_reset_email, send_2fa_enabled_notification
+from services.recommendations import resume_changed
+from services.resume_extract import forget_resume
 from datetime import datetime, timedelta
 import pyotp
 import qrcode
@@ -75,19 +77,14 @@ def register():
         # Notify admins if this is a host request
         if requested_host_access:
             try:
-                from models import Notification
-                admins = User.query.filter_by(role='admin').all()
-                for admin in admins:
-                    admin_notif = Notification(
-                        user_id=admin.id,
-                        event_type='system',
-                        event_id=user.id,
-                        title='New Host Request',
-                        message=f'User {user.username} has requested host access.',
-                        is_read=False
-                    )
-                    db.session.add(admin_notif)
-                db.session.commit()
+                from services.notification_service import fan_out_notification
+                fan_out_notification(
+                    'system',
+                    user.id,
+                    'New Host Request',
+                    f'User {user.username} has requested host access.',
+                    role='admin'
+                )
             except Exception as e:
                 print(f"Warning: Could not notify admins: {e}")
         
@@ -256,7 +253,10 @@ def update_resume():
             return jsonify({'error': 'Either resume_text or resume_link is required'}), 400
             
         user.resume_updated_at = datetime.utcnow()
+        # The file behind the link may have been replaced too; read it afresh on the next match
+        forget_resume(user.id, commit=False)
         db.session.commit()
+        resume_changed(user.id, user.resume_text)
         
         return jsonify({
             'message': 'Resume updated successfully',
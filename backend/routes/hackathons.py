@@ -1,17 +1,28 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, Hackathon, User, Notification
+from models import db, Hackathon, User
 from datetime import datetime
+from services.notification_service import fan_out_notification
+from services.recommendations import opportunity_changed, opportunity_deleted
+from services.pagination import keyword_filter, parse_fields, paginate_keyset
 
 hackathons_bp = Blueprint('hackathons', __name__)
 
 @hackathons_bp.route('', methods=['GET'])
 def get_hackathons():
-    """Get all approved hackathons with optional filters"""
+    """Get approved hackathons with optional filters.
+
+    keywords= keeps items whose title, description or skills mention any of
+    the comma-separated keywords. Always returns one keyset page
+    ({'items', 'next_cursor', 'has_more', 'limit'}):
+    limit defaults to 20 and is capped at 100, cursor continues from the
+    previous page, and fields= returns only some columns.
+    """
     try:
         # Get query parameters
         location = request.args.get('location')
         mode = request.args.get('mode')
+        keywords = keyword_filter(request.args.get('keywords'), Hackathon)
         status = request.args.get('status', 'approved')  # Default to approved for public view
         
         # Build query
@@ -23,24 +34,25 @@ def get_hackathons():
             query = query.filter(Hackathon.location.ilike(f'%{location}%'))
         if mode:
             query = query.filter_by(mode=mode)
+        if keywords is not None:
+            query = query.filter(keywords)
         
         # Sorting
         sort_by = request.args.get('sort_by', 'deadline')
         order = request.args.get('order', 'asc')
+        sort_column = 'created_at' if sort_by == 'created_at' else 'deadline'
         
-        if sort_by == 'created_at':
-            sort_attr = Hackathon.created_at
-        else:
-            sort_attr = Hackathon.deadline
-            
-        if order == 'desc':
-            query = query.order_by(sort_attr.desc())
-        else:
-            query = query.order_by(sort_attr.asc())
-        
-        hackathons = query.all()
-        
-        return jsonify([h.to_dict() for h in hackathons]), 200
+        try:
+            page = paginate_keyset(
+                query, Hackathon, sort_column,
+                descending=(order == 'desc'),
+                cursor=request.args.get('cursor'),
+                limit=request.args.get('limit'),
+                fields=parse_fields(request.args.get('fields'), Hackathon)
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(page), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -133,21 +145,17 @@ def create_hackathon():
         
         db.session.add(hackathon)
         db.session.commit()
+        opportunity_changed('hackathon', hackathon)
         
         # Notify all participants about the new hackathon
         try:
-            participants = User.query.filter_by(role='participant').all()
-            for participant in participants:
-                note = Notification(
-                    user_id=participant.id,
-                    event_type='hackathon',
-                    event_id=hackathon.id,
-                    title=f"New Hackathon: {hackathon.title}",
-                    message=f"A new hackathon '{hackathon.title}' has been posted. Check it out!",
-                    is_read=False
-                )
-                db.session.add(note)
-            db.session.commit()
+            fan_out_notification(
+                'hackathon',
+                hackathon.id,
+                title=f"New Hackathon: {hackathon.title}",
+                message=f"A new hackathon '{hackathon.title}' has been posted. Check it out!",
+                role='participant'
+            )
         except Exception as e:
             print(f"Error sending notifications: {e}")
             # Don't fail the request if notifications fail
@@ -206,6 +214,7 @@ def update_hackathon(id):
             hackathon.status = data['status']
         
         db.session.commit()
+        opportunity_changed('hackathon', hackathon)
         
         return jsonify({
             'message': 'Hackathon updated successfully',
@@ -235,6 +244,7 @@ def delete_hackathon(id):
         
         db.session.delete(hackathon)
         db.session.commit()
+        opportunity_deleted('hackathon', id)
         
         return jsonify({'message': 'Hackathon deleted successfully'}), 200
         
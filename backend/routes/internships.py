@@ -1,17 +1,28 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, Internship, User, Notification
+from models import db, Internship, User
 from datetime import datetime
+from services.notification_service import fan_out_notification
+from services.recommendations import opportunity_changed, opportunity_deleted
+from services.pagination import keyword_filter, parse_fields, paginate_keyset
 
 internships_bp = Blueprint('internships', __name__)
 
 @internships_bp.route('', methods=['GET'])
 def get_internships():
-    """Get all approved internships with optional filters"""
+    """Get approved internships with optional filters.
+
+    keywords= keeps items whose title, description or skills mention any of
+    the comma-separated keywords. Always returns one keyset page
+    ({'items', 'next_cursor', 'has_more', 'limit'}):
+    limit defaults to 20 and is capped at 100, cursor continues from the
+    previous page, and fields= returns only some columns.
+    """
     try:
         # Get query parameters
         location = request.args.get('location')
         mode = request.args.get('mode')
+        keywords = keyword_filter(request.args.get('keywords'), Internship)
         company = request.args.get('company')
         status = request.args.get('status', 'approved')  # Default to approved for public view
         
@@ -24,26 +35,27 @@ def get_internships():
             query = query.filter(Internship.location.ilike(f'%{location}%'))
         if mode:
             query = query.filter_by(mode=mode)
+        if keywords is not None:
+            query = query.filter(keywords)
         if company:
             query = query.filter(Internship.company.ilike(f'%{company}%'))
         
         # Sorting
         sort_by = request.args.get('sort_by', 'deadline')
         order = request.args.get('order', 'asc')
+        sort_column = 'created_at' if sort_by == 'created_at' else 'deadline'
         
-        if sort_by == 'created_at':
-            sort_attr = Internship.created_at
-        else:
-            sort_attr = Internship.deadline
-            
-        if order == 'desc':
-            query = query.order_by(sort_attr.desc())
-        else:
-            query = query.order_by(sort_attr.asc())
-        
-        internships = query.all()
-        
-        return jsonify([i.to_dict() for i in internships]), 200
+        try:
+            page = paginate_keyset(
+                query, Internship, sort_column,
+                descending=(order == 'desc'),
+                cursor=request.args.get('cursor'),
+                limit=request.args.get('limit'),
+                fields=parse_fields(request.args.get('fields'), Internship)
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(page), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -124,21 +136,17 @@ def create_internship():
         
         db.session.add(internship)
         db.session.commit()
+        opportunity_changed('internship', internship)
         
         # Notify all participants about the new internship
         try:
-            participants = User.query.filter_by(role='participant').all()
-            for participant in participants:
-                note = Notification(
-                    user_id=participant.id,
-                    event_type='internship',
-                    event_id=internship.id,
-                    title=f"New Internship: {internship.title}",
-                    message=f"A new internship '{internship.title}' at {internship.company} has been posted. Check it out!",
-                    is_read=False
-                )
-                db.session.add(note)
-            db.session.commit()
+            fan_out_notification(
+                'internship',
+                internship.id,
+                title=f"New Internship: {internship.title}",
+                message=f"A new internship '{internship.title}' at {internship.company} has been posted. Check it out!",
+                role='participant'
+            )
         except Exception as e:
             print(f"Error sending notifications: {e}")
         
@@ -198,6 +206,7 @@ def update_internship(id):
             internship.status = data['status']
         
         db.session.commit()
+        opportunity_changed('internship', internship)
         
         return jsonify({
             'message': 'Internship updated successfully',
@@ -227,6 +236,7 @@ def delete_internship(id):
         
         db.session.delete(internship)
         db.session.commit()
+        opportunity_deleted('internship', id)
         
         return jsonify({'message': 'Internship deleted successfully'}), 200
         
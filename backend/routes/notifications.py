@@ -1,9 +1,15 @@
 """
 Notification routes for user alerts
 """
-from flask import Blueprint, request, jsonify
+import json
+import threading
+import time
+from flask import Blueprint, request, jsonify, Response, stream_with_context, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from config import Config
 from models import db, Notification, User
+from services.notification_service import get_unread_count as read_unread_count, mark_read, mark_all_read
+from services.notification_bus import get_notification_bus
 
 notifications_bp = Blueprint('notifications', __name__)
 
@@ -40,10 +46,10 @@ def get_notifications():
 @notifications_bp.route('/unread-count', methods=['GET'])
 @jwt_required()
 def get_unread_count():
-    """Get count of unread notifications"""
+    """Get count of unread notifications (maintained counter, no row count)"""
     try:
         user_id = get_jwt_identity()
-        count = Notification.query.filter_by(user_id=user_id, is_read=False).count()
+        count = read_unread_count(user_id)
         return jsonify({'count': count}), 200
     except Exception as e:
         print(f"❌ Error in unread-count: {str(e)}")
@@ -58,14 +64,9 @@ def mark_as_read(notification_id):
     try:
         user_id = get_jwt_identity()
         
-        notification = Notification.query.filter_by(id=notification_id, user_id=user_id).first()
-        
-        if not notification:
+        if not mark_read(user_id, notification_id):
             return jsonify({'error': 'Notification not found'}), 404
         
-        notification.is_read = True
-        db.session.commit()
-        
         return jsonify({'message': 'Notification marked as read'}), 200
     except Exception as e:
         db.session.rollback()
@@ -78,10 +79,120 @@ def mark_all_as_read():
     try:
         user_id = get_jwt_identity()
         
-        Notification.query.filter_by(user_id=user_id, is_read=False).update({'is_read': True})
-        db.session.commit()
+        mark_all_read(user_id)
         
         return jsonify({'message': 'All notifications marked as read'}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
+
+
+# Open SSE streams in this process (each holds a worker thread)
+_active_streams = 0
+_active_streams_lock = threading.Lock()
+
+
+def _acquire_stream():
+    global _active_streams
+    with _active_streams_lock:
+        if _active_streams >= Config.SSE_MAX_STREAMS:
+            return False
+        _active_streams += 1
+        return True
+
+
+def _release_stream():
+    global _active_streams
+    with _active_streams_lock:
+        _active_streams -= 1
+
+
+def _sse(event, data, event_id=None):
+    """Format one server-sent event"""
+    message = ''
+    if event_id is not None:
+        message += f"id: {event_id}\n"
+    return message + f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _read_unread_count(user_id):
+    """Read the counter and hand the DB connection back while the stream waits"""
+    try:
+        return read_unread_count(user_id)
+    finally:
+        db.session.remove()
+
+
+@notifications_bp.route('/stream', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def stream_notifications():
+    """Server-sent events: 'notification' when one is created for the user and
+    'unread_count' after each event that may have changed the count.
+
+    EventSource can't send headers, so the token may also come as ?jwt=.
+    Notification events carry their notification id, so reconnects resume
+    from Last-Event-ID (or ?last_event_id=) on any web worker; if that id has
+    already left the replay buffer a 'resync' event tells the client to refetch.
+    Between events the stream only sends comment heartbeats, without touching
+    the database. It ends after SSE_MAX_STREAM_SECONDS and the browser reconnects.
+    """
+    user_id = int(get_jwt_identity())
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    role = user.role
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+
+    if not _acquire_stream():
+        # Client falls back to polling /unread-count
+        return jsonify({'error': 'Too many open streams'}), 503
+
+    bus = get_notification_bus()
+    bus.start(current_app._get_current_object())
+    heartbeat = Config.SSE_HEARTBEAT_SECONDS
+
+    def generate():
+        bus.subscribe()
+        try:
+            yield f"retry: {heartbeat * 1000}\n\n"
+            replayed = set()
+
+            cursor = bus.cursor
+            if last_event_id is not None:
+                missed, gap, cursor = bus.replay(last_event_id, user_id, role)
+                if gap:
+                    # Can't replay everything; the client refetches instead
+                    yield _sse('resync', {})
+                for event in missed:
+                    yield _sse(event.name, event.data, event.id)
+                    replayed.add(event.id)
+
+            yield _sse('unread_count', {'count': _read_unread_count(user_id)})
+
+            ends_at = time.monotonic() + Config.SSE_MAX_STREAM_SECONDS
+            while time.monotonic() < ends_at:
+                events, cursor = bus.wait(cursor, user_id, role, timeout=heartbeat)
+                sent = False
+                for event in events:
+                    if event.id in replayed:
+                        continue
+                    yield _sse(event.name, event.data, event.id)
+                    sent = True
+                if sent:
+                    yield _sse('unread_count', {'count': _read_unread_count(user_id)})
+                else:
+                    yield ": heartbeat\n\n"
+        finally:
+            bus.unsubscribe()
+
+    db.session.remove()
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.call_on_close(_release_stream)
+    return response
@@ -3,23 +3,38 @@ AI Scanner Service with Google Custom Search API
 Searches Google for real hackathons and internships
 """
 from flask import Blueprint, jsonify, request, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from apscheduler.schedulers.background import BackgroundScheduler
 from datetime import datetime, timedelta
-from models import db, Hackathon, Internship, User, Notification, AppSetting
-import requests
+from models import db, User, Hackathon, Internship, AppSetting, BackgroundJob, ScanRun
 import os
 import re
+import json
 import time
-import threading
 from urllib.parse import urljoin, urlparse
 from services.opportunity_service import is_opportunity_expired_centralized
+from services.fetch_pipeline import get_fetch_pipeline
+from services import http_client
+from services.page_cache import get_page_cache
+from services.link_health import get_link_health
+from services.host_limiter import get_host_limiter
+from services.notification_service import fan_out_notification
+from services.recommendations import opportunity_changed
+from services.dedup_index import DedupIndex, normalize_title
+from services.job_queue import enqueue, job_handler, recent_jobs
+from services.leader_lease import LeaderLease
+from services.expiry_sweeper import sweep_expired
+from services.scan_metrics import (
+    ScanRecorder, active_recorder, recording, record_fetch, record_gemini, start_run, finish_run
+)
 from sqlalchemy import text
 
 scanner_bp = Blueprint('scanner', __name__)
 
 # Initialize scheduler
 scheduler = BackgroundScheduler()
-scan_results = []
+# Lease that decides which process's scheduler actually fires (set by start_scheduler)
+scheduler_lease = None
 
 def is_auto_approve_enabled():
     """Read auto-approve state from the database (persists across restarts)"""
@@ -37,12 +52,42 @@ GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY') or os.getenv('GEMINI_API_KEY', '')
 GOOGLE_CSE_ID = os.getenv('GOOGLE_CSE_ID', '')
 
 from services.match_service import get_match_service
+from services import ai_cache
+
+# Bump these whenever the corresponding prompt template changes so cached answers are not reused.
+# The analyze prompt embeds today's date, so its cache version gets the date appended.
+ANALYZE_PROMPT_VERSION = 'analyze-v1'
+BULK_EXTRACT_PROMPT_VERSION = 'bulk-extract-v1'
+
+def safe_generate_content(prompt, cache_version=None, cache_input=None):
+    """Resilient content generation using MatchService (handles SDK/REST fallback).
+
+    When cache_version is given, the response is served from / stored in the
+    AI cache keyed by (cache_version, cache_input). Every request is reported
+    to the running scan's metrics, as a Gemini call or an AI cache hit.
+    """
+    service = None
+    called = False
+
+    def generate(prompt):
+        nonlocal called
+        called = True
+        started = time.monotonic()
+        response = None
+        try:
+            response = service.generate_content(prompt)
+            return response
+        finally:
+            record_gemini(True, time.monotonic() - started, ok=bool(response))
 
-def safe_generate_content(prompt):
-    """Resilient content generation using MatchService (handles SDK/REST fallback)"""
     try:
         service = get_match_service()
-        return service.generate_content(prompt)
+        if cache_version:
+            response = ai_cache.cached_generate(cache_version, cache_input, prompt, generate)
+            if not called:
+                record_gemini(False)
+            return response
+        return generate(prompt)
     except Exception as e:
         print(f"❌ [Scanner] safe_generate_content fatal error: {e}", flush=True)
         return None
@@ -69,54 +114,36 @@ def db_safe_query(func, *args, **kwargs):
                 continue
             raise
 
-def check_link_validity(url):
-    """Perform a HEAD request to check if a link is still alive with browser-like headers"""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-    try:
-        response = requests.head(url, timeout=5, allow_redirects=True, headers=headers)
-        if response.status_code < 400: return True
-        # If 403 or 405, it might just be bot protection on HEAD, try GET
-        if response.status_code in [403, 404, 405]:
-            response = requests.get(url, timeout=5, stream=True, headers=headers)
-            return response.status_code < 400
-        return False
-    except:
-        try:
-            # Fallback to GET if HEAD fails
-            response = requests.get(url, timeout=5, stream=True, headers=headers)
-            return response.status_code < 400
-        except:
-            return False
+# check_link_validity was replaced by services.link_health (get_link_health().check / check_many)
+
+def _live_candidates(candidates):
+    """Drop candidates whose link is missing or not alive; uncached links are checked as one concurrent batch.
+
+    Links the host limiter would not let us check are skipped without a
+    verdict; the next scan finds them again.
+    """
+    verdicts = get_link_health().check_many(_event_link(candidate) for candidate in candidates)
+    live = []
+    for candidate in candidates:
+        link = _event_link(candidate)
+        verdict = verdicts.get(link)
+        if verdict is not None and verdict.throttled:
+            print(f">>> [Scanner] Deferred (host rate limited): {link}", flush=True)
+            continue
+        if verdict is None or not verdict.alive:
+            print(f">>> [Scanner] Filtered (Invalid Link): {link} ({verdict.outcome if verdict else 'no link'})", flush=True)
+            continue
+        live.append(candidate)
+    return live
 
 def fetch_page_text(url):
-    """Fetch and clean text content from a URL for Gemini analysis"""
+    """Fetch and clean text content from a URL for Gemini analysis (served from the page cache)"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.extract()
-            
-        # Get text
-        text = soup.get_text()
-        
-        # Break into lines and remove leading and trailing whitespace
-        lines = (line.strip() for line in text.splitlines())
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        # Drop blank lines
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        
-        return text[:5000] # Limit context size
+        page = get_page_cache().fetch(url, timeout=15)
+        if not page.ok:
+            print(f"DEBUG: Failed to fetch text from {url}: {page.error}")
+            return ""
+        return page.text[:5000] # Limit context size
     except Exception as e:
         print(f"DEBUG: Failed to fetch text from {url}: {e}")
         return ""
@@ -124,17 +151,12 @@ def fetch_page_text(url):
 def create_notifications_for_event(event_type, event_id, title):
     """Create notifications for all users when a new event is found"""
     try:
-        users = User.query.all()
-        for user in users:
-            notification = Notification(
-                user_id=user.id,
-                event_type=event_type,
-                event_id=event_id,
-                title=f"New {event_type.capitalize()} Available!",
-                message=f"Check out: {title}"
-            )
-            db.session.add(notification)
-        db.session.commit()
+        fan_out_notification(
+            event_type,
+            event_id,
+            title=f"New {event_type.capitalize()} Available!",
+            message=f"Check out: {title}"
+        )
     except Exception as e:
         print(f"❌ Error creating notifications: {str(e)}")
         db.session.rollback()
@@ -153,7 +175,9 @@ def google_search(query, num_results=10):
             return get_fallback_results(query)
         
         # Uses the service's robust search
+        started = time.monotonic()
         items = service.search_google(query, num_results)
+        record_fetch(f"search:{query}", 'search', time.monotonic() - started, 200 if items else 0)
         
         # If service returns empty list or fails internally (e.g. 403/401), 
         # get_scanner_service().search_google already returns _get_mock_data(query).
@@ -227,7 +251,7 @@ def scrape_unstop(category="hackathons"):
             'Accept': 'application/json, text/plain, */*',
         }
         
-        response = requests.get(url, params=params, headers=headers, timeout=15)
+        response = http_client.get(url, params=params, headers=headers, timeout=15, polite=True)
         
         if response.status_code != 200:
              return []
@@ -268,7 +292,7 @@ def scrape_devpost():
     try:
         headers = {'User-Agent': 'Mozilla/5.0'}
         url = "https://devpost.com/hackathons"
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, headers=headers, timeout=10, polite=True)
         from bs4 import BeautifulSoup
         soup = BeautifulSoup(response.text, 'html.parser')
         results = []
@@ -370,6 +394,7 @@ def analyze_with_gemini(event_block):
              
         # Combine snippet and page text
         context = f"Title: {event_block.get('title')}\nSnippet: {event_block.get('description')}\nPage Text: {page_text[:3000]}"
+        today = datetime.now().strftime('%Y-%m-%d')
         
         prompt = f"""
         I am providing information about a potential student opportunity. 
@@ -385,7 +410,7 @@ def analyze_with_gemini(event_block):
             "mode": "Online/Offline/Hybrid",
             "is_internship_inside_hackathon": true/false,
             "is_legit": true/false (false if old/dead/scam),
-            "is_future_event": true/false (true if after {datetime.now().strftime('%Y-%m-%d')}),
+            "is_future_event": true/false (true if after {today}),
             "skills": "comma separated key skills"
         }}
         
@@ -393,7 +418,7 @@ def analyze_with_gemini(event_block):
         {context}
         """
         
-        text_response = safe_generate_content(prompt)
+        text_response = safe_generate_content(prompt, cache_version=f"{ANALYZE_PROMPT_VERSION}:{today}", cache_input=context)
         if not text_response:
             return event_block # Return basic block if AI fails
         
@@ -493,8 +518,12 @@ DIRECT_SOURCES = {
     ]
 }
 
-def extract_bulk_from_page(url, event_type):
-    """Fetch page text and use Gemini for bulk opportunity extraction"""
+def extract_bulk_from_page(url, event_type, validate=True):
+    """Fetch page text and use Gemini for bulk opportunity extraction.
+
+    With validate=False the per-link liveness/expiry checks are skipped so the
+    caller can run them concurrently (see _perform_scan).
+    """
     print(f"[AI Scanner] Directly scanning source: {url}")
     page_text = fetch_page_text(url)
     if not page_text or len(page_text) < 200:
@@ -527,7 +556,11 @@ def extract_bulk_from_page(url, event_type):
         {page_text[:8000]}
         """
 
-        text_response = safe_generate_content(prompt)
+        text_response = safe_generate_content(
+            prompt,
+            cache_version=BULK_EXTRACT_PROMPT_VERSION,
+            cache_input=f"{event_type}\n{url}\n{page_text[:8000]}"
+        )
         if not text_response:
             return []
 
@@ -545,7 +578,17 @@ def extract_bulk_from_page(url, event_type):
         
         for opp in extracted:
             opp['link'] = get_absolute_url(base_domain, opp.get('link'))
-            if not check_link_validity(opp['link']):
+        verdicts = get_link_health().check_many(opp['link'] for opp in extracted) if validate else {}
+
+        for opp in extracted:
+            if not validate:
+                valid_results.append(opp)
+                continue
+            verdict = verdicts.get(opp['link'])
+            if verdict is not None and verdict.throttled:
+                print(f">>> [Scanner] Deferred (host rate limited): {opp['link']}", flush=True)
+                continue
+            if verdict is None or not verdict.alive:
                 print(f">>> [Scanner] Dead link filtered: {opp['link']}", flush=True)
                 continue
             
@@ -562,12 +605,64 @@ def extract_bulk_from_page(url, event_type):
         print(f"❌ [Scanner] Direct extraction error for {url}: {e}", flush=True)
         return []
 
+def _event_link(event_data):
+    """Registration/application link of a candidate event block"""
+    return event_data.get('registration_link') or event_data.get('application_link')
+
+def _enrich_task(check_expiry=False):
+    """Build the per-candidate network stage run inside the fetch pipeline:
+    an optional expiry check followed by Gemini enrichment. Link liveness is
+    checked beforehand for the whole batch (see _live_candidates)."""
+    def task(event_data):
+        link = _event_link(event_data)
+        if check_expiry and is_opportunity_expired_centralized(link):
+            print(f">>> [Scanner] Expired/Closed opportunity filtered: {link}", flush=True)
+            return None
+        return analyze_with_gemini(event_data)
+    return task
+
+def _build_entry(e_type, enriched):
+    """Create an unsaved Hackathon/Internship row from an enriched event block"""
+    if e_type == 'hackathon':
+        return Hackathon(
+            title=enriched['title'],
+            description=enriched.get('description') or '',
+            organizer=enriched.get('organizer') or 'Unknown',
+            location=enriched.get('location') or 'India',
+            mode=enriched.get('mode') or 'Hybrid',
+            deadline=enriched.get('deadline'),
+            prize_pool=enriched.get('prize_pool', 'Not specified'),
+            registration_link=enriched.get('registration_link'),
+            status='pending',
+            source=enriched.get('source', 'Web')
+        )
+    return Internship(
+        title=enriched['title'],
+        company=enriched.get('company') or 'Unknown',
+        description=enriched.get('description') or '',
+        location=enriched.get('location') or 'India',
+        mode=enriched.get('mode') or 'Hybrid',
+        duration=enriched.get('duration', '3 months'),
+        deadline=enriched.get('deadline'),
+        skills_required=enriched.get('skills_required', 'Programming'),
+        application_link=enriched.get('application_link'),
+        status='pending',
+        source=enriched.get('source', 'Web')
+    )
+
 def _perform_scan():
-    """Internal scan logic with direct site crawling and fallback search"""
+    """Internal scan logic with direct site crawling and fallback search.
+
+    All network work (scraping, link checks, page fetches, Gemini calls) is
+    fanned out through a bounded FetchPipeline. This thread only does the
+    duplicate checks (against an in-memory DedupIndex) and DB writes, so
+    there is a single writer per scan.
+    """
     print(f">>> [Scanner] _perform_scan loop started. Sources: {list(DIRECT_SOURCES.keys())}", flush=True)
+    recorder = active_recorder() or ScanRecorder()
     try:
-        new_hacks = 0
-        new_interns = 0
+        pipeline = get_fetch_pipeline(current_app._get_current_object())
+        saved_counts = {'hackathon': 0, 'internship': 0}
         
         task_configs = [
             ('hackathon', Hackathon),
@@ -576,190 +671,134 @@ def _perform_scan():
         
         for e_type, ModelClass in task_configs:
             print(f">>> [Scanner] Mode: {e_type}", flush=True)
+            # Everything already stored plus candidates claimed in this scan, checked in memory
+            link_column = 'registration_link' if e_type == 'hackathon' else 'application_link'
+            company_column = 'company' if e_type == 'internship' else None
+            with recorder.stage('dedup_index', e_type):
+                dedup = db_safe_query(lambda: DedupIndex.load(ModelClass, link_column, company_column))
+            print(f">>> [Scanner] Dedup index loaded: {len(dedup)} known {e_type}s", flush=True)
+
+            def is_duplicate(title, company=None, url=None):
+                if dedup.claim(title, company=company, url=url):
+                    return False
+                recorder.dedup_hit()
+                return True
+
+            def save_enriched(candidate, enriched, label):
+                # Enrichment may rewrite the title into one we already have
+                if normalize_title(enriched.get('title')) != normalize_title(candidate.get('title')) \
+                        and dedup.contains(enriched.get('title'), company=enriched.get('company')):
+                    print(f">>> [Scanner] Skipping duplicate after enrichment: {enriched.get('title')}", flush=True)
+                    recorder.dedup_hit()
+                    return
+                entry = _build_entry(e_type, enriched)
+                def save_entry():
+                    db.session.add(entry)
+                    db.session.flush()
+                    return entry.id
+
+                entry_id = db_safe_query(save_entry)
+                dedup.add(entry.title, company=enriched.get('company'), url=_event_link(enriched))
+                create_notifications_for_event(e_type, entry_id, entry.title)
+                saved_counts[e_type] += 1
+                recorder.saved(e_type)
+                print(f">>> [Scanner] SAVED ({label}): {entry.title}", flush=True)
+
+                # Periodic session refresh to prevent Supabase timeouts
+                if sum(saved_counts.values()) % 5 == 0:
+                    db.session.commit()
+                    db.session.remove()
             
             # 1. SPECIALIZED AGGREGATION (High priority - LinkedIn, etc.)
-            from services.aggregation_service import AggregationService
-            agg_service = AggregationService()
-            
             if e_type == 'internship':
-                print(">>> [Scanner] Running specialized LinkedIn internship scan...", flush=True)
-                linkedin_results = agg_service.scrape_linkedin_internships()
-                for res in linkedin_results:
-                    def check_exists():
-                        return ModelClass.query.filter_by(title=res['title'], company=res['company']).first()
-                    
-                    if db_safe_query(check_exists):
-                        continue
-                    
-                    event_data = {
-                        'title': res['title'],
-                        'company': res['company'],
-                        'description': res.get('raw_text', '')[:500],
-                        'location': res.get('location', 'India'),
-                        'mode': 'Hybrid',
-                        'application_link': res['link'],
-                        'source': 'LinkedIn'
-                    }
-                    enriched = analyze_with_gemini(event_data)
-                    if enriched:
-                        entry = Internship(
-                            title=enriched['title'],
-                            company=enriched.get('company', 'Unknown'),
-                            description=enriched['description'],
-                            location=enriched['location'],
-                            mode=enriched['mode'],
-                            duration='3 months',
-                            deadline=enriched.get('deadline'),
-                            skills_required=enriched.get('skills_required', 'Programming'),
-                            application_link=enriched['application_link'],
-                            status='pending',
-                            source='LinkedIn'
-                        )
-                        def save_entry():
-                            db.session.add(entry)
-                            db.session.flush()
-                            return entry.id
-                            
-                        entry_id = db_safe_query(save_entry)
-                        create_notifications_for_event(e_type, entry_id, entry.title)
-                        new_interns += 1
-                        print(f">>> [Scanner] SAVED (LinkedIn): {entry.title}", flush=True)
-
-            # 2. DIRECT SCANNING (Source Crawling)
-            for direct_url in DIRECT_SOURCES.get(e_type, []):
-                print(f">>> [Scanner] Direct Scan URL: {direct_url}", flush=True)
-                bulk_results = extract_bulk_from_page(direct_url, e_type)
-                for res in bulk_results:
-                    def check_exists_bulk():
-                        return ModelClass.query.filter_by(title=res['name']).first()
-                        
-                    if db_safe_query(check_exists_bulk): 
-                        print(f">>> [Scanner] Skipping duplicate: {res['name']}", flush=True)
-                        continue
-                    
-                    print(f">>> [Scanner] Found new potential candidate: {res['name']}", flush=True)
+                with recorder.stage('linkedin', e_type):
+                    from services.aggregation_service import AggregationService
+                    print(">>> [Scanner] Running specialized LinkedIn internship scan...", flush=True)
+                    linkedin_results = AggregationService().scrape_linkedin_internships()
+                    candidates = []
+                    for res in linkedin_results:
+                        if is_duplicate(res['title'], company=res['company'], url=res.get('link')):
+                            continue
+                        candidates.append({
+                            'title': res['title'],
+                            'company': res['company'],
+                            'description': res.get('raw_text', '')[:500],
+                            'location': res.get('location', 'India'),
+                            'mode': 'Hybrid',
+                            'application_link': res['link'],
+                            'source': 'LinkedIn'
+                        })
+
+                    recorder.candidates(len(candidates))
+                    for candidate, enriched in pipeline.map_unordered(_enrich_task(), candidates, _event_link):
+                        if enriched:
+                            save_enriched(candidate, enriched, 'LinkedIn')
+
+            # 2. DIRECT SCANNING (Source Crawling) - every source page is fetched and extracted in parallel
+            with recorder.stage('direct_sources', e_type):
+                candidates = []
+                bulk_pages = pipeline.map_unordered(
+                    lambda direct_url: extract_bulk_from_page(direct_url, e_type, validate=False),
+                    DIRECT_SOURCES.get(e_type, [])
+                )
+                for direct_url, bulk_results in bulk_pages:
                     source_name = extract_domain(direct_url)
-                    # Prepare for enrichment/save
-                    event_data = {
-                        'title': res['name'],
-                        'description': res['description'],
-                        'organizer': res['organizer'] if e_type == 'hackathon' else None,
-                        'company': res['organizer'] if e_type == 'internship' else None,
-                        'location': res['location'],
-                        'mode': res['mode'],
-                        'registration_link': res['link'] if e_type == 'hackathon' else None,
-                        'application_link': res['link'] if e_type == 'internship' else None,
-                        'source': source_name
-                    }
-                    
-                    enriched = analyze_with_gemini(event_data)
-                    if not enriched: continue
-                    
-                    if e_type == 'hackathon':
-                        entry = Hackathon(
-                            title=enriched['title'],
-                            description=enriched['description'],
-                            organizer=enriched.get('organizer', 'Unknown'),
-                            location=enriched['location'],
-                            mode=enriched['mode'],
-                            deadline=enriched.get('deadline'),
-                            prize_pool=enriched.get('prize_pool', 'Not specified'),
-                            registration_link=enriched['registration_link'],
-                            status='pending',
-                            source=enriched.get('source', 'Web')
-                        )
-                    else:
-                        entry = Internship(
-                            title=enriched['title'],
-                            company=enriched.get('company', 'Unknown'),
-                            description=enriched['description'],
-                            location=enriched['location'],
-                            mode=enriched['mode'],
-                            duration='3 months',
-                            deadline=enriched.get('deadline'),
-                            skills_required=enriched.get('skills_required', 'Programming'),
-                            application_link=enriched['application_link'],
-                            status='pending',
-                            source=enriched.get('source', 'Web')
-                        )
+                    for res in bulk_results or []:
+                        if is_duplicate(res.get('name'), url=res.get('link')):
+                            print(f">>> [Scanner] Skipping duplicate: {res.get('name')}", flush=True)
+                            continue
                     
-                    def save_bulk_entry():
-                        db.session.add(entry)
-                        db.session.flush()
-                        return entry.id
-                        
-                    entry_id = db_safe_query(save_bulk_entry)
-                    create_notifications_for_event(e_type, entry_id, entry.title)
-                    if e_type == 'hackathon': new_hacks += 1
-                    else: new_interns += 1
-                    print(f">>> [Scanner] SAVED: {entry.title}", flush=True)
-            queries = get_dynamic_queries(e_type)
-            print(f">>> [Scanner] Google Discovery queries for {e_type}: {len(queries)}", flush=True)
-            for q in queries:
-                print(f">>> [Scanner] Running discovery query: {q}", flush=True)
-                results = google_search(q, num_results=5)
-                for res in results:
-                    if not check_link_validity(res['link']): 
-                        print(f">>> [Scanner] Filtered (Invalid Link): {res['link']}", flush=True)
-                        continue
-                    def check_exists_disc():
-                        return ModelClass.query.filter_by(title=res['title']).first()
-                        
-                    if db_safe_query(check_exists_disc): 
-                        print(f">>> [Scanner] Filtered (Duplicate): {res['title']}", flush=True)
-                        continue
-                    
-                    print(f">>> [Scanner] Discovery candidate: {res['title']}", flush=True)
-                    event_data = parse_event_data(res, e_type)
-                    enriched = analyze_with_gemini(event_data)
-                    if not enriched: continue
-                    
-                    if e_type == 'hackathon':
-                         entry = Hackathon(
-                             title=enriched.get('title'),
-                             description=enriched.get('description'),
-                             organizer=enriched.get('organizer'),
-                             location=enriched.get('location'),
-                             mode=enriched.get('mode'),
-                             deadline=enriched.get('deadline'),
-                             prize_pool=enriched.get('prize_pool'),
-                             registration_link=enriched.get('registration_link'),
-                             status='pending',
-                             source=enriched.get('source', 'Web')
-                         )
-                    else:
-                         entry = Internship(
-                             title=enriched.get('title'),
-                             company=enriched.get('company'),
-                             description=enriched.get('description'),
-                             location=enriched.get('location'),
-                             mode=enriched.get('mode'),
-                             duration=enriched.get('duration', '3 months'),
-                             deadline=enriched.get('deadline'),
-                             skills_required=enriched.get('skills_required', 'Programming'),
-                             application_link=enriched.get('application_link'),
-                             status='pending',
-                             source=enriched.get('source', 'Web')
-                         )
-                    
-                    def save_disc_entry():
-                        db.session.add(entry)
-                        db.session.flush()
-                        return entry.id
-                        
-                    entry_id = db_safe_query(save_disc_entry)
-                    create_notifications_for_event(e_type, entry_id, entry.title)
-                    if e_type == 'hackathon': new_hacks += 1
-                    else: new_interns += 1
-                    print(f">>> [Scanner] SAVED ({e_type}): {entry.title}", flush=True)
+                        print(f">>> [Scanner] Found new potential candidate: {res['name']}", flush=True)
+                        candidates.append({
+                            'title': res['name'],
+                            'description': res.get('description') or '',
+                            'organizer': res.get('organizer') if e_type == 'hackathon' else None,
+                            'company': res.get('organizer') if e_type == 'internship' else None,
+                            'location': res.get('location') or 'India',
+                            'mode': res.get('mode') or 'Hybrid',
+                            'registration_link': res['link'] if e_type == 'hackathon' else None,
+                            'application_link': res['link'] if e_type == 'internship' else None,
+                            'source': source_name
+                        })
+
+                recorder.candidates(len(candidates))
+                candidates = _live_candidates(candidates)
+                direct_task = _enrich_task(check_expiry=True)
+                for candidate, enriched in pipeline.map_unordered(direct_task, candidates, _event_link):
+                    if enriched:
+                        save_enriched(candidate, enriched, enriched.get('source', 'Web'))
+
+            # 3. GOOGLE DISCOVERY - queries run in parallel, then candidates are validated and enriched in parallel
+            with recorder.stage('discovery', e_type):
+                queries = get_dynamic_queries(e_type)
+                print(f">>> [Scanner] Google Discovery queries for {e_type}: {len(queries)}", flush=True)
+                candidates = []
+                search_results = pipeline.map_unordered(
+                    lambda q: google_search(q, num_results=5),
+                    queries,
+                    lambda q: 'https://www.googleapis.com'
+                )
+                for q, results in search_results:
+                    print(f">>> [Scanner] Discovery query finished: {q} ({len(results or [])} results)", flush=True)
+                    for res in results or []:
+                        if is_duplicate(res.get('title'), url=res.get('link')):
+                            print(f">>> [Scanner] Filtered (Duplicate): {res.get('title')}", flush=True)
+                            continue
                     
-                    # Periodic session refresh to prevent Supabase timeouts
-                    if (new_hacks + new_interns) % 5 == 0:
-                        db.session.commit()
-                        db.session.remove()
+                        print(f">>> [Scanner] Discovery candidate: {res['title']}", flush=True)
+                        candidates.append(parse_event_data(res, e_type))
+
+                recorder.candidates(len(candidates))
+                candidates = _live_candidates(candidates)
+                for candidate, enriched in pipeline.map_unordered(_enrich_task(), candidates, _event_link):
+                    if enriched:
+                        save_enriched(candidate, enriched, e_type)
             
+        new_hacks = saved_counts['hackathon']
+        new_interns = saved_counts['internship']
         print(f">>> [Scanner] Committing final results ({new_hacks} hacks, {new_interns} interns)...", flush=True)
         def final_commit():
+            ai_cache.flush()
             db.session.commit()
             return True
         db_safe_query(final_commit)
@@ -770,9 +809,6 @@ def _perform_scan():
             'new_internships': new_interns,
             'status': 'success'
         }
-        
-        global scan_results
-        scan_results.append(result)
         return result
         
     except Exception as e:
@@ -780,32 +816,40 @@ def _perform_scan():
         db.session.rollback()
         raise
 
-def ai_scan_and_save(app=None):
-    """
-    Main scanning function with background safety.
-    """
-    print(f">>> [Scanner Thread] Worker started at {datetime.now()}", flush=True)
+def _scan_with_status_flag():
+    """Run one scan with the is_scanning flag raised and record it in scan_runs
+    (needs an app context; errors propagate)"""
     try:
         def set_scanning_true():
             AppSetting.set('is_scanning', 'true')
         db_safe_query(set_scanning_true)
     except:
         pass
-    time.sleep(2)
-    
+
+    run_id = None
     try:
-        if app:
-            with app.app_context():
-                return _perform_scan()
-        else:
-            from app import create_app
-            temp_app = create_app()
-            with temp_app.app_context():
-                return _perform_scan()
+        run_id = db_safe_query(start_run)
     except Exception as e:
-        print(f"❌ [Scanner Thread] Scan failed: {e}", flush=True)
-        return {'error': str(e)}
+        print(f"⚠️ [Scanner] Could not create the scan run record: {e}", flush=True)
+        db.session.rollback()
+
+    status, error = 'failed', None
+    try:
+        with recording() as recorder:
+            result = _perform_scan()
+            status = 'success'
+            return dict(result, scan_run_id=run_id)
+    except Exception as e:
+        error = str(e)
+        raise
     finally:
+        if run_id is not None:
+            try:
+                run = db_safe_query(finish_run, run_id, recorder, status, error)
+                print(f">>> [Scanner] Run {run_id} {status} in {run.duration_seconds}s", flush=True)
+            except Exception as e:
+                print(f"⚠️ [Scanner] Could not store the scan run record: {e}", flush=True)
+                db.session.rollback()
         try:
             def set_scanning_false():
                 AppSetting.set('is_scanning', 'false')
@@ -814,33 +858,141 @@ def ai_scan_and_save(app=None):
         except:
             pass
 
+def ai_scan_and_save(app=None):
+    """
+    Run a scan right here (debug scripts). The web tier queues scans instead,
+    see run_scan_job.
+    """
+    print(f">>> [Scanner Thread] Worker started at {datetime.now()}", flush=True)
+    try:
+        if app:
+            with app.app_context():
+                return _scan_with_status_flag()
+        else:
+            from app import create_app
+            temp_app = create_app()
+            with temp_app.app_context():
+                return _scan_with_status_flag()
+    except Exception as e:
+        print(f"❌ [Scanner Thread] Scan failed: {e}", flush=True)
+        return {'error': str(e)}
+
+@job_handler('scan')
+def run_scan_job(payload):
+    """Queued scan, run by the job worker (a failure is retried by the queue)"""
+    return _scan_with_status_flag()
+
+@job_handler('auto_approve')
+def run_auto_approve_job(payload):
+    auto_approve_oldest_5(current_app._get_current_object())
+
+def _admin_only():
+    """403 response unless the JWT user is an admin, else None"""
+    user = User.query.get(int(get_jwt_identity()))
+    if not user or user.role != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    return None
+
 @scanner_bp.route('/scan', methods=['POST'])
+@jwt_required()
 def trigger_scan():
-    """Manual scan trigger - runs in background with DB safety"""
-    from flask import current_app
-    app_obj = current_app._get_current_object()
-    print(f">>> [Admin] Launching scanner thread...", flush=True)
-    
-    # Run in background to avoid 502 timeout
-    thread = threading.Thread(target=ai_scan_and_save, args=(app_obj,))
-    thread.daemon = True
-    thread.start()
-    
+    """Manual scan trigger - queued for the job worker"""
+    denied = _admin_only()
+    if denied:
+        return denied
+    job, created = enqueue('scan')
     return jsonify({
-        "status": "success",
-        "message": "AI scan triggered successfully in background. Results will appear soon.",
+        "status": "success" if created else "already_queued",
+        "message": "AI scan queued. Results will appear soon." if created else "A scan is already queued or running.",
+        "job": job.to_dict(),
         "timestamp": datetime.now().isoformat()
-    })
+    }), 202 if created else 200
+
+@scanner_bp.route('/jobs', methods=['GET'])
+@jwt_required()
+def get_jobs():
+    """Recent background jobs (?kind=scan to filter)"""
+    denied = _admin_only()
+    if denied:
+        return denied
+    limit = min(request.args.get('limit', 20, type=int) or 20, 100)
+    return jsonify({"jobs": [job.to_dict() for job in recent_jobs(limit, request.args.get('kind'))]})
+
+@scanner_bp.route('/jobs/<int:job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    denied = _admin_only()
+    if denied:
+        return denied
+    job = BackgroundJob.query.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
 
 @scanner_bp.route('/results', methods=['GET'])
+@jwt_required()
 def get_scan_results():
-    return jsonify({"results": scan_results[-10:]})
+    """Recent scan runs, newest first, with per-stage timing and fetch/Gemini stats (?limit=, max 100)"""
+    denied = _admin_only()
+    if denied:
+        return denied
+    limit = min(request.args.get('limit', 10, type=int) or 10, 100)
+    runs = ScanRun.query.order_by(ScanRun.started_at.desc()).limit(limit).all()
+    return jsonify({"results": [run.to_dict() for run in runs]})
+
+@scanner_bp.route('/results/<int:run_id>', methods=['GET'])
+@jwt_required()
+def get_scan_run(run_id):
+    denied = _admin_only()
+    if denied:
+        return denied
+    run = ScanRun.query.get(run_id)
+    if run is None:
+        return jsonify({"error": "Scan run not found"}), 404
+    return jsonify(run.to_dict())
+
+@scanner_bp.route('/http-stats', methods=['GET'])
+@jwt_required()
+def get_http_stats():
+    """Connection pool reuse counters of the shared outbound HTTP client and the per-host rate limits"""
+    denied = _admin_only()
+    if denied:
+        return denied
+    return jsonify(dict(http_client.get_stats(), host_limits=get_host_limiter().get_stats()))
+
+@scanner_bp.route('/cache-stats', methods=['GET'])
+@jwt_required()
+def get_cache_stats():
+    """Hit/miss counters of the scanner's caches"""
+    denied = _admin_only()
+    if denied:
+        return denied
+    return jsonify({
+        'page_cache': get_page_cache().get_stats(),
+        'link_health': get_link_health().get_stats(),
+        'ai_cache': ai_cache.get_stats()
+    })
+
+@scanner_bp.route('/ai-status', methods=['GET'])
+@jwt_required()
+def get_ai_status():
+    """Cached Gemini model discovery and per-model results of the shared MatchService"""
+    denied = _admin_only()
+    if denied:
+        return denied
+    return jsonify(get_match_service().get_state())
 
 @scanner_bp.route('/schedule', methods=['GET'])
+@jwt_required()
 def get_schedule_status():
+    denied = _admin_only()
+    if denied:
+        return denied
     jobs = scheduler.get_jobs()
     return jsonify({
         "running": scheduler.running,
+        "leader": bool(scheduler_lease and scheduler_lease.is_leader),
+        "leader_holder": scheduler_lease.current_holder() if scheduler_lease else None,
         "jobs": [{"id": j.id, "next": j.next_run_time.isoformat() if j.next_run_time else None} for j in jobs]
     })
 
@@ -865,6 +1017,10 @@ def auto_approve_oldest_5(app=None):
                 approved.append(f"Internship: {i.title}")
             
             db.session.commit()
+            for h in pending_hacks:
+                opportunity_changed('hackathon', h)
+            for i in pending_interns:
+                opportunity_changed('internship', i)
             print(f"[Auto-Approve] Approved {len(approved)} items: {approved}", flush=True)
         except Exception as e:
             print(f"[Auto-Approve] Error: {e}", flush=True)
@@ -883,50 +1039,95 @@ def auto_approve_oldest_5(app=None):
 
 
 def cleanup_expired_opportunities(app=None):
-    """Periodically check all active opportunities and auto-expire them if the page is dead"""
+    """Expire approved opportunities whose deadline passed or whose page says they are closed"""
     def _run_cleanup():
-        print("[Cleanup] Starting URL-based expiration check...", flush=True)
+        print("[Cleanup] Starting expiry sweep...", flush=True)
         try:
-            expired_count = 0
-            # Check Hackathons
-            hackathons = Hackathon.query.filter_by(status='approved').all()
-            for h in hackathons:
-                if h.registration_link and is_opportunity_expired_centralized(h.registration_link):
-                    h.status = 'expired'
-                    expired_count += 1
-            
-            # Check Internships
-            internships = Internship.query.filter_by(status='approved').all()
-            for i in internships:
-                if i.application_link and is_opportunity_expired_centralized(i.application_link):
-                    i.status = 'expired'
-                    expired_count += 1
-            
-            db.session.commit()
-            print(f"[Cleanup] Finished. Expired {expired_count} opportunities based on link contents.", flush=True)
+            result = sweep_expired(current_app._get_current_object(), expired_status='expired')
+            print(f"[Cleanup] Finished. Expired {result['deadline_expired'] + result['link_expired']} opportunities.", flush=True)
+            return result
         except Exception as e:
             print(f"[Cleanup] Error: {e}", flush=True)
             db.session.rollback()
 
     if app:
         with app.app_context():
-            _run_cleanup()
+            return _run_cleanup()
     else:
         from app import create_app
         temp_app = create_app()
         with temp_app.app_context():
-            _run_cleanup()
+            return _run_cleanup()
+
+
+def _sweep_summary(result):
+    """Job result of a sweep: the counters, without the (possibly long) id lists"""
+    return {key: value for key, value in result.items() if key != 'expired_ids'}
+
+@job_handler('cleanup_expired')
+def run_cleanup_job(payload):
+    return _sweep_summary(sweep_expired(current_app._get_current_object(), expired_status='expired'))
+
+@job_handler('purge_expired')
+def run_purge_job(payload):
+    """Admin purge: expired items are moved to rejected and remembered for /admin/undo-purge"""
+    result = sweep_expired(current_app._get_current_object(), expired_status='rejected', full=bool(payload.get('full')))
+    purged = result['expired_ids']
+    AppSetting.set('last_purge_data', json.dumps({
+        'hackathons': purged['hackathon'],
+        'internships': purged['internship'],
+        'timestamp': datetime.utcnow().isoformat()
+    }))
+    return dict(
+        _sweep_summary(result),
+        message=f"Purged {len(purged['hackathon'])} hackathons and {len(purged['internship'])} internships (moved to rejected status).",
+        purged_hackathons_count=len(purged['hackathon']),
+        purged_internships_count=len(purged['internship']),
+        can_undo=True
+    )
+
+
+def enqueue_scheduled_job(app, kind):
+    """Scheduler entry point: only queues the job, the job worker runs it"""
+    with app.app_context():
+        try:
+            job, created = enqueue(kind)
+            if not created:
+                print(f"[Scheduler] {kind} job {job.id} is still {job.status}; not queuing another", flush=True)
+        except Exception as e:
+            print(f"[Scheduler] Could not queue {kind} job: {e}", flush=True)
+            db.session.rollback()
+        finally:
+            db.session.remove()
+
+def _resume_scheduler():
+    scheduler.resume()
+    print("✅ Scheduler resumed: this process is the scheduler leader", flush=True)
 
+def _pause_scheduler():
+    scheduler.pause()
+    print("⏸️  Scheduler paused: another process is the scheduler leader", flush=True)
 
 def start_scheduler(app):
+    """Start the scheduler paused in every process; only the holder of the scheduler lease resumes it"""
+    global scheduler_lease
     if not scheduler.running:
-        scheduler.add_job(func=ai_scan_and_save, trigger="interval", minutes=60, id='ai_scanner_v2', args=[app])
-        scheduler.add_job(func=auto_approve_oldest_5, trigger="interval", hours=24, id='auto_approve_job', args=[app])
-        scheduler.add_job(func=cleanup_expired_opportunities, trigger="interval", hours=12, id='cleanup_expired_job', args=[app])
-        scheduler.start()
-        print("✅ Advanced AI Scanner v2 scheduler started (with 24h auto-approve job & 12h link cleanup job)")
+        scheduler.add_job(func=enqueue_scheduled_job, trigger="interval", minutes=60, id='ai_scanner_v2', args=[app, 'scan'])
+        scheduler.add_job(func=enqueue_scheduled_job, trigger="interval", hours=24, id='auto_approve_job', args=[app, 'auto_approve'])
+        scheduler.add_job(func=enqueue_scheduled_job, trigger="interval", hours=12, id='cleanup_expired_job', args=[app, 'cleanup_expired'])
+        scheduler.start(paused=True)
+        scheduler_lease = LeaderLease(
+            app, 'scheduler',
+            lease_seconds=app.config.get('SCHEDULER_LEASE_SECONDS', 90),
+            on_elected=_resume_scheduler,
+            on_deposed=_pause_scheduler
+        )
+        scheduler_lease.start()
+        print("✅ Advanced AI Scanner v2 scheduler started (with 24h auto-approve job & 12h link cleanup job); waiting for the scheduler lease")
 
 def stop_scheduler():
+    if scheduler_lease is not None:
+        scheduler_lease.stop()
     if scheduler.running:
         scheduler.shutdown()
         print("⏹️  AI Scanner scheduler stopped")
@@ -1,11 +1,28 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, TrackedEvent, User, Hackathon, Internship
+from models import db, TrackedEvent, User, Hackathon, Internship, load_events
 from datetime import datetime
+from collections import namedtuple
 from services.match_service import get_match_service
+from services.match_jobs import PROCESS_LOCAL_NOTE, get_match_job_runner
+from services.match_engine import get_match_engine, local_score
+from services.recommendations import get_recommendation_feed
+from services.resume_extract import resolve_resume
 
 tracker_bp = Blueprint('tracker', __name__)
 
+# Anything load_events() can resolve (it only reads event_type/event_id)
+EventRef = namedtuple('EventRef', ['event_type', 'event_id'])
+
+
+def _opportunity_details(event_type, event):
+    """The fields of a hackathon/internship the match prompt uses ({} if it no longer exists)"""
+    if not event:
+        return {}
+    if event_type == 'hackathon':
+        return {'title': event.title, 'description': event.description, 'organizer': event.organizer}
+    return {'title': event.title, 'description': event.description, 'company': event.company, 'skills_required': event.skills_required}
+
 @tracker_bp.route('', methods=['GET'])
 @jwt_required()
 def get_tracked_events():
@@ -13,7 +30,7 @@ def get_tracked_events():
     try:
         user_id = int(get_jwt_identity())
         tracked = TrackedEvent.query.filter_by(user_id=user_id).all()
-        return jsonify([t.to_dict() for t in tracked]), 200
+        return jsonify(TrackedEvent.serialize_many(tracked)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -63,21 +80,13 @@ def add_to_tracker():
                 match_service = get_match_service()
                 
                 # Fetch event details
-                opportunity_details = {}
-                if event_type == 'hackathon':
-                    event = Hackathon.query.get(event_id)
-                    if event:
-                        opportunity_details = {'title': event.title, 'description': event.description, 'organizer': event.organizer}
-                else:
-                    event = Internship.query.get(event_id)
-                    if event:
-                        opportunity_details = {'title': event.title, 'description': event.description, 'company': event.company, 'skills_required': event.skills_required}
+                EventModel = Hackathon if event_type == 'hackathon' else Internship
+                opportunity_details = _opportunity_details(event_type, EventModel.query.get(event_id))
                 
                 if opportunity_details:
                     score, explanation = match_service.calculate_score(
-                        user.resume_text, 
-                        opportunity_details,
-                        resume_link=user.resume_link
+                        resolve_resume(user_id, user.resume_text, user.resume_link),
+                        opportunity_details
                     )
                     # Re-fetch tracked item with a fresh connection
                     tracked = TrackedEvent.query.get(tracked.id)
@@ -172,31 +181,19 @@ def calculate_match(id):
             return jsonify({'error': 'Please add your resume text or a public link in Account Settings first.'}), 400
         
         # Gather all data we need before making the slow API call
-        resume_text = user.resume_text
-        resume_link = user.resume_link
+        resume_text = resolve_resume(user_id, user.resume_text, user.resume_link)
         tracked_id = tracked.id
         event_type = tracked.event_type
         event_id = tracked.event_id
         
-        opportunity_details = {}
-        if event_type == 'hackathon':
-            event = Hackathon.query.get(event_id)
-            if event:
-                opportunity_details = {'title': event.title, 'description': event.description, 'organizer': event.organizer}
-        else:
-            event = Internship.query.get(event_id)
-            if event:
-                opportunity_details = {'title': event.title, 'description': event.description, 'company': event.company, 'skills_required': event.skills_required}
+        EventModel = Hackathon if event_type == 'hackathon' else Internship
+        opportunity_details = _opportunity_details(event_type, EventModel.query.get(event_id))
         
         # Release DB connection before making the slow Gemini API call
         db.session.close()
         
         match_service = get_match_service()
-        score, explanation = match_service.calculate_score(
-            resume_text, 
-            opportunity_details,
-            resume_link=resume_link
-        )
+        score, explanation = match_service.calculate_score(resume_text, opportunity_details)
         
         # Re-fetch with fresh connection and update
         tracked = TrackedEvent.query.get(tracked_id)
@@ -213,3 +210,175 @@ def calculate_match(id):
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
+
+@tracker_bp.route('/match-all', methods=['POST'])
+@jwt_required()
+def match_all():
+    """Score the resume against many tracked items in the background.
+
+    Body (optional): {"ids": [tracked ids], "only_missing": true}. Returns a job
+    whose progress is polled at /match-all/<job_id>; the job lives in this web
+    worker only (the response's 'note' says so).
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        user = User.query.get(user_id)
+        if not user.resume_text and not user.resume_link:
+            return jsonify({'error': 'Please add your resume text or a public link in Account Settings first.'}), 400
+
+        data = request.get_json(silent=True) or {}
+        query = TrackedEvent.query.filter_by(user_id=user_id)
+        if data.get('ids'):
+            query = query.filter(TrackedEvent.id.in_([int(i) for i in data['ids']]))
+        if data.get('only_missing'):
+            query = query.filter(TrackedEvent.match_score.is_(None))
+        tracked_items = query.all()
+
+        events = load_events(tracked_items)
+        opportunities = []
+        for tracked in tracked_items:
+            event_type = 'hackathon' if tracked.event_type == 'hackathon' else 'internship'
+            details = _opportunity_details(event_type, events.get((event_type, tracked.event_id)))
+            if details:
+                opportunities.append((tracked.id, details))
+
+        resume_text = user.resume_text
+        resume_link = user.resume_link
+        # Release DB connection; the job opens its own for the final write
+        db.session.close()
+
+        if not opportunities:
+            return jsonify({'message': 'Nothing to score', 'job': None}), 200
+
+        job, created = get_match_job_runner().start(
+            current_app._get_current_object(), user_id, resume_text, resume_link, opportunities
+        )
+        return jsonify({
+            'message': 'Match scoring started' if created else 'Match scoring already in progress',
+            'job': job.to_dict(),
+            'note': PROCESS_LOCAL_NOTE
+        }), 202
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@tracker_bp.route('/match-all/<job_id>', methods=['GET'])
+@jwt_required()
+def match_all_status(job_id):
+    """Progress (and the scores so far) of a batch match job"""
+    user_id = int(get_jwt_identity())
+    job = get_match_job_runner().get(job_id, user_id)
+    if not job:
+        return jsonify({'error': 'Job not found', 'note': PROCESS_LOCAL_NOTE}), 404
+    return jsonify(job.to_dict()), 200
+
+def _serialize_ranked(user_id, ranked):
+    """[(key, similarity)] -> response items with the opportunity and the user's tracked id (if any)"""
+    events = load_events([EventRef(*key) for key, _ in ranked])
+    tracked_ids = {
+        (t.event_type, t.event_id): t.id
+        for t in TrackedEvent.query.filter_by(user_id=user_id)
+            .with_entities(TrackedEvent.id, TrackedEvent.event_type, TrackedEvent.event_id)
+    }
+
+    results = []
+    for key, similarity in ranked:
+        event = events.get(key)
+        if not event:
+            continue
+        results.append({
+            'event_type': key[0],
+            'event_id': key[1],
+            'local_score': local_score(similarity),
+            'similarity': round(similarity, 4),
+            'tracked_id': tracked_ids.get(key),
+            'event': event.to_dict()
+        })
+    return results
+
+def _ranking_args():
+    """(limit, event_type) from the query string; raises ValueError on bad input"""
+    try:
+        limit = max(1, min(int(request.args.get('limit', 20)), 100))
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    event_type = request.args.get('type')
+    if event_type not in (None, 'hackathon', 'internship'):
+        raise ValueError('type must be hackathon or internship')
+    return limit, event_type
+
+@tracker_bp.route('/best-matches', methods=['GET'])
+@jwt_required()
+def best_matches():
+    """Rank the whole approved catalog against the user's resume locally (no AI call).
+
+    Query params: limit (default 20, max 100), type=hackathon|internship,
+    include_past=true to keep opportunities whose deadline has passed.
+    """
+    try:
+        engine = get_match_engine()
+        if engine is None:
+            return jsonify({'error': 'Local match ranking is unavailable on this server.'}), 503
+
+        user_id = int(get_jwt_identity())
+        user = User.query.get(user_id)
+        if not user.resume_text and not user.resume_link:
+            return jsonify({'error': 'Please add your resume text or a public link in Account Settings first.'}), 400
+
+        try:
+            limit, event_type = _ranking_args()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        resume_text = resolve_resume(user_id, user.resume_text, user.resume_link)
+        if not resume_text:
+            return jsonify({'error': 'Could not read your resume. Paste the text in Account Settings instead.'}), 400
+
+        ranked = engine.rank_resume(
+            resume_text,
+            limit=limit,
+            event_type=event_type,
+            include_past=request.args.get('include_past', 'false').lower() == 'true'
+        )
+
+        return jsonify({'results': _serialize_ranked(user_id, ranked), 'index': engine.get_stats()}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@tracker_bp.route('/recommended', methods=['GET'])
+@jwt_required()
+def recommended():
+    """The user's "Recommended for you" feed, kept up to date incrementally.
+
+    Query params: limit (default 20, max 100), type=hackathon|internship.
+    """
+    try:
+        feed = get_recommendation_feed()
+        if feed is None:
+            return jsonify({'error': 'Recommendations are unavailable on this server.'}), 503
+
+        user_id = int(get_jwt_identity())
+        user = User.query.get(user_id)
+        if not user.resume_text and not user.resume_link:
+            return jsonify({'error': 'Please add your resume text or a public link in Account Settings first.'}), 400
+
+        try:
+            limit, event_type = _ranking_args()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        resume_text, resume_link = user.resume_text, user.resume_link
+        ranked = feed.get_feed(
+            user_id,
+            lambda: resolve_resume(user_id, resume_text, resume_link),
+            limit=limit,
+            event_type=event_type
+        )
+        if ranked is None:
+            return jsonify({'error': 'Could not read your resume. Paste the text in Account Settings instead.'}), 400
+
+        return jsonify({'results': _serialize_ranked(user_id, ranked), 'feed': feed.get_stats()}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
@@ -1,4 +1,4 @@
-import requests
+from services import http_client
 from bs4 import BeautifulSoup
 import re
 from datetime import datetime
@@ -21,7 +21,7 @@ class AggregationService:
         url = "https://www.linkedin.com/jobs/search?keywords=Software%20Engineer%20Internship&location=India&geoId=102713980&f_TPR=r86400&position=1&pageNum=0"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
+            response = http_client.get(url, headers=self.headers, timeout=15, polite=True)
             if response.status_code != 200:
                 print(f"LinkedIn scrape failed with status: {response.status_code}")
                 return []
@@ -0,0 +1,172 @@
+"""
+Persistent cache of Gemini responses
+Entries are keyed by a hash of the prompt template version plus the
+normalized input text, so an unchanged listing page costs zero model calls
+on the next scan. Backed by the ai_cache table with a TTL and a size cap.
+Prompts that embed today's date put it in the version too, so an answer
+judged against yesterday's date is not reused.
+Lookups and stores run on the scan's pipeline threads and never write: new
+responses and hit counts are collected in memory (and served from there
+meanwhile), then written by flush() from the scan thread, the single DB
+writer, which also runs the eviction pass.
+"""
+import hashlib
+import re
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from config import Config
+from models import db, AICacheEntry
+
+# Run the (count + delete) eviction pass once every this many stores
+EVICT_EVERY = 25
+
+_stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evicted': 0}
+_stats_lock = threading.Lock()
+
+# Not yet written to the ai_cache table: key -> [hits, last used], key -> (prompt version, response, stored at)
+_pending_hits = {}
+_pending_stores = {}
+_stores_since_evict = 0
+
+
+def _count(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def normalize_input(text):
+    """Collapse whitespace so cosmetic page changes don't bust the cache"""
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+def make_cache_key(prompt_version, input_text):
+    digest = hashlib.sha256()
+    digest.update(prompt_version.encode('utf-8'))
+    digest.update(b'\n')
+    digest.update(normalize_input(input_text).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def get_cached_response(prompt_version, input_text):
+    """Return a cached, unexpired response or None"""
+    key = make_cache_key(prompt_version, input_text)
+    try:
+        cutoff = datetime.utcnow() - timedelta(hours=Config.AI_CACHE_TTL_HOURS)
+        with _stats_lock:
+            stored = _pending_stores.get(key)
+        if stored is not None:
+            response, created_at = stored[1], stored[2]
+        else:
+            entry = AICacheEntry.query.get(key)
+            response, created_at = (entry.response, entry.created_at) if entry is not None else (None, None)
+        if response is None or created_at < cutoff:
+            _count('misses')
+            return None
+
+        with _stats_lock:
+            pending = _pending_hits.setdefault(key, [0, None])
+            pending[0] += 1
+            pending[1] = datetime.utcnow()
+        _count('hits')
+        return response
+    except Exception as e:
+        print(f"⚠️ [AI Cache] Lookup failed: {e}", flush=True)
+        db.session.rollback()
+        return None
+
+
+def flush():
+    """Write the responses and hit counts collected since the last flush (the caller commits).
+
+    Call from the scan thread only. Every EVICT_EVERY stores the eviction
+    pass runs here too. Returns the number of entries written.
+    """
+    global _pending_hits, _pending_stores, _stores_since_evict
+    with _stats_lock:
+        hits, _pending_hits = _pending_hits, {}
+        stores, _pending_stores = _pending_stores, {}
+        evict = _stores_since_evict >= EVICT_EVERY
+        if evict:
+            _stores_since_evict = 0
+
+    for key, (prompt_version, response, stored_at) in stores.items():
+        # Replaces any expired entry under the same key
+        entry = AICacheEntry.query.get(key)
+        if entry is None:
+            entry = AICacheEntry(key=key, prompt_version=prompt_version)
+            db.session.add(entry)
+        entry.response = response
+        entry.hits = 0
+        entry.created_at = stored_at
+        entry.last_used_at = stored_at
+    if stores:
+        db.session.flush()
+
+    for key, (count, last_used_at) in hits.items():
+        AICacheEntry.query.filter_by(key=key).update({
+            'hits': AICacheEntry.hits + count,
+            'last_used_at': last_used_at
+        }, synchronize_session=False)
+
+    if evict:
+        evict_entries()
+    return len(stores.keys() | hits.keys())
+
+
+def store_response(prompt_version, input_text, response):
+    """Queue a response for the next flush(); it is served from memory until then"""
+    global _stores_since_evict
+    if not response or len(response) > Config.AI_CACHE_MAX_RESPONSE_CHARS:
+        return
+    key = make_cache_key(prompt_version, input_text)
+    with _stats_lock:
+        _pending_stores[key] = (prompt_version, response, datetime.utcnow())
+        _pending_hits.pop(key, None)
+        _stats['stores'] += 1
+        _stores_since_evict += 1
+
+
+def evict_entries():
+    """Drop expired entries and trim the table to AI_CACHE_MAX_ENTRIES, least recently used first (the caller commits)"""
+    cutoff = datetime.utcnow() - timedelta(hours=Config.AI_CACHE_TTL_HOURS)
+    removed = AICacheEntry.query.filter(AICacheEntry.created_at < cutoff).delete(synchronize_session=False)
+
+    overflow = AICacheEntry.query.count() - Config.AI_CACHE_MAX_ENTRIES
+    if overflow > 0:
+        stale_keys = db.session.query(AICacheEntry.key)\
+            .order_by(AICacheEntry.last_used_at.asc())\
+            .limit(overflow).subquery()
+        removed += AICacheEntry.query.filter(AICacheEntry.key.in_(db.session.query(stale_keys.c.key)))\
+            .delete(synchronize_session=False)
+
+    if removed:
+        _count('evicted', removed)
+    return removed
+
+
+def cached_generate(prompt_version, input_text, prompt, generate):
+    """Return the cached response for (prompt_version, input_text) or call generate(prompt) and cache it.
+
+    Only responses that contain a JSON object are stored, so empty or
+    malformed answers are retried on the next call.
+    """
+    cached = get_cached_response(prompt_version, input_text)
+    if cached is not None:
+        return cached
+
+    response = generate(prompt)
+    if response and '{' in response:
+        store_response(prompt_version, input_text, response)
+    return response
+
+
+def get_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    try:
+        stats['entries'] = db.session.query(func.count(AICacheEntry.key)).scalar()
+    except Exception:
+        db.session.rollback()
+    stats['max_entries'] = Config.AI_CACHE_MAX_ENTRIES
+    return stats
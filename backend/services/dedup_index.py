@@ -0,0 +1,142 @@
+"""
+In-memory duplicate index for scanner candidates
+Loaded with one query at the start of a scan, then every candidate is checked
+against it without a DB round trip. Titles are normalized (case, punctuation,
+platform suffixes such as "| Devfolio") and hashed, so "ETHIndia 2026" and
+"ETHIndia 2026 | Devfolio" collapse to the same key. Links are compared in a
+canonical form (no scheme, www., tracking params or trailing slash).
+"""
+import hashlib
+import re
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# Listing platforms that get appended to page titles ("X | Devfolio", "X - Unstop")
+PLATFORM_SUFFIXES = (
+    'devfolio', 'devpost', 'unstop', 'mlh', 'major league hacking', 'hackerearth',
+    'dorahacks', 'hack2skill', 'linkedin', 'internshala', 'naukri', 'indeed',
+    'glassdoor', 'wellfound', 'angellist', 'eventbrite', 'lu.ma', 'luma', 'meetup'
+)
+
+_SUFFIX_RE = re.compile(
+    r'\s*(?:\||-|–|—|:|\bon\b)\s*(?:' +
+    '|'.join(re.escape(name) for name in PLATFORM_SUFFIXES) +
+    r')(?:\.[a-z]{2,4})?\s*$',
+    re.IGNORECASE
+)
+_NON_WORD_RE = re.compile(r'[^\w]+', re.UNICODE)
+
+TRACKING_PARAMS = ('utm_', 'ref', 'source', 'fbclid', 'gclid', 'trk', 'lipi', 'refid', 'trackingid')
+
+
+def normalize_title(title):
+    """Lowercase, strip platform suffixes and punctuation, collapse whitespace"""
+    text = (title or '').strip()
+    # Strip repeatedly: "X | Devfolio - LinkedIn"
+    previous = None
+    while text and text != previous:
+        previous = text
+        text = _SUFFIX_RE.sub('', text)
+    return ' '.join(_NON_WORD_RE.sub(' ', text.lower()).split())
+
+
+def title_hash(title):
+    """Stable hash of the normalized title, or None for an empty title"""
+    normalized = normalize_title(title)
+    if not normalized:
+        return None
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def canonical_url(url):
+    """Host + path + non-tracking query, lowercased host, no www./scheme/fragment/trailing slash"""
+    if not url:
+        return None
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return None
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if not host:
+        return None
+    path = parts.path.rstrip('/')
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    ]
+    canonical = host + path
+    if query:
+        canonical += '?' + urlencode(sorted(query))
+    return canonical
+
+
+class DedupIndex:
+    """Titles, (title, company) pairs and links already known for one event type.
+
+    Not thread-safe: the scan thread is the only reader and writer.
+    """
+
+    def __init__(self, track_company=False):
+        self.track_company = track_company
+        self.title_hashes = set()
+        self.title_company_keys = set()
+        self.urls = set()
+
+    @classmethod
+    def load(cls, ModelClass, link_column, company_column=None):
+        """Build the index from every stored row (any status) in a single query"""
+        columns = [ModelClass.title, getattr(ModelClass, link_column)]
+        if company_column:
+            columns.append(getattr(ModelClass, company_column))
+
+        index = cls(track_company=company_column is not None)
+        for row in ModelClass.query.with_entities(*columns).all():
+            index.add(row[0], url=row[1], company=row[2] if company_column else None)
+        return index
+
+    def _company_key(self, hashed, company):
+        return f"{hashed}:{normalize_title(company)}"
+
+    def contains(self, title, company=None, url=None):
+        """Return the reason a candidate is a duplicate ('title', 'title+company', 'url') or None.
+
+        Empty titles count as duplicates so they are never saved.
+        """
+        hashed = title_hash(title)
+        if hashed is None:
+            return 'title'
+
+        canonical = canonical_url(url)
+        if canonical and canonical in self.urls:
+            return 'url'
+
+        if self.track_company and company:
+            # Same role title at a different company is a different internship
+            if self._company_key(hashed, company) in self.title_company_keys:
+                return 'title+company'
+            return None
+
+        if hashed in self.title_hashes:
+            return 'title'
+        return None
+
+    def add(self, title, company=None, url=None):
+        hashed = title_hash(title)
+        if hashed is not None:
+            self.title_hashes.add(hashed)
+            if self.track_company and company:
+                self.title_company_keys.add(self._company_key(hashed, company))
+        canonical = canonical_url(url)
+        if canonical:
+            self.urls.add(canonical)
+
+    def claim(self, title, company=None, url=None):
+        """Add the candidate and return True if it was new, False if it is a duplicate"""
+        if self.contains(title, company=company, url=url):
+            return False
+        self.add(title, company=company, url=url)
+        return True
+
+    def __len__(self):
+        return len(self.title_hashes)
@@ -2,7 +2,7 @@
 Email Service for DevAlert
 Handles sending verification and password reset emails via Mailgun API or SMTP
 """
-import requests
+from services import http_client
 from flask import current_app, render_template_string
 from flask_mail import Mail, Message
 import secrets
@@ -33,7 +33,7 @@ def send_email_via_mailgun(to, subject, html_body):
     sender = current_app.config.get('MAIL_FROM_EMAIL')
     
     try:
-        response = requests.post(
+        response = http_client.post(
             f"https://api.mailgun.net/v3/{domain}/messages",
             auth=("api", api_key),
             data={"from": f"DevAlert <{sender}>", "to": [to], "subject": subject, "html": html_body}
@@ -69,7 +69,7 @@ def send_email_via_brevo(to, subject, html_body):
     }
     
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        response = http_client.post(url, json=payload, headers=headers)
         if response.status_code in [200, 201]:
             print(f"✅ Brevo email sent to {to}")
             logging.info(f"✅ Brevo email sent successfully to {to}")
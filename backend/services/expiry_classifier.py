@@ -0,0 +1,148 @@
+"""
+Expiry classifier for opportunity pages
+Decides from a page's cleaned text whether registration is closed, and says
+which signal matched. Patterns are compiled once per pack; per page the top
+of the text is lowercased once, then:
+1. every signal names an anchor word that any match must contain; anchors are
+   checked with plain substring search, and a page containing none of them is
+   open without running a regex at all (most pages in a sweep);
+2. only the signals whose anchor is present are searched, and the earliest
+   match wins.
+Each signal keeps its own compiled pattern rather than joining them into one
+alternation: Python's re loses its fast literal-prefix scan on an alternation,
+which made the combined pattern several times slower than the separate ones
+(see benchmarks/bench_expiry_classifier.py).
+Signals are deliberately strong, full phrases: when in doubt the page is
+treated as open. Sites with their own wording (Google Forms, Devfolio,
+Unstop) get a pack of extra signals on top of the generic ones, picked by the
+link's host.
+"""
+import re
+import threading
+from urllib.parse import urlparse
+
+# Only this much of the page text is looked at; closure notices sit near the top
+SCAN_CHARS = 4000
+
+# (name, anchor, pattern) - full phrases only, never single words like "expired". The anchor
+# is a lowercase word every match of the pattern contains.
+GENERIC_SIGNALS = [
+    ('registration_closed', 'closed', r'registrations?\s+(?:is|are|have\s+been)\s+closed'),
+    ('no_longer_accepting', 'accepting', r'no\s+longer\s+accepting\s+(?:responses|applications|entries|registrations)'),
+    ('applications_closed', 'closed', r'applications\s+are\s+closed'),
+    ('opportunity_expired', 'expired', r'opportunity\s+has\s+expired'),
+    ('registrations_closed', 'closed', r'registrations?\s+closed'),
+    ('event_inactive', 'active', r'event\s+is\s+no\s+longer\s+active'),
+    ('no_more_entries', 'entries', r'not\s+accepting\s+any\s+more\s+entries'),
+]
+
+# Extra signals per site: pack name -> (hosts, signals)
+DOMAIN_PACKS = {
+    'google_forms': (
+        ('docs.google.com', 'forms.gle'),
+        [
+            ('form_closed', 'accepting', r'this\s+form\s+is\s+no\s+longer\s+accepting\s+responses'),
+            ('form_owner_closed', 'mistake', r'try\s+contacting\s+the\s+owner\s+of\s+the\s+form\s+if\s+you\s+think\s+this\s+is\s+a\s+mistake'),
+        ]
+    ),
+    'devfolio': (
+        ('devfolio.co',),
+        [
+            ('devfolio_applications_closed', 'closed', r'\bapplications\s+(?:have\s+)?closed\b'),
+            ('devfolio_hackathon_ended', 'ended', r'this\s+hackathon\s+has\s+ended'),
+        ]
+    ),
+    'unstop': (
+        ('unstop.com',),
+        [
+            ('unstop_deadline_passed', 'passed', r'registration\s+deadline\s+(?:has\s+)?passed'),
+            ('unstop_registrations_over', 'over', r'\bregistrations?\s+(?:are\s+|is\s+)?over\b'),
+        ]
+    ),
+}
+
+
+class ExpiryVerdict:
+    """Outcome of classifying one page"""
+
+    def __init__(self, expired, signal=None, pack=None, snippet=None):
+        self.expired = expired
+        self.signal = signal
+        self.pack = pack
+        self.snippet = snippet
+
+    def __bool__(self):
+        return self.expired
+
+    def to_dict(self):
+        return {'expired': self.expired, 'signal': self.signal, 'pack': self.pack, 'snippet': self.snippet}
+
+
+OPEN = ExpiryVerdict(False)
+
+
+class ExpiryClassifier:
+    """Compiled signals, grouped by anchor, for the generic set and each domain pack"""
+
+    def __init__(self, generic=GENERIC_SIGNALS, packs=DOMAIN_PACKS, scan_chars=SCAN_CHARS):
+        self.scan_chars = scan_chars
+        self._hosts = {}
+        self._matchers = {None: self._compile(generic)}
+        for pack, (hosts, signals) in packs.items():
+            for host in hosts:
+                self._hosts[host] = pack
+            self._matchers[pack] = self._compile(list(generic) + list(signals))
+
+    @staticmethod
+    def _compile(signals):
+        """{anchor: [(name, compiled pattern), ...]}"""
+        by_anchor = {}
+        for name, anchor, regex in signals:
+            by_anchor.setdefault(anchor, []).append((name, re.compile(regex)))
+        return by_anchor
+
+    def pack_for(self, url):
+        """Name of the domain pack for a link, or None for the generic signals only"""
+        if not url:
+            return None
+        host = (urlparse(url).hostname or '').lower()
+        while host:
+            if host in self._hosts:
+                return self._hosts[host]
+            host = host.partition('.')[2]
+        return None
+
+    def classify(self, text, url=None):
+        if not text:
+            return OPEN
+        pack = self.pack_for(url)
+        window = text[:self.scan_chars].lower()
+        best = None
+        for anchor, signals in self._matchers[pack].items():
+            if anchor not in window:
+                continue
+            for name, regex in signals:
+                match = regex.search(window)
+                if match is not None and (best is None or match.start() < best[1].start()):
+                    best = (name, match)
+        if best is None:
+            return OPEN
+        name, match = best
+        return ExpiryVerdict(True, signal=name, pack=pack, snippet=match.group(0))
+
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+
+def get_expiry_classifier():
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                _classifier = ExpiryClassifier()
+    return _classifier
+
+
+def classify_page(text, url=None):
+    return get_expiry_classifier().classify(text, url)
@@ -0,0 +1,208 @@
+"""
+Incremental expiry sweeper for approved opportunities
+Used by the scheduled link cleanup and the admin "purge expired" action.
+1. Past deadlines are found with one indexed SQL query; no page is fetched for them.
+2. Only links that are due (next_expiry_check_at unset or passed) are fetched,
+   concurrently through a FetchPipeline, which caps requests per host. A page
+   that says registration is closed expires the item. A link the shared link
+   health store finds dead (404/410) is only expired when the next check,
+   DEAD_RECHECK_INTERVAL later and bypassing the caches, finds it dead again.
+3. Each checked item gets its next check date from how close its deadline is,
+   so items closing soon are looked at often and far-off ones rarely. A page
+   that could not be fetched (network error, bot wall, rate limit) counts as
+   no check at all: the item stays due and is retried after
+   UNFETCHED_RETRY_INTERVAL.
+4. Results are written in chunks of EXPIRY_SWEEP_CHUNK rows, each its own commit.
+"""
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import update, or_
+from config import Config
+from models import db, Hackathon, Internship
+from services.fetch_pipeline import FetchPipeline
+from services.opportunity_service import check_opportunity_expiry, UNFETCHED
+from services.link_health import get_link_health
+from services.page_cache import get_page_cache
+
+SOURCES = [
+    ('hackathon', Hackathon, 'registration_link'),
+    ('internship', Internship, 'application_link'),
+]
+
+# (deadline closer than, check again after) - first match wins
+CHECK_INTERVALS = [
+    (timedelta(days=2), timedelta(hours=6)),
+    (timedelta(days=7), timedelta(hours=12)),
+    (timedelta(days=30), timedelta(days=1)),
+]
+DEFAULT_CHECK_INTERVAL = timedelta(days=3)
+# A first 404/410 is confirmed this much later; unfetched pages are retried after the other
+DEAD_RECHECK_INTERVAL = timedelta(hours=6)
+UNFETCHED_RETRY_INTERVAL = timedelta(minutes=15)
+
+# Outcomes of checking one link
+EXPIRED = 'expired'
+DEAD_ONCE = 'dead_once'
+OPEN = 'open'
+NOT_CHECKED = 'not_checked'
+
+
+def next_check_at(deadline, now):
+    """When a link that was just found open should be checked again"""
+    interval = DEFAULT_CHECK_INTERVAL
+    if deadline is not None:
+        remaining = deadline - now
+        for closer_than, check_after in CHECK_INTERVALS:
+            if remaining < closer_than:
+                interval = check_after
+                break
+    return now + interval
+
+
+class ExpirySweeper:
+    """One sweep over the approved catalog.
+
+    expired_status is what expired items become ('expired' for the scheduled
+    cleanup, 'rejected' for the admin purge, which can be undone).
+    """
+
+    def __init__(self, app, expired_status='expired', max_checks=500, chunk_size=50, max_workers=8,
+                 per_host_limit=2):
+        self.app = app
+        self.expired_status = expired_status
+        self.max_checks = max_checks
+        self.chunk_size = max(1, chunk_size)
+        self.pipeline = FetchPipeline(app, max_workers=max_workers, per_domain_limit=per_host_limit)
+        self.expired_ids = {'hackathon': [], 'internship': []}
+        self.stats = {'deadline_expired': 0, 'links_checked': 0, 'link_expired': 0, 'dead_unconfirmed': 0,
+                      'not_checked': 0, 'due_remaining': 0}
+        self.signals = {}  # expiry signal name -> links it matched
+
+    def run(self, full=False):
+        """Sweep once; full=True checks every approved link, ignoring the schedule"""
+        started = time.monotonic()
+        now = datetime.utcnow()
+        for event_type, Model, _ in SOURCES:
+            self._expire_past_deadlines(event_type, Model, now)
+
+        due = self._due_links(now, full)
+        print(f"[Expiry] {self.stats['deadline_expired']} past deadline; checking {len(due)} links "
+              f"({self.stats['due_remaining']} more due next time)", flush=True)
+
+        pending = []
+        checks = self.pipeline.map_unordered(lambda item: self._check(item[2], item[4] is not None), due,
+                                             lambda item: item[2])
+        for item, result in checks:
+            outcome, signal = result or (NOT_CHECKED, None)
+            if signal:
+                self.signals[signal] = self.signals.get(signal, 0) + 1
+            pending.append((item, outcome))
+            if len(pending) >= self.chunk_size:
+                self._write_chunk(pending)
+                pending = []
+        if pending:
+            self._write_chunk(pending)
+
+        self.stats['signals'] = self.signals
+        self.stats['seconds'] = round(time.monotonic() - started, 2)
+        print(f"[Expiry] Sweep finished: {self.stats}", flush=True)
+        return dict(self.stats, expired_ids=self.expired_ids)
+
+    @staticmethod
+    def _check(link, dead_before):
+        """(outcome, signal): the signal that shows the link expired, if any.
+
+        dead_before: the previous check found the link dead, so this one must
+        reach the server rather than trust cached answers.
+        """
+        if dead_before:
+            get_page_cache().invalidate(link)
+            get_link_health().invalidate(link)
+        verdict = check_opportunity_expiry(link)
+        if verdict:
+            return EXPIRED, verdict.signal
+        if verdict is not UNFETCHED:
+            return OPEN, None
+        # The failed page fetch above usually lets the link health store answer without a request
+        if get_link_health().check(link).dead:
+            return (EXPIRED, 'link_dead') if dead_before else (DEAD_ONCE, None)
+        return NOT_CHECKED, None
+
+    def _expire_past_deadlines(self, event_type, Model, now):
+        ids = [row[0] for row in Model.query.with_entities(Model.id).filter(
+            Model.status == 'approved', Model.deadline.isnot(None), Model.deadline < now
+        ).all()]
+        for start in range(0, len(ids), self.chunk_size):
+            chunk = ids[start:start + self.chunk_size]
+            db.session.execute(
+                update(Model).where(Model.id.in_(chunk), Model.status == 'approved')
+                .values(status=self.expired_status)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+        self.expired_ids[event_type].extend(ids)
+        self.stats['deadline_expired'] += len(ids)
+
+    def _due_links(self, now, full):
+        """(event_type, id, link, deadline, link_dead_at) of the links to fetch now, least recently scheduled first"""
+        due = []
+        for event_type, Model, link_column in SOURCES:
+            link = getattr(Model, link_column)
+            query = Model.query.with_entities(
+                Model.id, link, Model.deadline, Model.next_expiry_check_at, Model.link_dead_at
+            ).filter(
+                Model.status == 'approved', link.isnot(None), link != ''
+            )
+            if not full:
+                query = query.filter(or_(Model.next_expiry_check_at.is_(None), Model.next_expiry_check_at <= now))
+            due.extend((event_type, row[0], row[1], row[2], row[3], row[4]) for row in query.all())
+
+        # Never-checked items first, then the longest overdue
+        due.sort(key=lambda item: (item[4] is not None, item[4] or now))
+        if not full and len(due) > self.max_checks:
+            self.stats['due_remaining'] = len(due) - self.max_checks
+            due = due[:self.max_checks]
+        return [item[:4] + item[5:] for item in due]
+
+    def _write_chunk(self, results):
+        """Store one chunk of link check results in a single transaction"""
+        now = datetime.utcnow()
+        for (event_type, item_id, _, deadline, _), outcome in results:
+            Model = Hackathon if event_type == 'hackathon' else Internship
+            if outcome == NOT_CHECKED:
+                # Nothing was learned: stay due, without recording a check
+                values = {'next_expiry_check_at': now + UNFETCHED_RETRY_INTERVAL}
+                self.stats['not_checked'] += 1
+            elif outcome == DEAD_ONCE:
+                values = {'expiry_checked_at': now, 'link_dead_at': now,
+                          'next_expiry_check_at': now + DEAD_RECHECK_INTERVAL}
+                self.stats['dead_unconfirmed'] += 1
+            else:
+                values = {'expiry_checked_at': now, 'link_dead_at': None,
+                          'next_expiry_check_at': next_check_at(deadline, now)}
+            if outcome == EXPIRED:
+                values['status'] = self.expired_status
+                self.expired_ids[event_type].append(item_id)
+                self.stats['link_expired'] += 1
+            else:
+                # A schedule change is not an edit: keep updated_at (the match index watches it)
+                values['updated_at'] = Model.updated_at
+            db.session.execute(
+                update(Model).where(Model.id == item_id, Model.status == 'approved').values(**values)
+                .execution_options(synchronize_session=False)
+            )
+        db.session.commit()
+        self.stats['links_checked'] += len(results)
+
+
+def sweep_expired(app, expired_status='expired', full=False):
+    """Run one sweep with the configured limits (needs an app context)"""
+    sweeper = ExpirySweeper(
+        app,
+        expired_status=expired_status,
+        max_checks=Config.EXPIRY_SWEEP_MAX_CHECKS,
+        chunk_size=Config.EXPIRY_SWEEP_CHUNK,
+        max_workers=Config.EXPIRY_SWEEP_WORKERS,
+        per_host_limit=Config.EXPIRY_SWEEP_PER_HOST
+    )
+    return sweeper.run(full=full)
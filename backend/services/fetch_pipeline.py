@@ -0,0 +1,85 @@
+"""
+Bounded-concurrency fetch pipeline for the AI scanner.
+Fans network-bound work (page fetches, link checks, Gemini calls) out to a
+thread pool while capping how many tasks hit the same domain at once.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+
+def domain_of(url):
+    """Return the bare host of a URL (lowercase, without www.)"""
+    try:
+        host = urlparse(url or '').netloc.lower()
+    except Exception:
+        return ''
+    return host[4:] if host.startswith('www.') else host
+
+
+class FetchPipeline:
+    """Thread pool with a per-domain concurrency limit.
+
+    Tasks run inside the given Flask app context so they can read config and
+    call services, but they should not write to the database - results are
+    yielded back to the calling thread, which stays the single DB writer.
+    """
+
+    def __init__(self, app=None, max_workers=8, per_domain_limit=2):
+        self.app = app
+        self.max_workers = max(1, int(max_workers))
+        self.per_domain_limit = max(1, int(per_domain_limit))
+        self._domain_semaphores = {}
+        self._lock = threading.Lock()
+
+    def _semaphore_for(self, url):
+        domain = domain_of(url)
+        with self._lock:
+            semaphore = self._domain_semaphores.get(domain)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_domain_limit)
+                self._domain_semaphores[domain] = semaphore
+            return semaphore
+
+    def _run(self, func, item, url):
+        with self._semaphore_for(url):
+            if self.app is not None:
+                with self.app.app_context():
+                    return func(item)
+            return func(item)
+
+    def map_unordered(self, func, items, url_getter=None):
+        """Run func over items concurrently and yield (item, result) as each one finishes.
+
+        url_getter(item) picks the URL whose domain limit applies to the task.
+        A task that raises yields None as its result so one bad page can't
+        abort the whole batch.
+        """
+        items = list(items)
+        if not items:
+            return
+
+        url_getter = url_getter or (lambda item: item)
+        workers = min(self.max_workers, len(items))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scan-fetch') as executor:
+            futures = {
+                executor.submit(self._run, func, item, url_getter(item)): item
+                for item in items
+            }
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"⚠️ [Pipeline] Task failed for {url_getter(item)}: {e}", flush=True)
+                    result = None
+                yield item, result
+
+
+def get_fetch_pipeline(app):
+    """Build a pipeline sized from the app config"""
+    return FetchPipeline(
+        app,
+        max_workers=app.config.get('SCAN_MAX_WORKERS', 8),
+        per_domain_limit=app.config.get('SCAN_PER_DOMAIN_LIMIT', 2)
+    )
@@ -0,0 +1,260 @@
+"""
+Per-host politeness for scraping and link checks
+Requests sent with http_client's polite=True (scanner page fetches, link
+checks, the Unstop/Devpost/LinkedIn scrapers) all go through one limiter, so
+concurrent scans and sweeps can't hammer the same site:
+- token bucket per host: HOST_RATE_PER_SECOND requests per second, with
+  bursts of up to HOST_BURST;
+- robots.txt: a Crawl-delay for our user agent (or *) lowers the host's rate;
+  the file is fetched once per ROBOTS_TTL_SECONDS, lazily, on first use, with
+  the same User-Agent its rules are then read for;
+- backoff: a 429 or 503 blocks the host for its Retry-After, or for an
+  exponentially growing delay, until a request succeeds again;
+- queueing: callers reserve the next free slot and sleep until it comes, in
+  the order they arrived; a caller that would wait longer than
+  HOST_MAX_WAIT_SECONDS gets HostThrottled instead of blocking its thread.
+Only the Crawl-delay line of robots.txt is used here; the scanner does not
+consult Disallow rules.
+"""
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from config import Config
+from services import http_client
+from services.fetch_pipeline import domain_of
+
+BACKOFF_STATUSES = (429, 503)
+
+
+class HostThrottled(Exception):
+    """The host is rate limited or backing off for longer than the caller may wait"""
+
+
+def retry_after_seconds(value):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_crawl_delay(robots_text, user_agent):
+    """Crawl-delay in seconds for user_agent, else for *, else None.
+
+    urllib.robotparser ignores fractional delays such as 0.5, so the groups
+    are read here; only the Crawl-delay lines matter.
+    """
+    user_agent = user_agent.lower()
+    specific = default = None
+    agents = []
+    in_rules = False
+    for raw_line in robots_text.splitlines():
+        line = raw_line.split('#', 1)[0].strip()
+        if ':' not in line:
+            continue
+        field, value = (part.strip() for part in line.split(':', 1))
+        field = field.lower()
+        if field == 'user-agent':
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+            continue
+        in_rules = True
+        if field != 'crawl-delay':
+            continue
+        try:
+            delay = float(value)
+        except ValueError:
+            continue
+        if any(agent != '*' and agent in user_agent for agent in agents):
+            specific = delay
+        elif '*' in agents and default is None:
+            default = delay
+    return specific if specific is not None else default
+
+
+class HostState:
+    """Token bucket and backoff of one host"""
+
+    def __init__(self, rate, burst):
+        self.lock = threading.Lock()
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.failures = 0
+        self.resets = 0  # backoffs that emptied the bucket, voiding the slots reserved before them
+        self.crawl_delay = None
+        self.robots_checked_at = None
+        self.robots_lock = threading.Lock()
+        self.stats = {'requests': 0, 'waited': 0, 'wait_seconds': 0.0, 'throttled': 0, 'backoffs': 0}
+
+    def reserve(self, now):
+        """Take the next slot; returns how long to sleep before using it"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+        return max(wait, self.blocked_until - now)
+
+    def release(self):
+        """Give back a slot that won't be used"""
+        self.tokens = min(self.burst, self.tokens + 1)
+
+
+class HostLimiter:
+    def __init__(self, rate=1.0, burst=3, max_wait=60, backoff_base=5, backoff_max=300, robots_ttl=86400,
+                 max_crawl_delay=30, user_agent=None):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.robots_ttl = robots_ttl
+        self.max_crawl_delay = max_crawl_delay
+        # Pages are requested as a browser, so robots.txt is fetched and read for that agent too
+        self.user_agent = user_agent or http_client.BROWSER_USER_AGENT
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = HostState(self.rate, self.burst)
+                self._hosts[host] = state
+            return state
+
+    def _load_robots(self, url, state):
+        """Apply the host's robots.txt Crawl-delay (once per robots_ttl; one thread fetches, the rest wait)"""
+        if state.robots_checked_at is not None and time.monotonic() - state.robots_checked_at < self.robots_ttl:
+            return
+        with state.robots_lock:
+            if state.robots_checked_at is not None and time.monotonic() - state.robots_checked_at < self.robots_ttl:
+                return
+            parts = urlsplit(url)
+            delay = None
+            try:
+                response = http_client.get(f"{parts.scheme}://{parts.netloc}/robots.txt",
+                                           headers={'User-Agent': self.user_agent}, timeout=5)
+                if response.status_code == 200:
+                    delay = parse_crawl_delay(response.text, self.user_agent)
+            except Exception as e:
+                print(f"⚠️ [Limiter] Could not read robots.txt of {parts.netloc}: {e}", flush=True)
+            with state.lock:
+                state.robots_checked_at = time.monotonic()
+                state.crawl_delay = float(delay) if delay else None
+                state.rate = self.rate
+                if state.crawl_delay:
+                    state.rate = min(self.rate, 1.0 / min(state.crawl_delay, self.max_crawl_delay))
+                    state.burst = 1
+                    state.tokens = min(state.tokens, 1.0)
+                else:
+                    state.burst = self.burst
+
+    def acquire(self, url):
+        """Wait for this host's next slot; raises HostThrottled rather than waiting over max_wait"""
+        host = domain_of(url)
+        if not host:
+            return
+        state = self._state(host)
+        self._load_robots(url, state)
+        deadline = time.monotonic() + self.max_wait
+        waited = 0.0
+        while True:
+            with state.lock:
+                now = time.monotonic()
+                wait = state.reserve(now)
+                resets = state.resets
+                if now + wait > deadline:
+                    state.release()
+                    state.stats['throttled'] += 1
+                    raise HostThrottled(f"{host} is rate limited for another {wait:.0f}s")
+            if wait > 0:
+                time.sleep(wait)
+                waited += wait
+            with state.lock:
+                if state.blocked_until <= time.monotonic():
+                    state.stats['requests'] += 1
+                    if waited:
+                        state.stats['waited'] += 1
+                        state.stats['wait_seconds'] += waited
+                    return
+                # A 429/503 seen while we slept moves everyone behind the backoff. Queue again, handing
+                # our slot back unless the backoff's bucket reset already dropped it.
+                if state.resets == resets:
+                    state.release()
+
+    def report(self, url, status, retry_after=None):
+        """Feed a response back: 429/503 start or extend the host's backoff, success ends it"""
+        host = domain_of(url)
+        if not host:
+            return
+        state = self._state(host)
+        with state.lock:
+            if status in BACKOFF_STATUSES:
+                state.failures += 1
+                delay = retry_after_seconds(retry_after)
+                if delay is None:
+                    delay = self.backoff_base * 2 ** (state.failures - 1)
+                delay = min(delay, self.backoff_max)
+                state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+                # Empty the bucket up to the end of the backoff so queued callers resume one slot apart
+                # (this drops every reservation made so far; see acquire)
+                state.tokens = 1.0
+                state.updated = state.blocked_until
+                state.resets += 1
+                state.stats['backoffs'] += 1
+                print(f"⏳ [Limiter] {host} answered {status}; backing off {delay:.0f}s", flush=True)
+            elif 0 < status < 400:
+                state.failures = 0
+
+    def get_stats(self):
+        now = time.monotonic()
+        with self._lock:
+            hosts = list(self._hosts.items())
+        result = []
+        for host, state in hosts:
+            with state.lock:
+                result.append(dict(
+                    state.stats,
+                    host=host,
+                    wait_seconds=round(state.stats['wait_seconds'], 2),
+                    rate_per_second=round(state.rate, 3),
+                    crawl_delay=state.crawl_delay,
+                    backing_off_seconds=round(max(0.0, state.blocked_until - now), 1)
+                ))
+        return {
+            'rate_per_second': self.rate,
+            'burst': self.burst,
+            'hosts': sorted(result, key=lambda h: h['requests'], reverse=True)
+        }
+
+
+_host_limiter = None
+_host_limiter_lock = threading.Lock()
+
+
+def get_host_limiter():
+    """Return the process-wide host limiter"""
+    global _host_limiter
+    if _host_limiter is None:
+        with _host_limiter_lock:
+            if _host_limiter is None:
+                _host_limiter = HostLimiter(
+                    rate=Config.HOST_RATE_PER_SECOND,
+                    burst=Config.HOST_BURST,
+                    max_wait=Config.HOST_MAX_WAIT_SECONDS,
+                    backoff_base=Config.HOST_BACKOFF_BASE_SECONDS,
+                    backoff_max=Config.HOST_BACKOFF_MAX_SECONDS,
+                    robots_ttl=Config.ROBOTS_TTL_SECONDS,
+                    max_crawl_delay=Config.ROBOTS_MAX_CRAWL_DELAY
+                )
+    return _host_limiter
@@ -0,0 +1,111 @@
+"""
+Streaming text extraction from HTML
+Pages are only ever used for their first few thousand characters of text,
+so instead of building a full BeautifulSoup tree, the body is fed in chunks
+to an incremental HTMLParser that:
+- drops script/style/nav/footer/header (and noscript/template) subtrees as
+  it goes, without keeping any of their text;
+- emits the same shape of text as before: one stripped phrase per line, with
+  runs of two spaces treated as phrase breaks and blank lines dropped;
+- stops as soon as max_chars of text are collected, so the rest of the body
+  is neither downloaded nor parsed.
+Downloads are additionally capped at max_bytes.
+"""
+import codecs
+from html.parser import HTMLParser
+
+NOISE_TAGS = frozenset(['script', 'style', 'nav', 'footer', 'header', 'noscript', 'template'])
+CHUNK_BYTES = 16 * 1024
+LINE_BREAKS = '\r\n\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+
+
+class TextExtractor(HTMLParser):
+    """Collects cleaned text from fed HTML until max_chars is reached (then .done is True)"""
+
+    def __init__(self, max_chars=None):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.phrases = []
+        self.chars = 0
+        self.done = False
+        self._noise_depth = 0
+        self._partial_line = ''
+
+    def handle_starttag(self, tag, attrs):
+        if tag in NOISE_TAGS:
+            self._noise_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in NOISE_TAGS and self._noise_depth:
+            self._noise_depth -= 1
+
+    def handle_data(self, data):
+        if self._noise_depth or self.done:
+            return
+        lines = (self._partial_line + data).splitlines(True)
+        # The last line may continue in the next text node
+        self._partial_line = lines.pop() if lines and lines[-1][-1] not in LINE_BREAKS else ''
+        for line in lines:
+            self._add_line(line)
+            if self.done:
+                return
+
+    def _add_line(self, line):
+        for phrase in line.strip().split('  '):
+            phrase = phrase.strip()
+            if phrase:
+                self.phrases.append(phrase)
+                self.chars += len(phrase) + 1
+                # Joined text is chars - 1 long; it must reach max_chars before the cut
+                if self.max_chars and self.chars > self.max_chars:
+                    self.done = True
+                    return
+
+    def text(self):
+        """The text collected so far, including a trailing unfinished line"""
+        if self._partial_line and not self.done:
+            self._add_line(self._partial_line)
+            self._partial_line = ''
+        text = '\n'.join(self.phrases)
+        return text[:self.max_chars] if self.max_chars else text
+
+
+def html_to_text(html, max_chars=None):
+    """Cleaned text of an HTML string"""
+    extractor = TextExtractor(max_chars)
+    # Feed in slices so a budget filled early skips parsing the rest
+    for start in range(0, len(html), CHUNK_BYTES):
+        extractor.feed(html[start:start + CHUNK_BYTES])
+        if extractor.done:
+            break
+    else:
+        extractor.close()
+    return extractor.text()
+
+
+def response_text(response, max_chars=None, max_bytes=None):
+    """(text, bytes_read, truncated) from a requests response opened with stream=True.
+
+    Reading stops once max_chars of text are collected or max_bytes of body
+    have arrived, whichever comes first.
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    extractor = TextExtractor(max_chars)
+    size = 0
+    truncated = False
+    for chunk in response.iter_content(CHUNK_BYTES):
+        size += len(chunk)
+        extractor.feed(decoder.decode(chunk))
+        if extractor.done:
+            truncated = True
+            break
+        if max_bytes and size >= max_bytes:
+            truncated = True
+            break
+    else:
+        extractor.feed(decoder.decode(b'', final=True))
+        extractor.close()
+    return extractor.text(), size, truncated
@@ -0,0 +1,174 @@
+"""
+Shared HTTP client for all outbound requests
+One pooled requests.Session keeps connections alive per host, so repeated
+calls to the same site (scanner pages, Gemini, Brevo/Mailgun) skip the
+TCP+TLS handshake. Requests to third-party sites pass polite=True to share
+the per-host rate limits. The session never stores cookies: it is shared by
+every thread and caller, so a cookie one site sets must not ride along on
+another caller's requests.
+"""
+import threading
+from http.cookiejar import DefaultCookiePolicy
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from config import Config
+
+BROWSER_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+_session = None
+_session_lock = threading.Lock()
+
+# Counters of host pools that were already evicted from the pool manager
+_retired_stats = {'connections': 0, 'requests': 0}
+# Sockets opened per (scheme, host, port). urllib3's own num_connections counts connection
+# objects, and a closed one reconnects without being counted again.
+_connects = {}
+_stats_lock = threading.Lock()
+
+
+def _count_connect(scheme, host, port):
+    with _stats_lock:
+        key = (scheme, host, port)
+        _connects[key] = _connects.get(key, 0) + 1
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        super().connect()
+        _count_connect('http', self.host, self.port)
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        super().connect()
+        _count_connect('https', self.host, self.port)
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+def _pool_connects(pool):
+    with _stats_lock:
+        return _connects.get((pool.scheme, pool.host, pool.port), 0)
+
+
+def _retire_pool(pool):
+    """Keep the counters of an evicted host pool before closing it"""
+    with _stats_lock:
+        _retired_stats['connections'] += _connects.pop((pool.scheme, pool.host, pool.port), 0)
+        _retired_stats['requests'] += getattr(pool, 'num_requests', 0)
+    pool.close()
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter that counts opened sockets and preserves the counters when host pools are evicted"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool
+        }
+        self.poolmanager.pools.dispose_func = _retire_pool
+
+
+def get_session():
+    """Return the process-wide pooled session (created on first use)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                adapter = PooledAdapter(
+                    pool_connections=Config.HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=Config.HTTP_POOL_MAXSIZE
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def request(method, url, polite=False, **kwargs):
+    """Send a request through the shared session with the default timeout.
+
+    polite=True (scraping and link checks) waits for the host's rate limit
+    first and reports 429/503 answers back to it; see services.host_limiter.
+    """
+    kwargs.setdefault('timeout', (Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT))
+    if not polite:
+        return get_session().request(method, url, **kwargs)
+
+    from services.host_limiter import get_host_limiter
+    limiter = get_host_limiter()
+    limiter.acquire(url)
+    response = get_session().request(method, url, **kwargs)
+    limiter.report(url, response.status_code, response.headers.get('Retry-After'))
+    return response
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def head(url, **kwargs):
+    return request('HEAD', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+def get_stats():
+    """Connection reuse counters for diagnostics.
+
+    A request that did not open a new socket reused a kept-alive one, so
+    reused = requests - new connections.
+    """
+    hosts = []
+    total_connections = 0
+    total_requests = 0
+
+    session = _session
+    if session is not None:
+        seen = set()
+        for adapter in session.adapters.values():
+            if id(adapter) in seen or not isinstance(adapter, HTTPAdapter):
+                continue
+            seen.add(id(adapter))
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                connections = _pool_connects(pool)
+                requests_sent = getattr(pool, 'num_requests', 0)
+                total_connections += connections
+                total_requests += requests_sent
+                hosts.append({
+                    'host': f"{pool.scheme}://{pool.host}:{pool.port}",
+                    'new_connections': connections,
+                    'requests': requests_sent,
+                    'reused_connections': max(requests_sent - connections, 0)
+                })
+
+    with _stats_lock:
+        total_connections += _retired_stats['connections']
+        total_requests += _retired_stats['requests']
+
+    return {
+        'pool_connections': Config.HTTP_POOL_CONNECTIONS,
+        'pool_maxsize': Config.HTTP_POOL_MAXSIZE,
+        'requests': total_requests,
+        'new_connections': total_connections,
+        'reused_connections': max(total_requests - total_connections, 0),
+        'hosts': sorted(hosts, key=lambda h: h['requests'], reverse=True)
+    }
@@ -0,0 +1,262 @@
+"""
+Durable background job queue (background_jobs table)
+The web tier only enqueues: enqueue() inserts a row and returns immediately.
+Jobs are run by `python worker.py` (or, in local development, a worker thread
+inside the web process). No external broker is involved:
+- single runner: while a job is queued or running its singleton_key holds its
+  kind, and the unique constraint rejects a second active job of that kind;
+- leases: a worker claims a job with a conditional UPDATE (only one claim can
+  match) and owns it until lease_expires_at;
+- heartbeats: the worker extends the lease while the handler runs, so a
+  worker that crashed or was killed is noticed within JOB_LEASE_SECONDS and
+  its job is claimed again by the next worker;
+- retries: a failed or abandoned job is re-queued with exponential backoff
+  until it has used max_attempts.
+Handlers are registered by kind with @job_handler and receive the decoded
+payload inside an app context; what they return is stored as the result.
+"""
+import json
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import update, or_, and_
+from sqlalchemy.exc import IntegrityError
+from config import Config
+from models import db, BackgroundJob
+
+_handlers = {}
+
+
+def job_handler(kind):
+    """Register the function that runs jobs of this kind"""
+    def register(func):
+        _handlers[kind] = func
+        return func
+    return register
+
+
+def enqueue(kind, payload=None, requested_by=None, max_attempts=None):
+    """Queue a job unless one of the same kind is already queued or running.
+
+    Returns (job, created); when created is False the job returned is the
+    active one.
+    """
+    job = BackgroundJob(
+        kind=kind,
+        payload=json.dumps(payload) if payload is not None else None,
+        status='queued',
+        singleton_key=kind,
+        max_attempts=max_attempts or Config.JOB_MAX_ATTEMPTS,
+        requested_by=requested_by,
+        run_after=datetime.utcnow()
+    )
+    db.session.add(job)
+    try:
+        db.session.commit()
+        print(f"📥 [Jobs] Queued {kind} job {job.id}", flush=True)
+        return job, True
+    except IntegrityError:
+        db.session.rollback()
+        active = active_job(kind)
+        if active is None:
+            # The active job finished between our insert and this read; try once more
+            return enqueue(kind, payload, requested_by, max_attempts)
+        return active, False
+
+
+def active_job(kind):
+    """The queued or running job of this kind, if any"""
+    return BackgroundJob.query.filter_by(singleton_key=kind).first()
+
+
+def recent_jobs(limit=20, kind=None):
+    query = BackgroundJob.query
+    if kind:
+        query = query.filter_by(kind=kind)
+    return query.order_by(BackgroundJob.created_at.desc()).limit(limit).all()
+
+
+def _claimable(now):
+    return or_(
+        and_(BackgroundJob.status == 'queued', BackgroundJob.run_after <= now),
+        and_(BackgroundJob.status == 'running', BackgroundJob.lease_expires_at < now)
+    )
+
+
+class JobWorker:
+    """Claims queued jobs one at a time and runs their handlers"""
+
+    def __init__(self, app, worker_id=None, kinds=None, poll_seconds=5, lease_seconds=120, heartbeat_seconds=30,
+                 retry_base_seconds=60):
+        self.app = app
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.kinds = kinds
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self.stop_event = threading.Event()
+
+    def run_forever(self):
+        print(f"👷 [Jobs] Worker {self.worker_id} started (kinds: {self.kinds or sorted(_handlers)})", flush=True)
+        while not self.stop_event.is_set():
+            try:
+                worked = self.run_once()
+            except Exception as e:
+                # Typically the database being unreachable; keep polling
+                print(f"❌ [Jobs] Worker loop error: {e}", flush=True)
+                worked = False
+            if not worked:
+                self.stop_event.wait(self.poll_seconds)
+        print(f"⏹️  [Jobs] Worker {self.worker_id} stopped", flush=True)
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run_once(self):
+        """Claim and run one job. Returns False when nothing was claimable."""
+        with self.app.app_context():
+            try:
+                job = self._claim()
+                if job is None:
+                    return False
+                self._run(job)
+                return True
+            finally:
+                db.session.remove()
+
+    def _claim(self):
+        now = datetime.utcnow()
+        kinds = self.kinds or list(_handlers)
+        candidates = BackgroundJob.query.filter(_claimable(now), BackgroundJob.kind.in_(kinds))\
+            .order_by(BackgroundJob.run_after.asc()).with_entities(BackgroundJob.id).limit(10).all()
+        for (job_id,) in candidates:
+            claimed = db.session.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == job_id, _claimable(now))
+                .values(
+                    status='running',
+                    attempts=BackgroundJob.attempts + 1,
+                    lease_owner=self.worker_id,
+                    lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                    heartbeat_at=now,
+                    started_at=now
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.session.commit()
+            if not claimed:
+                continue  # another worker got it first
+            job = BackgroundJob.query.get(job_id)
+            if job.attempts > job.max_attempts:
+                # Its previous runs all died without reporting back
+                self._finish(job, 'failed', error=job.error or 'Worker lease expired (worker crashed or was killed)')
+                continue
+            return job
+        return None
+
+    def _run(self, job):
+        handler = _handlers.get(job.kind)
+        print(f"▶️  [Jobs] Running {job.kind} job {job.id} (attempt {job.attempts}/{job.max_attempts})", flush=True)
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop, args=(job.id, stop_heartbeat), name=f'job-heartbeat-{job.id}', daemon=True
+        )
+        heartbeat.start()
+        started = time.monotonic()
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind '{job.kind}'")
+            result = handler(json.loads(job.payload) if job.payload else {})
+        except Exception as e:
+            traceback.print_exc()
+            db.session.rollback()
+            stop_heartbeat.set()
+            job = BackgroundJob.query.get(job.id)
+            self._retry_or_fail(job, f"{type(e).__name__}: {e}")
+            return
+        finally:
+            stop_heartbeat.set()
+
+        db.session.rollback()  # discard anything the handler left uncommitted
+        job = BackgroundJob.query.get(job.id)
+        self._finish(job, 'done', result=result)
+        print(f"✅ [Jobs] {job.kind} job {job.id} done in {time.monotonic() - started:.1f}s", flush=True)
+
+    def _heartbeat_loop(self, job_id, stop):
+        with self.app.app_context():
+            try:
+                while not stop.wait(self.heartbeat_seconds):
+                    now = datetime.utcnow()
+                    renewed = db.session.execute(
+                        update(BackgroundJob)
+                        .where(BackgroundJob.id == job_id, BackgroundJob.lease_owner == self.worker_id,
+                               BackgroundJob.status == 'running')
+                        .values(heartbeat_at=now, lease_expires_at=now + timedelta(seconds=self.lease_seconds))
+                        .execution_options(synchronize_session=False)
+                    ).rowcount
+                    db.session.commit()
+                    if not renewed:
+                        print(f"⚠️ [Jobs] Lost the lease on job {job_id}; another worker may be running it", flush=True)
+                        return
+            except Exception as e:
+                print(f"⚠️ [Jobs] Heartbeat for job {job_id} failed: {e}", flush=True)
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+    def _retry_or_fail(self, job, error):
+        if job.attempts < job.max_attempts:
+            delay = self.retry_base_seconds * 2 ** (job.attempts - 1)
+            print(f"🔁 [Jobs] {job.kind} job {job.id} failed ({error}); retrying in {delay}s", flush=True)
+            self._release(job, status='queued', error=error, run_after=datetime.utcnow() + timedelta(seconds=delay))
+        else:
+            print(f"❌ [Jobs] {job.kind} job {job.id} failed for good: {error}", flush=True)
+            self._finish(job, 'failed', error=error)
+
+    def _finish(self, job, status, result=None, error=None):
+        self._release(
+            job, status=status, error=error, singleton_key=None, finished_at=datetime.utcnow(),
+            result=json.dumps(result, default=str) if result is not None else None
+        )
+
+    def _release(self, job, **values):
+        """Apply the outcome, unless the lease was lost to another worker meanwhile"""
+        updated = db.session.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job.id, BackgroundJob.lease_owner == self.worker_id)
+            .values(lease_owner=None, lease_expires_at=None, **values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if not updated:
+            print(f"⚠️ [Jobs] Job {job.id} was reclaimed by another worker; outcome discarded", flush=True)
+
+
+_embedded_worker = None
+_embedded_lock = threading.Lock()
+
+
+def start_embedded_worker(app):
+    """Consume the queue from a daemon thread of this process (JOB_WORKER_EMBEDDED); started once"""
+    global _embedded_worker
+    with _embedded_lock:
+        if _embedded_worker is None:
+            _embedded_worker = build_worker(app)
+            threading.Thread(target=_embedded_worker.run_forever, name='job-worker', daemon=True).start()
+    return _embedded_worker
+
+
+def build_worker(app, kinds=None):
+    return JobWorker(
+        app,
+        kinds=kinds,
+        poll_seconds=Config.JOB_POLL_SECONDS,
+        lease_seconds=Config.JOB_LEASE_SECONDS,
+        heartbeat_seconds=Config.JOB_HEARTBEAT_SECONDS,
+        retry_base_seconds=Config.JOB_RETRY_BASE_SECONDS
+    )
@@ -0,0 +1,120 @@
+"""
+Leader election through a lease row in app_settings
+Every process that wants to run scheduled jobs competes for one key: the
+holder's id is the row's value and updated_at is its last renewal. Taking or
+renewing the lease is a single conditional UPDATE ("the value is mine, or the
+last renewal is older than the lease"), so at most one process wins it on any
+database, without advisory-lock support. If the holder dies it stops renewing,
+and another process takes over once the lease has run out.
+"""
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import update, or_
+from sqlalchemy.exc import IntegrityError
+from models import db, AppSetting
+
+
+class LeaderLease:
+    """A named lease kept by a background thread; on_elected/on_deposed fire on changes"""
+
+    def __init__(self, app, name, lease_seconds=90, on_elected=None, on_deposed=None):
+        self.app = app
+        self.key = f'leader:{name}'
+        self.lease_seconds = lease_seconds
+        self.renew_seconds = max(1.0, lease_seconds / 3.0)
+        self.owner_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.on_elected = on_elected
+        self.on_deposed = on_deposed
+        self.is_leader = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def try_acquire(self):
+        """Take or renew the lease. Returns True while this process holds it."""
+        now = datetime.utcnow()
+        claimed = db.session.execute(
+            update(AppSetting)
+            .where(
+                AppSetting.key == self.key,
+                or_(AppSetting.value == self.owner_id,
+                    AppSetting.updated_at < now - timedelta(seconds=self.lease_seconds))
+            )
+            .values(value=self.owner_id, updated_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return True
+        if AppSetting.query.get(self.key) is not None:
+            return False
+        # First process ever: create the row
+        try:
+            db.session.add(AppSetting(key=self.key, value=self.owner_id, updated_at=now))
+            db.session.commit()
+            return True
+        except IntegrityError:
+            db.session.rollback()
+            return False
+
+    def release(self):
+        """Give the lease up so another process can take over without waiting for it to expire"""
+        db.session.execute(
+            update(AppSetting)
+            .where(AppSetting.key == self.key, AppSetting.value == self.owner_id)
+            .values(value='', updated_at=datetime(1970, 1, 1))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+    def current_holder(self):
+        row = AppSetting.query.get(self.key)
+        if row is None or not row.value or row.updated_at < datetime.utcnow() - timedelta(seconds=self.lease_seconds):
+            return None
+        return {'owner': row.value, 'renewed_at': row.updated_at.isoformat()}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f'lease-{self.key}', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self.app.app_context():
+                try:
+                    leader = self.try_acquire()
+                except Exception as e:
+                    # Can't reach the database: we can't prove we still hold the lease
+                    print(f"⚠️ [Leader] Could not renew {self.key}: {e}", flush=True)
+                    db.session.rollback()
+                    leader = False
+                finally:
+                    db.session.remove()
+            self._transition(leader)
+            self._stop.wait(self.renew_seconds)
+
+    def _transition(self, leader):
+        if leader and not self.is_leader:
+            self.is_leader = True
+            print(f"👑 [Leader] {self.owner_id} now holds {self.key}", flush=True)
+            if self.on_elected:
+                self.on_elected()
+        elif not leader and self.is_leader:
+            self.is_leader = False
+            print(f"⚠️ [Leader] {self.owner_id} lost {self.key}", flush=True)
+            if self.on_deposed:
+                self.on_deposed()
+
+    def stop(self):
+        """Stop renewing and release the lease if held"""
+        self._stop.set()
+        if self.is_leader:
+            self._transition(False)
+            try:
+                with self.app.app_context():
+                    self.release()
+                    db.session.remove()
+            except Exception as e:
+                print(f"⚠️ [Leader] Could not release {self.key}: {e}", flush=True)
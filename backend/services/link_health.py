@@ -0,0 +1,227 @@
+"""
+Link health verdicts shared by the scanner and the expiry sweeper
+Whether a registration link is alive is asked over and over: for every
+discovery result and bulk-extracted link on each scan, and again by the
+scheduled cleanup and the admin purge. Verdicts are kept per canonical URL
+(see dedup_index.canonical_url) for a time that depends on the outcome:
+- alive: the link answered below 400;
+- dead: 404 or 410, the only answers taken as proof the page is gone;
+- error: anything else (network errors, 403/429 bot walls, 5xx), which is
+  not trusted for long and is retried soon;
+- throttled: the host limiter refused to send the request (HostThrottled).
+  Nothing was learned about the link, so the verdict is never cached and
+  callers should come back to the link later instead of judging it.
+A check is a HEAD; when the server refuses or fails HEAD it falls back to a
+GET for a single byte (Range: bytes=0-0), unless the HEAD was throttled. Every response is closed so the
+pooled connection goes back to the shared client. A page the page cache
+fetched recently answers the question without any request.
+"""
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+from services import http_client
+from services.dedup_index import canonical_url
+from services.fetch_pipeline import FetchPipeline
+from services.host_limiter import HostThrottled
+from services.page_cache import get_page_cache
+from services.scan_metrics import record_fetch
+
+ALIVE = 'alive'
+DEAD = 'dead'
+ERROR = 'error'
+THROTTLED = 'throttled'
+
+DEAD_STATUSES = (404, 410)
+# HEAD answers that say nothing about the page itself; confirm them with a ranged GET
+RETRY_WITH_GET = (403, 404, 405, 501)
+
+
+def outcome_for(status):
+    if 0 < status < 400:
+        return ALIVE
+    if status in DEAD_STATUSES:
+        return DEAD
+    return ERROR
+
+
+class LinkVerdict:
+    """Outcome of one link check"""
+
+    def __init__(self, url, status, method, error=None, outcome=None):
+        self.url = url
+        self.status = status  # 0 when the request itself failed
+        self.outcome = outcome or outcome_for(status)
+        self.method = method  # 'head', 'range' or 'page' (answered by the page cache)
+        self.error = error
+        self.checked_at = time.monotonic()
+
+    @property
+    def alive(self):
+        return self.outcome == ALIVE
+
+    @property
+    def dead(self):
+        return self.outcome == DEAD
+
+    @property
+    def throttled(self):
+        return self.outcome == THROTTLED
+
+    def to_dict(self):
+        return {'url': self.url, 'status': self.status, 'outcome': self.outcome, 'method': self.method,
+                'error': self.error, 'age_seconds': round(time.monotonic() - self.checked_at, 1)}
+
+
+class LinkHealth:
+    """Thread-safe LRU of LinkVerdicts with per-outcome TTLs"""
+
+    def __init__(self, max_entries=5000, alive_ttl=21600, dead_ttl=86400, error_ttl=900, timeout=5,
+                 max_workers=8, per_host_limit=2):
+        self.max_entries = max_entries
+        self.ttls = {ALIVE: alive_ttl, DEAD: dead_ttl, ERROR: error_ttl}
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self._verdicts = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'checks': 0, 'from_page_cache': 0, ALIVE: 0, DEAD: 0, ERROR: 0, THROTTLED: 0}
+
+    @staticmethod
+    def _key(url):
+        return canonical_url(url) or url
+
+    def _count(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._stats[key] += 1
+
+    def peek(self, url):
+        """The cached verdict for url if it is still fresh, else None"""
+        key = self._key(url)
+        with self._lock:
+            verdict = self._verdicts.get(key)
+            if verdict is not None:
+                self._verdicts.move_to_end(key)
+        if verdict is not None and time.monotonic() - verdict.checked_at < self.ttls[verdict.outcome]:
+            return verdict
+        return None
+
+    def _store(self, verdict):
+        key = self._key(verdict.url)
+        with self._lock:
+            self._verdicts[key] = verdict
+            self._verdicts.move_to_end(key)
+            while len(self._verdicts) > self.max_entries:
+                self._verdicts.popitem(last=False)
+            self._stats[verdict.outcome] += 1
+        return verdict
+
+    def check(self, url):
+        """Verdict for one link, from the cache when fresh"""
+        if not url or not url.startswith('http'):
+            return LinkVerdict(url, 0, 'none', error='Not an http(s) link')
+
+        verdict = self.peek(url)
+        if verdict is not None:
+            self._count('hits')
+            return verdict
+
+        # A recent full fetch of the page already answers the question
+        page = get_page_cache().peek(url)
+        if page is not None and (page.ok or page.status in DEAD_STATUSES):
+            self._count('from_page_cache')
+            return self._store(LinkVerdict(url, page.status, 'page'))
+
+        self._count('checks')
+        verdict = self._probe(url)
+        if verdict.throttled:
+            self._count(THROTTLED)
+            return verdict
+        return self._store(verdict)
+
+    def check_many(self, urls):
+        """{url: verdict} for a batch; links not cached are checked concurrently, each canonical URL once"""
+        urls = [url for url in dict.fromkeys(urls) if url]
+        verdicts = {}
+        pending = {}
+        for url in urls:
+            verdict = self.peek(url)
+            if verdict is not None:
+                self._count('hits')
+                verdicts[url] = verdict
+            else:
+                pending.setdefault(self._key(url), []).append(url)
+
+        if pending:
+            pipeline = FetchPipeline(max_workers=self.max_workers, per_domain_limit=self.per_host_limit)
+            for same_links, verdict in pipeline.map_unordered(lambda links: self.check(links[0]),
+                                                             pending.values(), lambda links: links[0]):
+                for url in same_links:
+                    verdicts[url] = verdict or LinkVerdict(url, 0, 'head', error='Check failed')
+        return verdicts
+
+    def _request(self, method, url, **kwargs):
+        started = time.monotonic()
+        headers = {'User-Agent': http_client.BROWSER_USER_AGENT, **kwargs.pop('headers', {})}
+        try:
+            response = method(url, timeout=self.timeout, headers=headers, allow_redirects=True, polite=True, **kwargs)
+        except Exception:
+            record_fetch(url, 'link_check', time.monotonic() - started, 0)
+            raise
+        record_fetch(url, 'link_check', time.monotonic() - started, response.status_code)
+        return response
+
+    def _probe(self, url):
+        try:
+            response = self._request(http_client.head, url)
+            response.close()
+            if response.status_code not in RETRY_WITH_GET and response.status_code < 500:
+                return LinkVerdict(url, response.status_code, 'head')
+        except HostThrottled as e:
+            return LinkVerdict(url, 0, 'head', error=str(e)[:200], outcome=THROTTLED)
+        except Exception:
+            pass  # some servers drop HEAD requests entirely; try a GET
+
+        try:
+            with self._request(http_client.get, url, headers={'Range': 'bytes=0-0'}, stream=True) as response:
+                status = response.status_code
+                if status == 206:
+                    response.content  # one byte; reading it lets the connection be reused
+                elif status == 416:
+                    status = 200  # nothing to range over, but the page is there
+                return LinkVerdict(url, status, 'range')
+        except HostThrottled as e:
+            return LinkVerdict(url, 0, 'range', error=str(e)[:200], outcome=THROTTLED)
+        except Exception as e:
+            return LinkVerdict(url, 0, 'range', error=str(e)[:200])
+
+    def invalidate(self, url):
+        with self._lock:
+            self._verdicts.pop(self._key(url), None)
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self._stats, entries=len(self._verdicts), max_entries=self.max_entries)
+
+
+_link_health = None
+_link_health_lock = threading.Lock()
+
+
+def get_link_health():
+    """Return the process-wide verdict store"""
+    global _link_health
+    if _link_health is None:
+        with _link_health_lock:
+            if _link_health is None:
+                _link_health = LinkHealth(
+                    max_entries=Config.LINK_HEALTH_MAX_ENTRIES,
+                    alive_ttl=Config.LINK_HEALTH_ALIVE_TTL_SECONDS,
+                    dead_ttl=Config.LINK_HEALTH_DEAD_TTL_SECONDS,
+                    error_ttl=Config.LINK_HEALTH_ERROR_TTL_SECONDS,
+                    timeout=Config.LINK_HEALTH_TIMEOUT,
+                    max_workers=Config.SCAN_MAX_WORKERS,
+                    per_host_limit=Config.SCAN_PER_DOMAIN_LIMIT
+                )
+    return _link_health
@@ -0,0 +1,394 @@
+"""
+Local resume/opportunity matching engine
+Every approved hackathon and internship is turned into a hashed word and
+word-bigram TF-IDF vector (one sparse row of a SciPy matrix). Scoring a
+resume against the whole catalog is then a single sparse matrix-vector
+product, so "best matches for me" is instant and needs no Gemini call; the
+LLM only scores the few items the user actually opens or tracks.
+Changes are applied in place, reusing the current IDF weights: this
+process's own approvals and removals right away (upsert()/remove()), and
+changes committed by any other process (the job worker's auto-approve and
+expiry sweeps, other web workers) at the next catalog check, at most once per
+MATCH_INDEX_CHECK_SECONDS. A check reads the rows whose updated_at is recent
+and compares the approved ids with the indexed ones (deletions leave no row).
+Every applied change goes into a change log that the recommendation feeds
+consume, so no process has to reset its feeds when another one writes. The
+index is only rebuilt from scratch (new IDF weights, new generation) once
+enough of it has changed in place.
+"""
+import math
+import re
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from config import Config
+from models import db, Hackathon, Internship
+
+try:
+    import numpy as np
+    from scipy import sparse
+    VECTORS_AVAILABLE = True
+except Exception as e:
+    print(f"[Warning] numpy/scipy not available, local match ranking is disabled: {e}")
+    VECTORS_AVAILABLE = False
+
+# Hash buckets per vector; collisions between unrelated terms are rare at this size
+N_FEATURES = 1 << 18
+# Description characters that go into an opportunity vector
+DESCRIPTION_CHARS = 3000
+# updated_at is stamped before the writing transaction commits, so a catalog
+# check reads back this far before the previous one
+SYNC_LOOKBACK_SECONDS = 300
+# Rebuild from scratch (fresh IDF weights) once max(this many, this share of
+# the index) opportunities changed in place
+REBUILD_MIN_CHANGES = 100
+REBUILD_CHANGE_RATIO = 0.5
+# Changes kept for the recommendation feeds; a feed that falls further behind rebuilds
+CHANGE_LOG_SIZE = 10000
+
+# Keeps c++, c#, node.js and similar tech tokens intact
+_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+STOP_WORDS = frozenset("""
+a an and are as at be been but by can do for from has have in into is it its of on or our
+that the their this to was we will with you your i me my not no all any more most other
+such than then there these they those via per about over under up out also who what when
+""".split())
+
+
+def tokenize(text):
+    """Lowercased words (minus stop words) followed by adjacent-word bigrams"""
+    words = [word.rstrip('.') for word in _TOKEN_RE.findall((text or '').lower())]
+    words = [word for word in words if word and word not in STOP_WORDS]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def _bucket(term):
+    return zlib.crc32(term.encode('utf-8')) & (N_FEATURES - 1)
+
+
+def term_frequencies(text):
+    """{bucket: sublinear tf} for one document"""
+    counts = Counter(_bucket(term) for term in tokenize(text))
+    return {bucket: 1.0 + math.log(count) for bucket, count in counts.items()}
+
+
+def opportunity_text(event_type, event):
+    """Text an opportunity is vectorized from (title counted twice, it is the strongest signal)"""
+    description = (event.description or '')[:DESCRIPTION_CHARS]
+    if event_type == 'hackathon':
+        parts = [event.title, event.title, event.organizer, description]
+    else:
+        parts = [event.title, event.title, event.company, event.skills_required, description]
+    return '\n'.join(part for part in parts if part)
+
+
+def _normalize_rows(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+class MatchIndex:
+    """Immutable TF-IDF matrix over the approved catalog.
+
+    keys[i] is the (event_type, event_id) of matrix row i; deadlines[i] is
+    its deadline as a POSIX timestamp (NaN when it has none). generation
+    changes only on a full rebuild (new IDF weights), not on single-row edits.
+    """
+
+    def __init__(self, keys, matrix, idf, deadlines, generation=0):
+        self.keys = keys
+        self.matrix = matrix
+        self.idf = idf
+        self.deadlines = deadlines
+        self.generation = generation
+        self.positions = {key: i for i, key in enumerate(keys)}
+        self.event_types = np.array([key[0] for key in keys], dtype=object)
+        self.built_at = datetime.utcnow()
+
+    @classmethod
+    def build(cls, documents, generation=0):
+        """documents: iterable of ((event_type, event_id), text, deadline)"""
+        keys, deadlines = [], []
+        indptr, indices, data = [0], [], []
+        for key, text, deadline in documents:
+            frequencies = term_frequencies(text)
+            keys.append(key)
+            deadlines.append(deadline.timestamp() if deadline else np.nan)
+            indices.extend(frequencies.keys())
+            data.extend(frequencies.values())
+            indptr.append(len(indices))
+
+        matrix = sparse.csr_matrix(
+            (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+            shape=(len(keys), N_FEATURES)
+        )
+        # Smoothed IDF, as in the usual TF-IDF formulation
+        document_frequency = np.bincount(matrix.indices, minlength=N_FEATURES)
+        idf = (np.log((1.0 + len(keys)) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+        matrix.data *= idf[matrix.indices]
+        return cls(keys, _normalize_rows(matrix).tocsr(), idf, np.array(deadlines, dtype=np.float64), generation)
+
+    def edit(self, rows=None, removed=()):
+        """A copy of the index with rows ({key: (vector, deadline)}) added or replaced and removed keys dropped"""
+        rows = rows or {}
+        dropped = set(removed) | set(rows)
+        keep = np.array([key not in dropped for key in self.keys], dtype=bool)
+        matrix = self.matrix[keep] if len(self.keys) else self.matrix
+        if rows:
+            matrix = sparse.vstack([matrix] + [vector for vector, _ in rows.values()], format='csr')
+        deadlines = np.append(
+            self.deadlines[keep] if len(self.keys) else self.deadlines,
+            np.array([deadline.timestamp() if deadline else np.nan for _, deadline in rows.values()])
+        )
+        return MatchIndex(
+            [key for key in self.keys if key not in dropped] + list(rows), matrix, self.idf, deadlines,
+            self.generation
+        )
+
+    def without(self, key):
+        """A copy of the index minus one opportunity"""
+        return self.edit(removed=[key])
+
+    def with_row(self, key, vector, deadline):
+        """A copy of the index with one opportunity added or replaced (vector from vectorize())"""
+        return self.edit({key: (vector, deadline)})
+
+    def is_open(self, key, now=None):
+        """False when the opportunity is no longer indexed or its deadline has passed"""
+        position = self.positions.get(key)
+        if position is None:
+            return False
+        deadline = self.deadlines[position]
+        return bool(np.isnan(deadline) or deadline >= (now or time.time()))
+
+    def vectorize(self, text):
+        """Unit-length 1 x N_FEATURES TF-IDF row for arbitrary text (e.g. a resume)"""
+        return self.vectorize_terms(term_frequencies(text))
+
+    def vectorize_terms(self, frequencies):
+        """vectorize() for a precomputed term_frequencies() result"""
+        indices = np.fromiter(frequencies.keys(), dtype=np.int32, count=len(frequencies))
+        data = np.fromiter(frequencies.values(), dtype=np.float32, count=len(frequencies)) * self.idf[indices]
+        vector = sparse.csr_matrix((data, indices, np.array([0, len(indices)])), shape=(1, N_FEATURES))
+        return _normalize_rows(vector).tocsr()
+
+    def similarities(self, vector):
+        """Cosine similarity of vector to every row, as a dense array"""
+        if not self.keys:
+            return np.zeros(0, dtype=np.float32)
+        return np.asarray((self.matrix @ vector.T).todense()).ravel()
+
+    def rank(self, vector, limit=20, event_type=None, include_past=False):
+        """Top (key, similarity) pairs, best first, skipping past deadlines unless include_past"""
+        scores = self.similarities(vector)
+        if not len(scores):
+            return []
+        mask = scores > 0
+        if event_type:
+            mask &= self.event_types == event_type
+        if not include_past:
+            now = time.time()
+            mask &= np.isnan(self.deadlines) | (self.deadlines >= now)
+
+        candidates = np.flatnonzero(mask)
+        if len(candidates) > limit:
+            top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            candidates = candidates[top]
+        ordered = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(self.keys[i], float(scores[i])) for i in ordered]
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def local_score(similarity):
+    """Map a cosine similarity onto the 0-100 scale used for AI match scores"""
+    return int(round(max(0.0, min(1.0, similarity)) * 100))
+
+
+CATALOG = (('hackathon', Hackathon), ('internship', Internship))
+
+
+def catalog_rows(Model, *conditions):
+    """Rows of one table with the columns opportunity_text() uses, plus status, deadline and updated_at"""
+    columns = [Model.id, Model.status, Model.title, Model.description, Model.deadline, Model.updated_at]
+    if Model is Hackathon:
+        columns.append(Model.organizer)
+    else:
+        columns += [Model.company, Model.skills_required]
+    return Model.query.filter(*conditions).with_entities(*columns).all()
+
+
+def load_documents(versions=None):
+    """Vectorizer input for every approved opportunity (versions, if given, gets each row's updated_at)"""
+    for event_type, Model in CATALOG:
+        for row in catalog_rows(Model, Model.status == 'approved'):
+            if versions is not None:
+                versions[(event_type, row.id)] = row.updated_at
+            yield (event_type, row.id), opportunity_text(event_type, row), row.deadline
+
+
+class MatchEngine:
+    """Keeps the process-wide MatchIndex current"""
+
+    def __init__(self, check_interval=60):
+        self.check_interval = check_interval
+        self._index = None
+        self._checked_at = None
+        self._generation = 0
+        self._lock = threading.RLock()
+        self._synced_until = None  # start of the last catalog read
+        self._versions = {}  # key -> updated_at of the indexed row
+        self._changes = deque(maxlen=CHANGE_LOG_SIZE)  # (change number, key, vector or None for a removal)
+        self._change_seq = 0
+        self._changed_since_build = 0
+        self._stats = {'builds': 0, 'last_build_seconds': None, 'incremental_updates': 0, 'synced_changes': 0}
+
+    def get_index(self):
+        """Return an index of the current approved catalog, applying other processes' changes if due"""
+        index = self._index
+        if index is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return index
+
+        with self._lock:
+            if self._index is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return self._index
+            rebuild_at = max(REBUILD_MIN_CHANGES, REBUILD_CHANGE_RATIO * len(self._index or ()))
+            if self._index is None or self._changed_since_build >= rebuild_at:
+                self._rebuild()
+            else:
+                self._sync_catalog()
+            self._checked_at = time.monotonic()
+            return self._index
+
+    def _rebuild(self):
+        started = time.monotonic()
+        self._synced_until = datetime.utcnow()
+        versions = {}
+        self._generation += 1
+        self._index = MatchIndex.build(load_documents(versions), self._generation)
+        self._versions = versions
+        self._changes.clear()
+        self._changed_since_build = 0
+        self._stats['builds'] += 1
+        self._stats['last_build_seconds'] = round(time.monotonic() - started, 3)
+        print(f"[MatchEngine] Indexed {len(self._index)} opportunities in {self._stats['last_build_seconds']}s")
+
+    def _sync_catalog(self):
+        """Apply the changes committed since the last check, by this or any other process"""
+        started = datetime.utcnow()
+        since = self._synced_until - timedelta(seconds=SYNC_LOOKBACK_SECONDS)
+        index = self._index
+        rows, removed = {}, set()
+        for event_type, Model in CATALOG:
+            for row in catalog_rows(Model, Model.updated_at >= since):
+                key = (event_type, row.id)
+                if row.status != 'approved':
+                    if key in index.positions:
+                        removed.add(key)
+                elif self._versions.get(key) != row.updated_at:
+                    rows[key] = row
+
+            # Deleted rows, and status changes that kept updated_at, only show in the id sets
+            approved = {row_id for (row_id,) in Model.query.filter_by(status='approved').with_entities(Model.id)}
+            indexed = {key[1] for key in index.keys if key[0] == event_type}
+            removed.update((event_type, row_id) for row_id in indexed - approved)
+            missing = sorted(approved - indexed - {key[1] for key in rows if key[0] == event_type})
+            for start in range(0, len(missing), 500):
+                for row in catalog_rows(Model, Model.id.in_(missing[start:start + 500])):
+                    rows[(event_type, row.id)] = row
+
+        self._synced_until = started
+        if rows or removed:
+            self._apply(rows, removed)
+            self._stats['synced_changes'] += len(rows) + len(removed)
+
+    def _apply(self, rows, removed=()):
+        """Edit the index (rows: {key: row with the catalog_rows() columns}) and log each change"""
+        index = self._index
+        vectors = {key: index.vectorize(opportunity_text(key[0], row)) for key, row in rows.items()}
+        self._index = index.edit({key: (vectors[key], row.deadline) for key, row in rows.items()}, removed)
+        for key, row in rows.items():
+            self._versions[key] = row.updated_at
+            self._log(key, vectors[key])
+        for key in removed:
+            self._versions.pop(key, None)
+            self._log(key, None)
+        self._changed_since_build += len(rows) + len(removed)
+        return vectors
+
+    def _log(self, key, vector):
+        self._change_seq += 1
+        self._changes.append((self._change_seq, key, vector))
+
+    def changes_since(self, seq):
+        """(index, changes, latest change number) for a consumer that has applied changes up to seq.
+
+        changes is [(key, vector, or None for a removal)] in order, or None
+        when the log no longer reaches back to seq (or the index was rebuilt).
+        """
+        index = self.get_index()
+        if seq == self._change_seq:
+            return index, [], seq
+        with self._lock:
+            index = self._index
+            if seq > self._change_seq or (self._changes and self._changes[0][0] > seq + 1) or not self._changes:
+                return index, None, self._change_seq
+            return index, [(key, vector) for number, key, vector in self._changes if number > seq], self._change_seq
+
+    def upsert(self, event_type, event):
+        """Index (or re-index) one approved opportunity after its change was committed.
+
+        Returns the opportunity's vector, so callers can score it against
+        other vectors without vectorizing it again.
+        """
+        with self._lock:
+            self.get_index()
+            key = (event_type, event.id)
+            vector = self._apply({key: event})[key]
+            self._stats['incremental_updates'] += 1
+            return vector
+
+    def remove(self, key):
+        """Drop one opportunity (rejected, expired or deleted) after the change was committed"""
+        with self._lock:
+            index = self.get_index()
+            if key in index.positions:
+                self._apply({}, [key])
+            self._stats['incremental_updates'] += 1
+
+    def rank_resume(self, resume_text, limit=20, event_type=None, include_past=False):
+        """Best (key, similarity) matches for a resume across the whole approved catalog"""
+        index = self.get_index()
+        return index.rank(index.vectorize(resume_text), limit=limit, event_type=event_type, include_past=include_past)
+
+    def get_stats(self):
+        index = self._index
+        return dict(
+            self._stats,
+            available=VECTORS_AVAILABLE,
+            indexed=len(index) if index is not None else 0,
+            generation=self._generation,
+            changes=self._change_seq,
+            built_at=index.built_at.isoformat() if index is not None else None
+        )
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_match_engine():
+    """Return the process-wide match engine, or None when numpy/scipy are missing"""
+    global _engine
+    if not VECTORS_AVAILABLE:
+        return None
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = MatchEngine(check_interval=Config.MATCH_INDEX_CHECK_SECONDS)
+    return _engine
@@ -0,0 +1,189 @@
+"""
+Background batch match scoring for the tracker
+A job scores one resume against many tracked opportunities: the items are
+packed several to a Gemini prompt (MATCH_BATCH_SIZE) and a few prompts run at
+once (MATCH_BATCH_CONCURRENCY). Progress is kept in memory so the UI can poll
+it, and every score is written back in a single transaction at the end. A
+batch that raises only fails its own items: the other scores are still saved
+and the job finishes as 'partial' with the failed ids listed.
+Jobs live in this process only (see PROCESS_LOCAL_NOTE, which the API
+returns): progress polls must reach the web worker that started the job, and
+a restart loses the job and its unsaved scores.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from config import Config
+from models import db, TrackedEvent
+from services.match_service import get_match_service
+from services.resume_extract import resolve_resume
+
+# Finished jobs are kept this long for late progress polls
+FINISHED_JOB_TTL_SECONDS = 3600
+
+PROCESS_LOCAL_NOTE = ("Match jobs run inside the web worker that started them: progress is only visible there, "
+                      "and scores are saved when the job finishes, so a restart loses a running job.")
+
+
+class MatchJob:
+    """Progress and results of one batch scoring run"""
+
+    def __init__(self, user_id, total):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.total = total
+        self.scored = 0
+        self.status = 'queued'  # queued, running, done, partial, failed
+        self.error = None
+        self.results = {}  # tracked id -> (score, explanation)
+        self.failed_ids = []  # tracked ids of batches that raised
+        self.created_at = datetime.utcnow()
+        self.finished_at = None
+        self._finished_monotonic = None
+
+    @property
+    def active(self):
+        return self.status in ('queued', 'running')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'total': self.total,
+            'scored': self.scored,
+            'error': self.error,
+            'failed_ids': list(self.failed_ids),
+            'results': {
+                str(tracked_id): {'match_score': score, 'match_explanation': explanation}
+                for tracked_id, (score, explanation) in list(self.results.items())
+            },
+            'created_at': self.created_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class MatchJobRunner:
+    """Starts MatchJobs on background threads, at most one active job per user"""
+
+    def __init__(self, batch_size=5, concurrency=2):
+        self.batch_size = max(1, int(batch_size))
+        self.concurrency = max(1, int(concurrency))
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def _prune(self):
+        now = time.monotonic()
+        for job_id, job in list(self._jobs.items()):
+            if job._finished_monotonic is not None and now - job._finished_monotonic > FINISHED_JOB_TTL_SECONDS:
+                del self._jobs[job_id]
+
+    def get(self, job_id, user_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    def start(self, app, user_id, resume_text, resume_link, opportunities):
+        """Score opportunities ([(tracked_id, opportunity_details)]) in the background.
+
+        Returns (job, created); created is False when the user already has a
+        job running, which is returned instead.
+        """
+        with self._lock:
+            self._prune()
+            for job in self._jobs.values():
+                if job.user_id == user_id and job.active:
+                    return job, False
+            job = MatchJob(user_id, len(opportunities))
+            self._jobs[job.id] = job
+
+        thread = threading.Thread(
+            target=self._run,
+            args=(app, job, resume_text, resume_link, opportunities),
+            name=f'match-job-{job.id[:8]}',
+            daemon=True
+        )
+        thread.start()
+        return job, True
+
+    def _run(self, app, job, resume_text, resume_link, opportunities):
+        job.status = 'running'
+        try:
+            with app.app_context():
+                service = get_match_service()
+                # Read a linked resume once, not once per batch
+                resume_text = resolve_resume(job.user_id, resume_text, resume_link)
+                if not resume_text:
+                    raise ValueError("Could not read your resume. Paste the text in Account Settings instead.")
+
+                batches = [
+                    opportunities[start:start + self.batch_size]
+                    for start in range(0, len(opportunities), self.batch_size)
+                ]
+                workers = min(self.concurrency, len(batches)) or 1
+                batch_error = None
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='match-batch') as executor:
+                    futures = {
+                        executor.submit(service.calculate_scores_batch, resume_text, batch): batch
+                        for batch in batches
+                    }
+                    for future in as_completed(futures):
+                        try:
+                            scores = future.result()
+                        except Exception as e:
+                            batch_error = batch_error or e
+                            job.failed_ids.extend(key for key, _ in futures[future])
+                            continue
+                        job.results.update(scores)
+                        job.scored += len(scores)
+
+                if job.failed_ids:
+                    print(f"⚠️ [MatchJob] {job.id}: {len(job.failed_ids)} items failed: {batch_error}", flush=True)
+                    if not job.results:
+                        raise batch_error
+                    job.error = f"{len(job.failed_ids)} of {job.total} items could not be scored: {batch_error}"
+                self._save(job)
+                job.status = 'partial' if job.failed_ids else 'done'
+        except Exception as e:
+            print(f"❌ [MatchJob] {job.id} failed: {e}", flush=True)
+            job.error = str(e)
+            job.status = 'failed'
+        finally:
+            job.finished_at = datetime.utcnow()
+            job._finished_monotonic = time.monotonic()
+
+    def _save(self, job):
+        """Write every score back in one transaction (items deleted meanwhile are skipped)"""
+        try:
+            tracked_items = TrackedEvent.query.filter(
+                TrackedEvent.id.in_(list(job.results.keys())),
+                TrackedEvent.user_id == job.user_id
+            ).all()
+            for tracked in tracked_items:
+                tracked.match_score, tracked.match_explanation = job.results[tracked.id]
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            db.session.remove()
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_match_job_runner():
+    """Return the process-wide match job runner"""
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                _runner = MatchJobRunner(
+                    batch_size=Config.MATCH_BATCH_SIZE,
+                    concurrency=Config.MATCH_BATCH_CONCURRENCY
+                )
+    return _runner
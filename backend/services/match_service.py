@@ -1,8 +1,6 @@
 import re
-import requests
-import io
+from services import http_client
 import json
-from bs4 import BeautifulSoup
 
 try:
     import google.generativeai as genai
@@ -11,29 +9,45 @@ except Exception as e:
     print(f"[Warning] AI SDK Warning: Failed to load google-generativeai. This is likely due to Python 3.14 incompatibility. AI features will use REST fallback. Error: {e}")
     SDK_AVAILABLE = False
 
+import threading
+import time
 from datetime import datetime
+from config import Config
+from services.model_router import get_model_router, parse_retry_after
+from services.resume_extract import fetch_resume
+
+GEMINI_API_BASE = 'https://generativelanguage.googleapis.com/v1beta'
+
+# Description characters per opportunity when several share one batch prompt
+BATCH_DESCRIPTION_CHARS = 1500
+
 
 class MatchService:
-    """Service to calculate match scores between resumes and opportunities using Gemini"""
+    """Service to calculate match scores between resumes and opportunities using Gemini.
+
+    One instance is shared process-wide (see get_match_service). Which models
+    the key can use is discovered once and cached; the model that last
+    answered is tried first. The model list is refreshed after
+    MODEL_DISCOVERY_TTL_SECONDS or after repeated 404s.
+    """
     
     def __init__(self, api_key):
-        """Initialize Gemini client or prepare for REST API calls"""
+        """Initialize Gemini client or prepare for REST API calls (no network calls here)"""
         self.api_key = api_key.strip() if api_key else None
         self.enabled = bool(self.api_key)
-        
-        print(f"DEBUG: MatchService Init. Key Length: {len(self.api_key) if self.api_key else 0}. Key Prefix: {self.api_key[:5] if self.api_key else 'None'}")
+
+        self._lock = threading.Lock()
+        self._available_models = None  # None = not discovered yet (or discovery failed)
+        self._discovered_at = None
+        self._discovery_error = None
+        self._working_model = None
+        self._not_found_since_discovery = 0
+        self._model_stats = {}
+        self.created_at = datetime.utcnow()
         
         if SDK_AVAILABLE and self.enabled:
             try:
                 genai.configure(api_key=self.api_key)
-                # DEBUG: List available models
-                print("DEBUG: Listing available models via SDK...")
-                try:
-                    for m in genai.list_models():
-                        print(f" - Found Model: {m.name}")
-                except Exception as e:
-                    print(f"DEBUG: Failed to list models via SDK: {e}")
-
                 # Try to initialize with the most likely working model (Updated to 2.0)
                 self.model = genai.GenerativeModel('gemini-2.0-flash')
                 self.sdk_ready = True
@@ -42,28 +56,98 @@ class MatchService:
                 self.sdk_ready = False
         else:
             self.sdk_ready = False
-            # DEBUG: List models via REST if SDK not used or verified
-            if self.enabled:
-                try:
-                    print("DEBUG: Listing available models via REST...")
-                    url = f"https://generativelanguage.googleapis.com/v1beta/models?key={self.api_key}"
-                    resp = requests.get(url, timeout=10)
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        for m in data.get('models', []):
-                            print(f" - REST Found Model: {m.get('name')}")
-                    else:
-                        print(f"DEBUG: REST List Models failed ({resp.status_code}): {resp.text}")
-                except Exception as e:
-                    print(f"DEBUG: REST List Models Exception: {e}")
+
+        print(f"[MatchService] Initialized (enabled={self.enabled}, sdk={self.sdk_ready})")
+
+    def _discovery_is_stale(self):
+        if self._discovered_at is None:
+            return True
+        if time.monotonic() - self._discovered_at > Config.MODEL_DISCOVERY_TTL_SECONDS:
+            return True
+        return self._not_found_since_discovery >= Config.MODEL_REFRESH_AFTER_404S
+
+    def _discover_models(self):
+        """List the models this key can call generateContent on (REST, one request)"""
+        try:
+            response = http_client.get(f"{GEMINI_API_BASE}/models?key={self.api_key}&pageSize=200", timeout=10)
+            if response.status_code != 200:
+                raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+            models = set()
+            for m in response.json().get('models', []):
+                if 'generateContent' in m.get('supportedGenerationMethods', ['generateContent']):
+                    models.add(m.get('name', '').replace('models/', '', 1))
+            self._available_models = models
+            self._discovery_error = None
+            get_model_router().forget_unavailable(models)
+            print(f"[MatchService] Discovered {len(models)} Gemini models")
+        except Exception as e:
+            # Keep the previous list (if any) and try every preferred model meanwhile
+            self._discovery_error = str(e)
+            print(f"[MatchService] Model discovery failed: {e}")
+        self._discovered_at = time.monotonic()
+        self._not_found_since_discovery = 0
+
+    def _candidate_models(self, preferred):
+        """Preferred models in order, the last working one first, minus models the key can't use"""
+        if not self.enabled:
+            return []
+        with self._lock:
+            if self._discovery_is_stale():
+                self._discover_models()
+            available = self._available_models
+            working = self._working_model
+
+        ordered = ([working] if working else []) + [m for m in preferred if m != working]
+        if available:
+            usable = [m for m in ordered if m in available]
+            if usable:
+                return usable
+        return ordered
+
+    def _record_result(self, model_name, status_code):
+        """Remember which model works; count 404s towards a rediscovery"""
+        with self._lock:
+            stats = self._model_stats.setdefault(model_name, {'ok': 0, 'errors': 0, 'last_status': None})
+            stats['last_status'] = status_code
+            if status_code == 200:
+                stats['ok'] += 1
+                self._working_model = model_name
+                return
+            stats['errors'] += 1
+            if status_code == 404:
+                self._not_found_since_discovery += 1
+                if self._working_model == model_name:
+                    self._working_model = None
+
+    def get_state(self):
+        """Diagnostics snapshot of the cached discovery and per-model results"""
+        with self._lock:
+            age = None if self._discovered_at is None else round(time.monotonic() - self._discovered_at)
+            return {
+                'enabled': self.enabled,
+                'sdk_ready': self.sdk_ready,
+                'created_at': self.created_at.isoformat(),
+                'working_model': self._working_model,
+                'available_models': sorted(self._available_models) if self._available_models else None,
+                'discovery_age_seconds': age,
+                'discovery_error': self._discovery_error,
+                'not_found_since_discovery': self._not_found_since_discovery,
+                'models': {name: dict(stats) for name, stats in self._model_stats.items()},
+                'router': get_model_router().get_state()
+            }
+
+    def resolve_resume_text(self, resume_text, resume_link=None):
+        """The pasted resume text, or the text behind resume_link when nothing was pasted"""
+        if not resume_text and resume_link:
+            return self._fetch_url_content(resume_link)
+        return resume_text
 
     def calculate_score(self, resume_text, opportunity_details, resume_link=None):
         """
         Compare resume with opportunity and return a score and explanation.
         If resume_text is empty and resume_link is provided, attempts to fetch content.
         """
-        if not resume_text and resume_link:
-            resume_text = self._fetch_url_content(resume_link)
+        resume_text = self.resolve_resume_text(resume_text, resume_link)
 
         if not resume_text:
             return 0, "Please provide your resume text or a public link in Account Settings."
@@ -108,6 +192,78 @@ class MatchService:
         # REST API Fallback (Bypasses SDK issues on Python 3.14)
         return self._calculate_score_rest(prompt, resume_text, opportunity_details)
 
+    def calculate_scores_batch(self, resume_text, opportunities, resume_link=None):
+        """
+        Score one resume against several opportunities with a single model call.
+        opportunities is a list of (key, opportunity_details) pairs; returns
+        {key: (score, explanation)}. Opportunities the model leaves out of its
+        answer are scored one at a time with calculate_score.
+        """
+        resume_text = self.resolve_resume_text(resume_text, resume_link)
+        if not resume_text:
+            message = "Please provide your resume text or a public link in Account Settings."
+            return {key: (0, message) for key, _ in opportunities}
+
+        if not self.enabled:
+            message = "AI matching is currently unavailable (API key missing)."
+            return {key: (0, message) for key, _ in opportunities}
+
+        if len(opportunities) == 1:
+            key, details = opportunities[0]
+            return {key: self.calculate_score(resume_text, details)}
+
+        blocks = []
+        for index, (_, details) in enumerate(opportunities, start=1):
+            description = (details.get('description') or '')[:BATCH_DESCRIPTION_CHARS]
+            blocks.append(f"""
+        [{index}]
+        Title: {details.get('title')}
+        Organizer/Company: {details.get('organizer') or details.get('company')}
+        Description: {description}
+        Skills Required: {details.get('skills_required', 'Not specified')}
+        """)
+
+        prompt = f"""
+        You are an expert career counselor and technical recruiter.
+        Analyze the following resume against EACH of the numbered opportunities and calculate a match score for each one.
+
+        RESUME:
+        {resume_text}
+
+        OPPORTUNITIES:
+        {''.join(blocks)}
+
+        Task, for every opportunity:
+        1. Calculate a match score between 0 and 100 based on skills, experience, and role alignment.
+        2. Provide a 2-sentence explanation of why this score was given, highlighting strengths or gaps.
+
+        Format your response as a STRICT JSON object with one entry per opportunity number:
+        {{
+            "matches": [
+                {{"id": 1, "score": 85, "explanation": "Your background in React and Node.js perfectly aligns with the project requirements. However, you lack the specific experience with GraphQL mentioned in the description."}}
+            ]
+        }}
+
+        Only return the JSON.
+        """
+
+        response_text = self.generate_content(prompt)
+        if not response_text:
+            # Every model failed or is cooling down; retrying item by item would fail the same way
+            return {
+                key: self._calculate_fallback_score(resume_text, details, error_details="Batch generation failed")
+                for key, details in opportunities
+            }
+
+        parsed = self._parse_batch_response(response_text)
+        results = {}
+        for index, (key, details) in enumerate(opportunities, start=1):
+            if index in parsed:
+                results[key] = parsed[index]
+            else:
+                results[key] = self.calculate_score(resume_text, details)
+        return results
+
 
     def generate_content(self, prompt):
         """Public method to generate content using the configured model (SDK or REST)"""
@@ -121,116 +277,126 @@ class MatchService:
         # REST Fallback for generation
         return self._generate_content_rest(prompt)
 
+    def _route(self, preferred):
+        """(candidates after discovery, the ones the router will call now, best first)"""
+        candidates = self._candidate_models(preferred)
+        return candidates, get_model_router().order(candidates)
+
+    def _post_generate(self, model_name, prompt):
+        """One generateContent call, reported to the model router.
+
+        Returns (status_code, response); status_code is None on a network error.
+        """
+        router = get_model_router()
+        url = f"{GEMINI_API_BASE}/models/{model_name}:generateContent?key={self.api_key}"
+        headers = {'Content-Type': 'application/json'}
+        payload = {
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }]
+        }
+
+        started = time.monotonic()
+        try:
+            response = http_client.post(url, headers=headers, json=payload, timeout=10)
+        except Exception as e:
+            print(f"REST Generation failed with {model_name}: {e}")
+            router.record_failure(model_name, None, reason=str(e)[:200])
+            return None, None
+
+        self._record_result(model_name, response.status_code)
+        if response.status_code == 200:
+            router.record_success(model_name, time.monotonic() - started)
+        else:
+            router.record_failure(
+                model_name,
+                response.status_code,
+                retry_after=parse_retry_after(response.headers.get('Retry-After')),
+                reason=f"HTTP {response.status_code}: {response.text[:120]}"
+            )
+        return response.status_code, response
+
+    def _report_cooldown(self, candidates, ordered):
+        if candidates and not ordered:
+            wait = get_model_router().retry_in(candidates)
+            print(f"⚠️ [MatchService] All Gemini models are cooling down (next retry in {wait:.0f}s)")
+
     def _generate_content_rest(self, prompt):
-        """Direct REST call for content generation - Tries multiple models"""
-        models_to_try = [
+        """Direct REST call for content generation - tries healthy models, fastest first"""
+        candidates, models_to_try = self._route([
             'gemini-2.0-flash',
             'gemini-2.0-flash-lite',
             'gemini-1.5-flash',
             'gemini-pro'
-        ]
+        ])
+        self._report_cooldown(candidates, models_to_try)
         
         for model_name in models_to_try:
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent?key={self.api_key}"
-            headers = {'Content-Type': 'application/json'}
-            payload = {
-                "contents": [{
-                    "parts": [{"text": prompt}]
-                }]
-            }
-            
+            status, response = self._post_generate(model_name, prompt)
+            if status != 200:
+                continue
             try:
-                print(f"DEBUG: Attempting REST Generation with {model_name}")
-                response = requests.post(url, headers=headers, json=payload, timeout=10)
-                if response.status_code != 200:
-                    continue
-                
-                data = response.json()
-                try:
-                    return data['candidates'][0]['content']['parts'][0]['text']
-                except (KeyError, IndexError):
-                    continue
-            except Exception as e:
-                print(f"REST Generation failed: {e}")
+                return response.json()['candidates'][0]['content']['parts'][0]['text']
+            except (KeyError, IndexError, ValueError):
                 continue
         return ""
 
     def _calculate_score_rest(self, prompt, resume_text, opportunity_details):
-        """Direct REST call to Gemini API - Only tries v1beta (Gemini 2.0 doesn't support v1)"""
-        models_to_try = [
+        """Direct REST call to Gemini API (v1beta) - tries healthy models, fastest first"""
+        candidates, models_to_try = self._route([
             'gemini-2.0-flash',
             'gemini-2.0-flash-lite',
             'gemini-flash-latest',
             'gemini-pro-latest'
-        ]
+        ])
+        self._report_cooldown(candidates, models_to_try)
 
         last_error = None
         current_key = self.api_key
         masked_key = f"{current_key[:10]}..." if current_key else "None"
-        
-        # Only use v1beta (v1 doesn't work with newer models)
-        version = 'v1beta'
 
         for model_name in models_to_try:
-                url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent?key={self.api_key}"
-                headers = {'Content-Type': 'application/json'}
-                payload = {
-                    "contents": [{
-                        "parts": [{"text": prompt}]
-                    }]
-                }
-                
-                print(f"DEBUG: Attempting REST Match with Model: {model_name} (v1beta)")
-                try:
-                    response = requests.post(url, headers=headers, json=payload, timeout=10)
-                    
-                    if response.status_code == 404:
-                        print(f"Model {model_name} (v1beta) not found (404).")
-                        last_error = f"404 Not Found: {model_name} (v1beta)"
-                        continue
-                    
-                    if response.status_code == 403:
-                        err_body = response.text[:300]
-                        print(f"403 Forbidden for {model_name}: {err_body}")
-                        last_error = f"403 Forbidden: {err_body}"
-                        continue
-                    
-                    if response.status_code == 429:
-                        import time
-                        err_body = response.text[:300]
-                        print(f"429 Quota exhausted for {model_name}: {err_body}. Waiting 2s before next model...")
-                        last_error = f"429 Quota Exhausted: {model_name}"
-                        time.sleep(2)
-                        continue
-                    
-                    if response.status_code == 400:
-                         print(f"Bad Request for {model_name} (v1beta): {response.text}")
-                         last_error = f"400 Bad Request: {model_name} (v1beta)"
-                         continue
-
-                    print(f"DEBUG: Response Status: {response.status_code}")
-                    if response.status_code != 200:
-                        error_msg = f"Gemini Error {response.status_code}: {response.text[:300]}"
-                        print(error_msg)
-                        last_error = error_msg
-                        continue
-                    
-                    data = response.json()
-                    
-                    # Extract text
-                    try:
-                        ai_text = data['candidates'][0]['content']['parts'][0]['text']
-                        return self._parse_ai_response(ai_text)
-                    except (KeyError, IndexError) as e:
-                        print(f"Response parse error: {e}. Raw Data: {data}")
-                        return self._calculate_fallback_score(resume_text, opportunity_details, error_details="Parse Error")
-                        
-                except Exception as e:
-                    print(f"Match failed with {model_name}: {e}")
-                    last_error = f"{e}"
-                    continue
+            status, response = self._post_generate(model_name, prompt)
+
+            if status is None:
+                last_error = f"Network error: {model_name}"
+                continue
+            if status == 404:
+                print(f"Model {model_name} (v1beta) not found (404).")
+                last_error = f"404 Not Found: {model_name} (v1beta)"
+                continue
+            if status == 403:
+                err_body = response.text[:300]
+                print(f"403 Forbidden for {model_name}: {err_body}")
+                last_error = f"403 Forbidden: {err_body}"
+                continue
+            if status == 429:
+                # The router keeps this model out of rotation until its quota window passes
+                print(f"429 Quota exhausted for {model_name}: {response.text[:300]}")
+                last_error = f"429 Quota Exhausted: {model_name}"
+                continue
+            if status == 400:
+                print(f"Bad Request for {model_name} (v1beta): {response.text}")
+                last_error = f"400 Bad Request: {model_name} (v1beta)"
+                continue
+            if status != 200:
+                error_msg = f"Gemini Error {status}: {response.text[:300]}"
+                print(error_msg)
+                last_error = error_msg
+                continue
+
+            # Extract text
+            try:
+                data = response.json()
+                ai_text = data['candidates'][0]['content']['parts'][0]['text']
+                return self._parse_ai_response(ai_text)
+            except (KeyError, IndexError, ValueError) as e:
+                print(f"Response parse error: {e}. Raw Data: {response.text[:300]}")
+                return self._calculate_fallback_score(resume_text, opportunity_details, error_details="Parse Error")
         
-        # If all models fail
+        # If all models fail (or are all cooling down)
+        if get_model_router().all_quota_limited(candidates):
+            last_error = '429 Quota Exhausted (all models)'
         print(f"All Gemini models failed. Last error: {last_error}")
         if '429' in str(last_error) or 'Quota' in str(last_error):
             return 50, "AI quota temporarily exhausted. Score is estimated using keyword matching. Try again in a few minutes."
@@ -258,7 +424,29 @@ class MatchService:
             print(f"Error parsing AI response: {e}. Raw text: {text[:100]}...")
             return 0, "Error format in AI response."
 
-    def _calculate_fallback_score(self, resume_text, opportunity_details, error_details=None):
+    def _parse_batch_response(self, text):
+        """Extract {opportunity number: (score, explanation)} from a batch AI JSON string"""
+        try:
+            text = re.sub(r'```(?:json)?', '', text)
+            start_index = text.find('{')
+            if start_index == -1:
+                return {}
+            data, _ = json.JSONDecoder().raw_decode(text[start_index:])
+
+            results = {}
+            for match in data.get('matches', []):
+                try:
+                    index = int(match.get('id'))
+                    score = max(0, min(100, int(match.get('score', 0))))
+                except (TypeError, ValueError):
+                    continue
+                results[index] = (score, match.get('explanation') or "No explanation provided.")
+            return results
+        except Exception as e:
+            print(f"Error parsing batch AI response: {e}. Raw text: {text[:100]}...")
+            return {}
+
+    def _calculate_fallback_score(self,resume_text, opportunity_details, error_details=None):
         """Simple keyword matching fallback when both SDK and REST fail"""
         if not resume_text:
             return 0, "Wait! We couldn't read your resume from that link. Could you paste the text instead?"
@@ -267,9 +455,9 @@ class MatchService:
         
         # Extract keywords from title and skills
         keywords = set()
-        title = opportunity_details.get('title', '').lower()
-        skills = opportunity_details.get('skills_required', '').lower()
-        description = opportunity_details.get('description', '').lower()
+        title = (opportunity_details.get('title') or '').lower()
+        skills = (opportunity_details.get('skills_required') or '').lower()
+        description = (opportunity_details.get('description') or '').lower()
         
         # Common tech keywords to look for
         tech_stack = ['python', 'javascript', 'react', 'node', 'java', 'cpp', 'html', 'css', 'sql', 'aws', 'docker', 'machine learning', 'ai']
@@ -304,41 +492,28 @@ class MatchService:
         return score, explanation
 
     def _fetch_url_content(self, url):
-        """Fetch text content from a public URL"""
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            content_type = response.headers.get('Content-Type', '').lower()
-            
-            if 'application/pdf' in content_type:
-                try:
-                    import PyPDF2
-                    pdf_file = io.BytesIO(response.content)
-                    reader = PyPDF2.PdfReader(pdf_file)
-                    text = ""
-                    for page in reader.pages:
-                        extracted = page.extract_text()
-                        if extracted:
-                            text += extracted + "\n"
-                    return text.strip() if text.strip() else None
-                except Exception as e:
-                    print(f"PDF Error: {e}")
-                    return None
-            
-            # HTML or Text
-            soup = BeautifulSoup(response.content, 'html.parser')
-            for script in soup(["script", "style"]):
-                script.extract()
-            return soup.get_text(separator=' ', strip=True)
-            
-        except Exception as e:
-            print(f"Error fetching URL content: {e}")
-            return None
+        """Fetch text content from a public URL (uncached; matching goes through resume_extract.resolve_resume)"""
+        return fetch_resume(url).text
+
+_match_service = None
+_match_service_lock = threading.Lock()
+
 
 def get_match_service():
-    from flask import current_app
-    return MatchService(current_app.config['GEMINI_API_KEY'])
+    """Return the process-wide MatchService (rebuilt only if the API key changes)"""
+    global _match_service
+    try:
+        from flask import current_app
+        api_key = current_app.config['GEMINI_API_KEY']
+    except RuntimeError:
+        # Outside an app context (scripts, worker threads)
+        api_key = Config.GEMINI_API_KEY
+
+    service = _match_service
+    if service is None or service.api_key != (api_key.strip() if api_key else None):
+        with _match_service_lock:
+            service = _match_service
+            if service is None or service.api_key != (api_key.strip() if api_key else None):
+                service = MatchService(api_key)
+                _match_service = service
+    return service
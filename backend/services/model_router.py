@@ -0,0 +1,240 @@
+"""
+Health-aware routing between Gemini models
+Tracks latency (EWMA), success rate and quota state per model and keeps a
+circuit breaker for each one. Calls go to the fastest healthy model first;
+models that answered 404/403 or ran out of quota are skipped until their
+circuit reopens, instead of being re-tried (and slept on) for every prompt.
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from config import Config
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Assumed latency (seconds) for a model with no samples yet
+DEFAULT_LATENCY = 3.0
+
+# A half-open probe that never reports back is given up on after this long
+PROBE_TIMEOUT = 60.0
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class ModelHealth:
+    """Counters and breaker state of one model"""
+
+    def __init__(self, name):
+        self.name = name
+        self.state = CLOSED
+        self.latency = None  # EWMA of successful call latency, seconds
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.opened_count = 0  # consecutive trips, drives the backoff
+        self.probing = False
+        self.probe_started = 0.0
+        self.last_status = None
+        self.last_reason = None
+
+    @property
+    def success_rate(self):
+        # Laplace-smoothed so one early failure doesn't bury a model
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+    def score(self):
+        """Lower is better: expected latency inflated by the failure rate"""
+        return (self.latency if self.latency is not None else DEFAULT_LATENCY) / self.success_rate
+
+    def to_dict(self):
+        return {
+            'state': self.state,
+            'latency_ms': round(self.latency * 1000) if self.latency is not None else None,
+            'success_rate': round(self.success_rate, 3),
+            'successes': self.successes,
+            'failures': self.failures,
+            'open_for_seconds': max(0, round(self.open_until - time.monotonic())) if self.state != CLOSED else 0,
+            'last_status': self.last_status,
+            'last_reason': self.last_reason
+        }
+
+
+class ModelRouter:
+    """Orders candidate models by health and trips breakers on failures"""
+
+    def __init__(self, failure_threshold=3, base_backoff=5.0, max_backoff=600.0,
+                 unavailable_backoff=3600.0, latency_alpha=0.3):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.unavailable_backoff = unavailable_backoff
+        self.latency_alpha = latency_alpha
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def _health(self, name):
+        health = self._models.get(name)
+        if health is None:
+            health = self._models[name] = ModelHealth(name)
+        return health
+
+    def _jittered_backoff(self, health):
+        backoff = min(self.max_backoff, self.base_backoff * (2 ** max(0, health.opened_count - 1)))
+        return backoff * random.uniform(0.5, 1.5)
+
+    def _open(self, health, seconds, reason):
+        health.opened_count += 1
+        health.state = OPEN
+        health.probing = False
+        health.open_until = time.monotonic() + seconds
+        health.last_reason = reason
+        print(f"⚠️ [ModelRouter] {health.name} circuit open for {seconds:.0f}s ({reason})", flush=True)
+
+    def order(self, candidates):
+        """Return the callable candidates, best first. Open circuits are left out.
+
+        At most one model whose open period has expired is handed out per call,
+        as a half-open probe, and it goes first: callers stop at the first
+        model that answers, so a probe placed further down might never be
+        tried and would block other callers from probing until PROBE_TIMEOUT.
+        """
+        now = time.monotonic()
+        ready = []
+        recovering = []
+        with self._lock:
+            for index, name in enumerate(candidates):
+                health = self._health(name)
+                if health.state == CLOSED:
+                    ready.append((health.score(), index, name))
+                elif now >= health.open_until and not (health.probing and now - health.probe_started < PROBE_TIMEOUT):
+                    recovering.append((health.score(), index, name))
+
+            ordered = [name for _, _, name in sorted(ready)]
+            if recovering:
+                _, _, name = min(recovering)
+                health = self._health(name)
+                health.state = HALF_OPEN
+                health.probing = True
+                health.probe_started = now
+                ordered.insert(0, name)
+        return ordered
+
+    def retry_in(self, candidates):
+        """Seconds until the first of the candidates can be tried again (0 if one is ready)"""
+        now = time.monotonic()
+        with self._lock:
+            waits = [max(0.0, self._health(name).open_until - now) if self._health(name).state != CLOSED else 0.0
+                     for name in candidates]
+        return min(waits) if waits else 0.0
+
+    def record_success(self, name, latency):
+        with self._lock:
+            health = self._health(name)
+            health.successes += 1
+            health.consecutive_failures = 0
+            health.opened_count = 0
+            health.state = CLOSED
+            health.probing = False
+            health.last_status = 200
+            health.last_reason = None
+            if health.latency is None:
+                health.latency = latency
+            else:
+                health.latency += self.latency_alpha * (latency - health.latency)
+
+    def record_failure(self, name, status=None, retry_after=None, reason=None):
+        """Count a failed call. status None means a network error/timeout.
+
+        404/403: the key can't use the model -> open for unavailable_backoff.
+        429: out of quota -> open for Retry-After if given, else jittered backoff.
+        400: the prompt was rejected, not the model's fault -> only counted.
+        Anything else trips the breaker after failure_threshold in a row
+        (a failed half-open probe re-trips immediately).
+        """
+        with self._lock:
+            health = self._health(name)
+            health.failures += 1
+            health.consecutive_failures += 1
+            health.last_status = status
+            health.last_reason = reason
+            was_probe = health.state == HALF_OPEN
+            health.probing = False
+
+            if status in (403, 404):
+                self._open(health, self.unavailable_backoff, reason or f"HTTP {status}")
+            elif status == 429:
+                seconds = retry_after if retry_after is not None else self._jittered_backoff(health)
+                # A little jitter on Retry-After too, so workers don't all return at the same instant
+                self._open(health, seconds * random.uniform(1.0, 1.2), reason or 'quota exhausted')
+            elif status == 400:
+                health.consecutive_failures = 0
+                if was_probe:
+                    health.state = CLOSED
+            elif was_probe or health.consecutive_failures >= self.failure_threshold:
+                self._open(health, self._jittered_backoff(health), reason or f"HTTP {status or 'error'}")
+
+    def all_quota_limited(self, candidates):
+        """True when every candidate is currently open because of a 429"""
+        now = time.monotonic()
+        with self._lock:
+            states = [self._health(name) for name in candidates]
+            return bool(states) and all(
+                h.state != CLOSED and now < h.open_until and h.last_status == 429 for h in states
+            )
+
+    def forget_unavailable(self, names):
+        """Close breakers tripped by 403/404 for models a fresh discovery lists as usable"""
+        with self._lock:
+            for name in names:
+                health = self._models.get(name)
+                if health is not None and health.state != CLOSED and health.last_status in (403, 404):
+                    self._models.pop(name)
+
+    def get_state(self):
+        with self._lock:
+            return {name: health.to_dict() for name, health in self._models.items()}
+
+    def reset(self, name=None):
+        with self._lock:
+            if name is None:
+                self._models.clear()
+            else:
+                self._models.pop(name, None)
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_model_router():
+    """Return the process-wide model router"""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = ModelRouter(
+                    failure_threshold=Config.MODEL_BREAKER_FAILURES,
+                    base_backoff=Config.MODEL_BREAKER_BASE_SECONDS,
+                    max_backoff=Config.MODEL_BREAKER_MAX_SECONDS,
+                    unavailable_backoff=Config.MODEL_UNAVAILABLE_SECONDS
+                )
+    return _router
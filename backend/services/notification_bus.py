@@ -0,0 +1,243 @@
+"""
+Notification events for SSE streams, bridged through the database
+Notifications can be written by any process (the job worker's scans, any web
+worker), so streams don't rely on in-process publishing for them. One poller
+thread per process runs a `notifications.id > last id` query every
+SSE_POLL_SECONDS while streams are open, and appends what it finds to a
+bounded ring buffer that every stream of the process waits on. Rows of one
+fan-out (same event, title and message) become one event addressed to all
+their users.
+Ids are assigned at insert, not commit, so a row can become visible after a
+higher id was already read. Ids skipped below the watermark are remembered
+and looked up again on every poll for NOTIFICATION_BUS_LOOKBACK_SECONDS;
+rows that show up late are buffered then, out of id order.
+Event ids are notification ids, so a reconnect with Last-Event-ID replays
+what was missed from the buffer, whichever process served the old stream.
+Read receipts ('read' events) are published in-process only; tabs served by
+another process pick up the new count with their next notification event or
+reconnect.
+"""
+import threading
+import time
+from collections import deque
+from config import Config
+
+
+class BusEvent:
+    """One buffered event and who it is addressed to"""
+
+    def __init__(self, seq, name, data, event_id=None, user_ids=None, role=None):
+        self.seq = seq  # position in this process's buffer
+        self.id = event_id  # notification id, None for in-process events
+        self.name = name
+        self.data = data
+        self.user_ids = frozenset(user_ids) if user_ids is not None else None
+        self.role = role
+
+    def is_for(self, user_id, role):
+        if self.user_ids is not None:
+            return user_id in self.user_ids
+        return self.role is None or self.role == role
+
+
+def group_rows(rows):
+    """Collapse consecutive notification rows of one fan-out into (last id, data, user_ids)"""
+    groups = []
+    for row in rows:
+        data = {'event_type': row.event_type, 'event_id': row.event_id, 'title': row.title, 'message': row.message}
+        if groups and groups[-1][1] == data:
+            groups[-1][0] = row.id
+            groups[-1][2].add(row.user_id)
+        else:
+            groups.append([row.id, data, {row.user_id}])
+    return groups
+
+
+class NotificationBus:
+    """Thread-safe ring buffer of BusEvents with blocking waits, fed by a DB poller"""
+
+    def __init__(self, buffer_size=1000, poll_seconds=2, batch_size=1000, lookback_seconds=30):
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self.lookback_seconds = lookback_seconds
+        self._events = deque(maxlen=buffer_size)
+        self._condition = threading.Condition()
+        self._seq = 0
+        # Highest notification id read from the database, and the highest one
+        # no longer in the buffer (replays from before it are impossible)
+        self._last_id = None
+        self._floor_id = None
+        # Skipped ids below _last_id that may still commit -> when they were first skipped
+        self._gaps = {}
+        self._streams = 0
+        self._polls = 0
+        self._late_rows = 0
+        self._poller = None
+        self._poller_lock = threading.Lock()
+
+    def _append(self, name, data, event_id=None, user_ids=None, role=None):
+        """Add an event and wake every waiting stream (caller holds the condition)"""
+        if len(self._events) == self._events.maxlen and self._events[0].id is not None:
+            self._floor_id = max(self._floor_id or 0, self._events[0].id)
+        self._seq += 1
+        self._events.append(BusEvent(self._seq, name, data, event_id, user_ids, role))
+        self._condition.notify_all()
+
+    def publish(self, name, data, user_ids=None, role=None):
+        """Publish an in-process event to specific users, to everyone with a role, or (neither) to everyone"""
+        with self._condition:
+            self._append(name, data, user_ids=user_ids, role=role)
+
+    def start(self, app):
+        """Start this process's poller thread (once)"""
+        if self._poller is not None:
+            return
+        with self._poller_lock:
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll_loop, args=(app,), daemon=True,
+                                                name='notification-poller')
+                self._poller.start()
+
+    def _poll_loop(self, app):
+        from models import db
+        while True:
+            time.sleep(self.poll_seconds)
+            with self._condition:
+                if not self._streams:
+                    # Nobody listening: start over from the newest row when a stream opens
+                    self._last_id = self._floor_id = None
+                    self._gaps.clear()
+                    continue
+            with app.app_context():
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    print(f"⚠️ [Notification Bus] Poll failed: {e}", flush=True)
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+
+    def poll_once(self):
+        """Buffer the notifications written since the last poll (needs an app context)"""
+        from models import db, Notification
+        with self._condition:
+            last_id = self._last_id
+            expired = time.monotonic() - self.lookback_seconds
+            for gap_id in [gap_id for gap_id, skipped_at in self._gaps.items() if skipped_at < expired]:
+                del self._gaps[gap_id]
+            gap_ids = list(self._gaps)
+        if last_id is None:
+            newest = db.session.query(db.func.max(Notification.id)).scalar() or 0
+            with self._condition:
+                if self._last_id is None:
+                    self._last_id = self._floor_id = newest
+            return 0
+
+        columns = (Notification.id, Notification.user_id, Notification.event_type, Notification.event_id,
+                   Notification.title, Notification.message)
+        late = []
+        if gap_ids:
+            late = db.session.query(*columns).filter(Notification.id.in_(gap_ids))\
+                .order_by(Notification.id).all()
+        rows = db.session.query(*columns).filter(Notification.id > last_id)\
+            .order_by(Notification.id).limit(self.batch_size).all()
+
+        with self._condition:
+            self._polls += 1
+            self._late_rows += len(late)
+            for row in late:
+                self._gaps.pop(row.id, None)
+            now = time.monotonic()
+            previous = last_id
+            for row in rows:
+                for gap_id in range(max(previous + 1, row.id - self.batch_size), row.id):
+                    self._gaps[gap_id] = now
+                previous = row.id
+            while len(self._gaps) > self.batch_size:
+                del self._gaps[next(iter(self._gaps))]
+            for event_id, data, user_ids in group_rows(late) + group_rows(rows):
+                self._append('notification', data, event_id=event_id, user_ids=user_ids)
+            if rows:
+                self._last_id = rows[-1].id
+        return len(late) + len(rows)
+
+    def subscribe(self):
+        """Register an open stream (needs an app context); the first one sets where polling starts"""
+        with self._condition:
+            self._streams += 1
+            primed = self._last_id is not None
+        if not primed:
+            self.poll_once()
+
+    def unsubscribe(self):
+        with self._condition:
+            self._streams -= 1
+
+    @property
+    def cursor(self):
+        """Position to wait from for events published after now"""
+        with self._condition:
+            return self._seq
+
+    def replay(self, last_event_id, user_id, role):
+        """(buffered notification events for the user after last_event_id, gap, cursor) without blocking.
+
+        Returns the events with a higher id, plus late rows buffered after
+        last_event_id itself. gap is True when events after last_event_id may
+        have left the buffer (or were never read by this process), so the
+        client should resync.
+        """
+        with self._condition:
+            gap = self._floor_id is None or last_event_id < self._floor_id
+            anchor = next((event.seq for event in self._events if event.id == last_event_id), self._seq)
+            events = [event for event in self._events
+                      if event.id is not None and (event.id > last_event_id or event.seq > anchor)
+                      and event.is_for(user_id, role)]
+            return events, gap, self._seq
+
+    def wait(self, cursor, user_id, role, timeout):
+        """Block up to timeout seconds for events after cursor addressed to the user.
+
+        Returns (events, cursor): cursor is the position to wait from next
+        time, so events for other users are never scanned twice.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                events = [event for event in self._events if event.seq > cursor and event.is_for(user_id, role)]
+                cursor = self._seq
+                if events:
+                    return events, cursor
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return [], cursor
+                self._condition.wait(remaining)
+
+    def get_stats(self):
+        with self._condition:
+            return {
+                'buffered': len(self._events),
+                'buffer_size': self._events.maxlen,
+                'last_notification_id': self._last_id,
+                'pending_gaps': len(self._gaps),
+                'late_rows': self._late_rows,
+                'streams': self._streams,
+                'polls': self._polls,
+                'poll_seconds': self.poll_seconds
+            }
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_notification_bus():
+    """Return the process-wide notification bus"""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = NotificationBus(buffer_size=Config.NOTIFICATION_BUS_BUFFER,
+                                       poll_seconds=Config.SSE_POLL_SECONDS,
+                                       lookback_seconds=Config.NOTIFICATION_BUS_LOOKBACK_SECONDS)
+    return _bus
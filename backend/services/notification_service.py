@@ -0,0 +1,128 @@
+"""
+Notification fan-out and unread counters
+Creates one notification row per recipient with a single set-based
+INSERT ... SELECT, so announcing an event costs one statement no matter how
+many users there are. Every write that changes unread state also maintains
+users.unread_notification_count, so the unread-count poll reads one column
+instead of counting notification rows. Open SSE streams find new rows
+through the notification bus's poller (services.notification_bus); marking
+notifications read is published on the bus directly.
+"""
+from datetime import datetime
+from sqlalchemy import insert, select, literal, update
+from models import db, User, Notification
+from services.notification_bus import get_notification_bus
+
+
+def _bump_unread(user_filter, amount):
+    """Adjust the unread counter of the matching users, never below zero"""
+    if amount >= 0:
+        new_value = User.unread_notification_count + amount
+    else:
+        new_value = db.case(
+            (User.unread_notification_count + amount < 0, 0),
+            else_=User.unread_notification_count + amount
+        )
+    db.session.execute(
+        update(User).where(user_filter).values(unread_notification_count=new_value),
+        execution_options={'synchronize_session': False}
+    )
+
+
+def fan_out_notification(event_type, event_id, title, message, role=None, commit=True):
+    """Notify every user (or every user with the given role) about an event.
+
+    Returns the number of notifications created.
+    """
+    recipients = select(
+        User.id,
+        literal(event_type, db.String),
+        literal(event_id, db.Integer),
+        literal(title, db.String),
+        literal(message, db.Text),
+        literal(False, db.Boolean),
+        literal(datetime.utcnow(), db.DateTime)
+    )
+    if role:
+        recipients = recipients.where(User.role == role)
+
+    statement = insert(Notification).from_select(
+        ['user_id', 'event_type', 'event_id', 'title', 'message', 'is_read', 'created_at'],
+        recipients
+    )
+    result = db.session.execute(statement)
+    _bump_unread(User.role == role if role else db.true(), 1)
+    if commit:
+        db.session.commit()
+    return result.rowcount
+
+
+def notify_user(user_id, event_type, event_id, title, message, commit=True):
+    """Create a single notification for one user"""
+    notification = Notification(
+        user_id=user_id,
+        event_type=event_type,
+        event_id=event_id,
+        title=title,
+        message=message,
+        is_read=False
+    )
+    db.session.add(notification)
+    _bump_unread(User.id == user_id, 1)
+    if commit:
+        db.session.commit()
+    return notification
+
+
+def mark_read(user_id, notification_id, commit=True):
+    """Mark one notification read. Returns False if it doesn't belong to the user."""
+    result = db.session.execute(
+        update(Notification)
+        .where(Notification.id == notification_id, Notification.user_id == user_id,
+               Notification.is_read == False)
+        .values(is_read=True),
+        execution_options={'synchronize_session': False}
+    )
+    if result.rowcount:
+        _bump_unread(User.id == user_id, -result.rowcount)
+    elif not db.session.query(Notification.id).filter_by(id=notification_id, user_id=user_id).first():
+        return False
+    if commit:
+        db.session.commit()
+    if result.rowcount:
+        # Lets the user's other tabs refresh their badge
+        get_notification_bus().publish('read', {'id': notification_id}, user_ids=[int(user_id)])
+    return True
+
+
+def mark_all_read(user_id, commit=True):
+    """Mark every notification of the user read and reset the counter"""
+    updated = Notification.query.filter_by(user_id=user_id, is_read=False)\
+        .update({'is_read': True}, synchronize_session=False)
+    db.session.execute(
+        update(User).where(User.id == user_id).values(unread_notification_count=0),
+        execution_options={'synchronize_session': False}
+    )
+    if commit:
+        db.session.commit()
+    get_notification_bus().publish('read', {'all': True}, user_ids=[int(user_id)])
+    return updated
+
+
+def get_unread_count(user_id):
+    """O(1) read of the maintained counter"""
+    count = db.session.query(User.unread_notification_count).filter(User.id == user_id).scalar()
+    return count or 0
+
+
+def recount_unread(user_id=None, commit=True):
+    """Recompute counters from the notifications table (repair after manual edits)"""
+    unread = select(db.func.count(Notification.id))\
+        .where(Notification.user_id == User.id, Notification.is_read == False)\
+        .scalar_subquery()
+    statement = update(User).values(unread_notification_count=unread)
+    if user_id is not None:
+        statement = statement.where(User.id == user_id)
+    db.session.execute(statement, execution_options={'synchronize_session': False})
+    if commit:
+        db.session.commit()
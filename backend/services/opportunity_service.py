@@ -1,64 +1,42 @@
-import re
-import requests
-from bs4 import BeautifulSoup
+from services.page_cache import get_page_cache
+from services.expiry_classifier import classify_page, ExpiryVerdict, OPEN
+
+# Verdict for a page that could not be fetched: treated as open, but nothing was checked
+UNFETCHED = ExpiryVerdict(False)
 
 def fetch_page_text_minimal(url):
-    """Fetch and clean text content from a URL (centralized version)"""
+    """Fetch and clean text content from a URL (centralized version, served from the page cache).
+
+    Returns None when the page could not be fetched.
+    """
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Remove noise
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.extract()
-            
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        
-        return text[:4000].lower()
+        page = get_page_cache().fetch(url, timeout=10)
+        if not page.ok:
+            return None
+        return page.text
     except Exception:
-        return ""
+        return None
 
-def is_opportunity_expired_centralized(url):
-    """Unified logic to check if an opportunity registration is closed or expired.
-    
-    CONSERVATIVE approach: only returns True if there is STRONG evidence
-    the opportunity is closed. If in doubt, returns False (keeps the item).
-    Never marks an item expired if the page can't be fetched.
+def check_opportunity_expiry(url):
+    """ExpiryVerdict for a registration link: whether it looks closed and which signal said so.
+
+    CONSERVATIVE approach: only expired if there is STRONG evidence the
+    opportunity is closed. Never marks an item expired if the page can't be
+    fetched; UNFETCHED is returned instead.
     """
     if not url or not url.startswith('http'):
-        return False
-        
+        return OPEN
+
     page_text = fetch_page_text_minimal(url)
-    if not page_text:
+    if page_text is None:
         # Can't fetch page = assume it's still valid (conservative)
-        return False
-    
-    # Only match very specific, unambiguous phrases that clearly indicate closure
-    # These must be full phrases, not single words like "expired"
-    strong_expiration_signals = [
-        r'registration[s]?\s+(is|are|have been)\s+closed',
-        r'no longer accepting\s+(responses|applications|entries)',
-        r'applications\s+are\s+closed',
-        r'this form is no longer accepting responses',
-        r'opportunity has expired',
-        r'registrations?\s+closed',
-        r'event is no longer active',
-        r'not accepting any more entries',
-    ]
-    
-    matches = 0
-    for pattern in strong_expiration_signals:
-        if re.search(pattern, page_text):
-            matches += 1
-    
-    # Require at least ONE strong signal
-    return matches >= 1
+        return UNFETCHED
+    if not page_text:
+        return OPEN
 
+    # Only the top of the page is searched, in a single pass over all signals
+    return classify_page(page_text, url)
+
+def is_opportunity_expired_centralized(url):
+    """Unified logic to check if an opportunity registration is closed or expired"""
+    return check_opportunity_expiry(url).expired
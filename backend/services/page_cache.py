@@ -0,0 +1,166 @@
+"""
+URL-keyed cache of cleaned page text
+Keeps the cleaned text, status and HTTP validators of fetched pages so the
+scanner, expiry checks and cleanup job don't download and parse the same page
+over and over. Stale entries are revalidated with a conditional GET
+(If-None-Match / If-Modified-Since); a 304 skips both download and parse.
+Bodies are streamed through the incremental extractor in services.html_text,
+which stops reading once max_chars of text (or PAGE_MAX_BYTES) are in.
+A fetch refused by the host limiter (HostThrottled) says nothing about the
+page, so it is raised to the caller instead of being cached as an error.
+"""
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+from services import http_client
+from services.host_limiter import HostThrottled
+from services.html_text import html_to_text, response_text
+from services.scan_metrics import record_fetch
+
+
+def clean_html_text(html, max_chars=None):
+    """Strip noise tags and collapse whitespace into one phrase per line"""
+    return html_to_text(html, max_chars)
+
+
+class CachedPage:
+    """One cached fetch result"""
+
+    def __init__(self, url, status, text='', etag=None, last_modified=None, error=None):
+        self.url = url
+        self.status = status  # 0 when the request itself failed
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.error = error
+        self.fetched_at = time.monotonic()
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 400
+
+    @property
+    def has_validators(self):
+        return bool(self.etag or self.last_modified)
+
+
+class PageCache:
+    """Thread-safe LRU cache of CachedPage entries with TTL and conditional revalidation"""
+
+    def __init__(self, max_entries=2000, ttl=1800, error_ttl=300, max_chars=8000, max_bytes=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.max_chars = max_chars
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'evictions': 0}
+
+    def _is_fresh(self, entry):
+        ttl = self.ttl if entry.ok else self.error_ttl
+        return time.monotonic() - entry.fetched_at < ttl
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _store(self, entry):
+        with self._lock:
+            self._entries[entry.url] = entry
+            self._entries.move_to_end(entry.url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+        return entry
+
+    def peek(self, url):
+        """Return a fresh cached entry without touching the network, or None"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+        if entry is not None and self._is_fresh(entry):
+            return entry
+        return None
+
+    def fetch(self, url, timeout=15):
+        """Return the page for url, downloading or revalidating only when needed"""
+        with self._lock:
+            entry = self._entries.get(url)
+
+        if entry is not None and self._is_fresh(entry):
+            self._count('hits')
+            return entry
+
+        headers = {'User-Agent': http_client.BROWSER_USER_AGENT}
+        if entry is not None and entry.ok:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        kind = 'revalidate' if len(headers) > 1 else 'page'
+        started = time.monotonic()
+        try:
+            with http_client.get(url, headers=headers, timeout=timeout, stream=True, polite=True) as response:
+                status = response.status_code
+                if status == 304 and entry is not None and entry.ok:
+                    record_fetch(url, kind, time.monotonic() - started, status)
+                    self._count('revalidated')
+                    entry.fetched_at = time.monotonic()
+                    return self._store(entry)
+
+                self._count('misses')
+                if not response.ok:
+                    record_fetch(url, kind, time.monotonic() - started, status)
+                    return self._store(CachedPage(url, status, error=f"HTTP {status}"))
+
+                text, _, _ = response_text(response, self.max_chars, self.max_bytes)
+                record_fetch(url, kind, time.monotonic() - started, status)
+                return self._store(CachedPage(
+                    url,
+                    status,
+                    text=text,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified')
+                ))
+        except HostThrottled:
+            raise
+        except Exception as e:
+            record_fetch(url, kind, time.monotonic() - started, 0)
+            self._count('misses')
+            return self._store(CachedPage(url, 0, error=str(e)))
+
+    def invalidate(self, url):
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), max_entries=self.max_entries)
+
+
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache():
+    """Return the process-wide page cache"""
+    global _page_cache
+    if _page_cache is None:
+        with _page_cache_lock:
+            if _page_cache is None:
+                _page_cache = PageCache(
+                    max_entries=Config.PAGE_CACHE_MAX_ENTRIES,
+                    ttl=Config.PAGE_CACHE_TTL_SECONDS,
+                    error_ttl=Config.PAGE_CACHE_ERROR_TTL_SECONDS,
+                    max_chars=Config.PAGE_CACHE_MAX_CHARS,
+                    max_bytes=Config.PAGE_MAX_BYTES
+                )
+    return _page_cache
@@ -0,0 +1,137 @@
+"""
+Keyset pagination, field projection and keyword filters for list endpoints
+Pages are ordered on (sort column, id) and continue from an opaque cursor,
+so fetching page N never scans the N-1 pages before it. A fields= projection
+loads only the requested columns (e.g. skip description in list views).
+Filters run in the query, so pages and cursors only cover matching rows.
+"""
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import load_only
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_KEYWORDS = 20
+KEYWORD_COLUMNS = ('title', 'description', 'skills_required')
+
+
+def parse_fields(raw_fields, Model):
+    """Parse a comma-separated fields= value into column names (None means all columns)"""
+    if not raw_fields:
+        return None
+    allowed = set(Model.__table__.columns.keys())
+    fields = [f.strip() for f in raw_fields.split(',') if f.strip()]
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    if 'id' not in fields:
+        fields.insert(0, 'id')
+    return fields
+
+
+def keyword_filter(raw_keywords, Model):
+    """Condition matching rows whose text columns contain any comma-separated keyword (None if there are none)"""
+    keywords = [k.strip() for k in (raw_keywords or '').split(',') if k.strip()][:MAX_KEYWORDS]
+    if not keywords:
+        return None
+    columns = [getattr(Model, name) for name in KEYWORD_COLUMNS if name in Model.__table__.columns]
+    return or_(*[column.ilike(f'%{keyword}%') for keyword in keywords for column in columns])
+
+
+def parse_limit(raw_limit):
+    """Parse and clamp the page size"""
+    if raw_limit in (None, ''):
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(raw_limit)
+    except (TypeError, ValueError):
+        raise ValueError('limit must be an integer')
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def encode_cursor(sort_value, row_id):
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Return (sort_value, id) from a cursor produced by encode_cursor"""
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        if sort_value is not None:
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, int(row_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
+def load_columns(query, Model, fields):
+    """Restrict a query to the given columns"""
+    if not fields:
+        return query
+    return query.options(load_only(*[getattr(Model, f) for f in fields]))
+
+
+def serialize_row(row, fields=None):
+    """Full to_dict() or just the projected columns, formatted the same way"""
+    if not fields:
+        return row.to_dict()
+    data = {}
+    for field in fields:
+        value = getattr(row, field)
+        data[field] = value.isoformat() if isinstance(value, datetime) else value
+    return data
+
+
+def paginate_keyset(query, Model, sort_column, descending=False, cursor=None, limit=None, fields=None):
+    """Return one page of query ordered on (sort_column, id), NULL sort values last.
+
+    Response shape: {'items': [...], 'next_cursor': str|None, 'has_more': bool, 'limit': int}
+    """
+    limit = parse_limit(limit)
+    sort_attr = getattr(Model, sort_column)
+    id_attr = Model.id
+
+    if cursor:
+        last_value, last_id = decode_cursor(cursor)
+        if last_value is None:
+            # Already inside the trailing NULL block
+            after_id = id_attr < last_id if descending else id_attr > last_id
+            query = query.filter(and_(sort_attr.is_(None), after_id))
+        else:
+            past_value = sort_attr < last_value if descending else sort_attr > last_value
+            after_id = id_attr < last_id if descending else id_attr > last_id
+            query = query.filter(or_(
+                past_value,
+                and_(sort_attr == last_value, after_id),
+                sort_attr.is_(None)
+            ))
+
+    if descending:
+        query = query.order_by(sort_attr.desc().nulls_last(), id_attr.desc())
+    else:
+        query = query.order_by(sort_attr.asc().nulls_last(), id_attr.asc())
+
+    if fields:
+        # The cursor needs the sort column even when the client didn't ask for it
+        query = load_columns(query, Model, list(dict.fromkeys(fields + [sort_column])))
+
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column), last.id)
+
+    return {
+        'items': [serialize_row(row, fields) for row in rows],
+        'next_cursor': next_cursor,
+        'has_more': has_more,
+        'limit': limit
+    }
@@ -0,0 +1,265 @@
+"""
+"Recommended for you" feeds
+Keeps a TF-IDF vector per resume (stacked into one sparse users x features
+matrix) and a top-RECOMMEND_FEED_SIZE list of opportunities per user, both
+built on the shared MatchEngine index. Feeds are maintained incrementally
+from the engine's change log, which holds this process's own changes and
+those other processes committed (picked up by the engine's catalog check):
+- a newly approved opportunity is scored against every resume with one
+  matrix-vector product and only lands in the feeds whose lowest score it beats;
+- a removed opportunity is dropped from the feeds that held it (tracked with
+  a reverse index), and those feeds are refilled on their next read;
+- a resume update re-vectorizes that one user and recomputes their feed.
+A full index rebuild (new IDF weights) resets everything lazily.
+"""
+import bisect
+import threading
+from config import Config
+from models import User
+from services.match_engine import get_match_engine, term_frequencies, VECTORS_AVAILABLE
+
+if VECTORS_AVAILABLE:
+    import numpy as np
+    from scipy import sparse
+
+
+class RecommendationFeed:
+    """Per-user top-k opportunity lists over the match engine's index"""
+
+    def __init__(self, engine, size=100):
+        self.engine = engine
+        self.size = size
+        self._lock = threading.RLock()
+        self._generation = None
+        self._change_seq = 0  # last engine change applied
+        self._loaded = False
+        self._terms = {}     # user_id -> term_frequencies() of the resume (IDF independent)
+        self._vectors = {}   # user_id -> unit vector under the current index generation
+        self._user_ids = []  # row order of _users
+        self._users = None   # stacked _vectors, rebuilt lazily after a change
+        self._feeds = {}     # user_id -> [(-score, key)] ascending, i.e. best first
+        self._members = {}   # key -> user ids whose feed holds it
+        self._partial = set()  # feeds that lost entries and must be refilled before reading
+        self._stats = {'feed_builds': 0, 'incremental_inserts': 0, 'removals': 0, 'resets': 0}
+
+    def _sync(self):
+        """Load resumes on first use and apply the engine's new changes (all of them after a full rebuild)"""
+        index, changes, self._change_seq = self.engine.changes_since(self._change_seq)
+        if not self._loaded:
+            rows = User.query.filter(User.resume_text.isnot(None), User.resume_text != '')\
+                .with_entities(User.id, User.resume_text).all()
+            for user_id, resume_text in rows:
+                self._terms[user_id] = term_frequencies(resume_text)
+            self._loaded = True
+        if index.generation != self._generation or changes is None:
+            if self._generation is not None:
+                self._stats['resets'] += 1
+            self._generation = index.generation
+            self._vectors.clear()
+            self._feeds.clear()
+            self._members.clear()
+            self._partial.clear()
+            self._users = None
+            return index
+        for key, vector in changes:
+            if vector is None:
+                self._remove(key)
+            else:
+                self._upserted(index, key, vector)
+        return index
+
+    def _vector(self, index, user_id):
+        vector = self._vectors.get(user_id)
+        if vector is None:
+            vector = index.vectorize_terms(self._terms[user_id])
+            self._vectors[user_id] = vector
+        return vector
+
+    def _user_matrix(self, index):
+        if self._users is None:
+            self._user_ids = list(self._terms.keys())
+            rows = [self._vector(index, user_id) for user_id in self._user_ids]
+            self._users = sparse.vstack(rows, format='csr') if rows else None
+        return self._users
+
+    def _drop_feed(self, user_id):
+        for _, key in self._feeds.pop(user_id, []):
+            members = self._members.get(key)
+            if members:
+                members.discard(user_id)
+        self._partial.discard(user_id)
+
+    def _build_feed(self, index, user_id):
+        self._drop_feed(user_id)
+        ranked = index.rank(self._vector(index, user_id), limit=self.size)
+        self._feeds[user_id] = [(-score, key) for key, score in ranked]
+        for key, _ in ranked:
+            self._members.setdefault(key, set()).add(user_id)
+        self._stats['feed_builds'] += 1
+
+    def get_feed(self, user_id, resume_loader, limit=20, event_type=None):
+        """Best (key, similarity) pairs for the user, or None when there is no readable resume.
+
+        resume_loader() returns the resume text; it is only called when the
+        user's resume has not been vectorized yet (e.g. link-only resumes).
+        """
+        terms = None
+        with self._lock:
+            self._sync()
+            known = user_id in self._terms
+        if not known:
+            # May download the resume; don't hold up other feeds meanwhile
+            resume_text = resume_loader()
+            if not resume_text:
+                return None
+            terms = term_frequencies(resume_text)
+
+        with self._lock:
+            index = self._sync()
+            if user_id not in self._terms:
+                if terms is None:
+                    # The resume was cleared while we weren't holding the lock
+                    return None
+                self._terms[user_id] = terms
+                self._users = None
+            if user_id not in self._feeds or user_id in self._partial:
+                self._build_feed(index, user_id)
+
+            results = []
+            for negative_score, key in self._feeds[user_id]:
+                if event_type and key[0] != event_type:
+                    continue
+                if not index.is_open(key):
+                    continue
+                results.append((key, -negative_score))
+                if len(results) >= limit:
+                    break
+            return results
+
+    def resume_changed(self, user_id, resume_text):
+        """Re-vectorize one user's resume (None: forget it until the next read) and rebuild their feed"""
+        with self._lock:
+            index = self._sync()
+            self._drop_feed(user_id)
+            self._vectors.pop(user_id, None)
+            self._users = None
+            if resume_text:
+                self._terms[user_id] = term_frequencies(resume_text)
+                self._build_feed(index, user_id)
+            else:
+                self._terms.pop(user_id, None)
+
+    def refresh(self):
+        """Apply the opportunity changes the engine has seen since the last read"""
+        with self._lock:
+            self._sync()
+
+    def _upserted(self, index, key, vector):
+        """Merge one (re)indexed opportunity into every feed it now belongs to"""
+        # A changed opportunity may score differently now; take it out first
+        self._remove(key)
+        users = self._user_matrix(index)
+        if users is None or not index.is_open(key):
+            return
+
+        scores = np.asarray((users @ vector.T).todense()).ravel()
+        floors = np.array([
+            -self._feeds[user_id][-1][0] if len(self._feeds.get(user_id, ())) >= self.size else 0.0
+            for user_id in self._user_ids
+        ])
+        for row in np.flatnonzero(scores > floors):
+            user_id = self._user_ids[row]
+            feed = self._feeds.get(user_id)
+            if feed is None:
+                # Never built: it will be ranked from the updated index on first read
+                continue
+            bisect.insort(feed, (-float(scores[row]), key))
+            self._members.setdefault(key, set()).add(user_id)
+            if len(feed) > self.size:
+                _, dropped = feed.pop()
+                self._members.get(dropped, set()).discard(user_id)
+            self._stats['incremental_inserts'] += 1
+
+    def _remove(self, key):
+        for user_id in self._members.pop(key, ()):
+            feed = self._feeds.get(user_id)
+            if feed is None:
+                continue
+            feed[:] = [entry for entry in feed if entry[1] != key]
+            # The feed may now be missing the item that ranked just below its old cut-off
+            self._partial.add(user_id)
+            self._stats['removals'] += 1
+
+    def get_stats(self):
+        with self._lock:
+            return dict(
+                self._stats,
+                resumes=len(self._terms),
+                feeds=len(self._feeds),
+                feed_size=self.size,
+                generation=self._generation,
+                change_seq=self._change_seq
+            )
+
+
+_feed = None
+_feed_lock = threading.Lock()
+
+
+def get_recommendation_feed():
+    """Return the process-wide feed store, or None when the match engine is unavailable"""
+    global _feed
+    engine = get_match_engine()
+    if engine is None:
+        return None
+    if _feed is None:
+        with _feed_lock:
+            if _feed is None:
+                _feed = RecommendationFeed(engine, size=Config.RECOMMEND_FEED_SIZE)
+    return _feed
+
+
+def opportunity_changed(event_type, event):
+    """Call after committing a change to a hackathon/internship (approval, rejection, edit).
+
+    Approved opportunities are (re)indexed and merged into this process's
+    feeds; any other status takes them out. Other processes pick the change
+    up from the database at their next catalog check. Failures only cost
+    freshness, never the request: that check applies the change here too.
+    """
+    feed = get_recommendation_feed()
+    if feed is None:
+        return
+    key = (event_type, event.id)
+    try:
+        if event.status == 'approved':
+            feed.engine.upsert(event_type, event)
+        else:
+            feed.engine.remove(key)
+        feed.refresh()
+    except Exception as e:
+        print(f"⚠️ [Recommendations] Could not update feeds for {event_type} {event.id}: {e}")
+
+
+def opportunity_deleted(event_type, event_id):
+    """Call after committing the deletion of a hackathon/internship"""
+    feed = get_recommendation_feed()
+    if feed is None:
+        return
+    key = (event_type, event_id)
+    try:
+        feed.engine.remove(key)
+        feed.refresh()
+    except Exception as e:
+        print(f"⚠️ [Recommendations] Could not update feeds for {event_type} {event_id}: {e}")
+
+
+def resume_changed(user_id, resume_text):
+    """Call after committing a resume update (resume_text None for link-only resumes)"""
+    feed = get_recommendation_feed()
+    if feed is None:
+        return
+    try:
+        feed.resume_changed(user_id, resume_text)
+    except Exception as e:
+        print(f"⚠️ [Recommendations] Could not refresh the feed of user {user_id}: {e}")
@@ -0,0 +1,203 @@
+"""
+Resume text for users who only gave a resume_link
+The text extracted from the link is stored in resume_extracts together with
+the source URL, the response's ETag/Last-Modified and a hash of the bytes.
+Matching reads the stored text; once it is older than RESUME_REVALIDATE_HOURS
+the link is revalidated with a conditional GET, and the file is only parsed
+again when the server says it changed (and its bytes really differ).
+Updating the resume drops the stored text so the next match re-fetches it.
+Downloads are streamed into a spooled temp file with a byte cap, and PDFs are
+parsed page by page up to RESUME_MAX_PAGES / RESUME_MAX_CHARS.
+"""
+import hashlib
+import tempfile
+from datetime import datetime, timedelta
+from bs4 import BeautifulSoup
+from config import Config
+from models import db, ResumeExtract
+from services import http_client
+
+# Downloads bigger than this spill from memory to a temp file
+SPOOL_MEMORY_BYTES = 1024 * 1024
+CHUNK_BYTES = 64 * 1024
+# Links that yielded no text, or failed to refetch, are retried after this long instead of RESUME_REVALIDATE_HOURS
+FAILED_RETRY_MINUTES = 15
+
+
+class ResumeFetch:
+    """Outcome of one download of a resume link"""
+
+    def __init__(self, text=None, error=None, etag=None, last_modified=None,
+                 content_hash=None, content_type=None, truncated=False, not_modified=False):
+        self.text = text
+        self.error = error
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_hash = content_hash
+        self.content_type = content_type
+        self.truncated = truncated
+        self.not_modified = not_modified
+
+
+def _pdf_text(file, max_pages, max_chars):
+    """(text, truncated) from a PDF, reading one page at a time and stopping at either cap"""
+    import PyPDF2
+    reader = PyPDF2.PdfReader(file)
+    parts = []
+    total = 0
+    truncated = False
+    for number, page in enumerate(reader.pages):
+        if number >= max_pages:
+            truncated = True
+            break
+        extracted = page.extract_text()
+        if extracted:
+            parts.append(extracted)
+            total += len(extracted)
+        if total >= max_chars:
+            truncated = True
+            break
+    return '\n'.join(parts).strip()[:max_chars], truncated
+
+
+def _html_text(file, max_chars):
+    soup = BeautifulSoup(file.read(), 'html.parser')
+    for script in soup(["script", "style"]):
+        script.extract()
+    text = soup.get_text(separator=' ', strip=True)
+    return text[:max_chars], len(text) > max_chars
+
+
+def fetch_resume(url, previous=None):
+    """Download and extract a resume link.
+
+    previous: the stored ResumeExtract for the same URL, if any. Its
+    validators make the request conditional, and when the server answers 304,
+    or sends the very same bytes, the result has not_modified=True and no text.
+    """
+    headers = {'User-Agent': http_client.BROWSER_USER_AGENT}
+    if previous is not None and previous.text:
+        if previous.etag:
+            headers['If-None-Match'] = previous.etag
+        if previous.last_modified:
+            headers['If-Modified-Since'] = previous.last_modified
+
+    try:
+        with http_client.get(url, headers=headers, timeout=10, stream=True) as response:
+            if response.status_code == 304 and previous is not None and previous.text:
+                return ResumeFetch(not_modified=True)
+            if not response.ok:
+                return ResumeFetch(error=f"HTTP {response.status_code}")
+
+            content_type = response.headers.get('Content-Type', '').lower()
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            declared = response.headers.get('Content-Length')
+            if declared and declared.isdigit() and int(declared) > Config.RESUME_MAX_BYTES:
+                return ResumeFetch(error=f"Resume file is larger than {Config.RESUME_MAX_BYTES // (1024 * 1024)} MB")
+
+            spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+            digest = hashlib.sha256()
+            size = 0
+            for chunk in response.iter_content(CHUNK_BYTES):
+                size += len(chunk)
+                if size > Config.RESUME_MAX_BYTES:
+                    spool.close()
+                    return ResumeFetch(error=f"Resume file is larger than {Config.RESUME_MAX_BYTES // (1024 * 1024)} MB")
+                digest.update(chunk)
+                spool.write(chunk)
+    except Exception as e:
+        print(f"Error fetching URL content: {e}")
+        return ResumeFetch(error=str(e)[:300])
+
+    with spool:
+        content_hash = digest.hexdigest()
+        result = ResumeFetch(etag=etag, last_modified=last_modified,
+                             content_hash=content_hash, content_type=content_type[:100])
+        if previous is not None and previous.text and previous.content_hash == content_hash:
+            result.not_modified = True
+            return result
+
+        spool.seek(0)
+        is_pdf = 'application/pdf' in content_type or spool.read(5) == b'%PDF-'
+        spool.seek(0)
+        try:
+            if is_pdf:
+                text, truncated = _pdf_text(spool, Config.RESUME_MAX_PAGES, Config.RESUME_MAX_CHARS)
+            else:
+                text, truncated = _html_text(spool, Config.RESUME_MAX_CHARS)
+        except Exception as e:
+            print(f"PDF Error: {e}" if is_pdf else f"Error parsing resume page: {e}")
+            result.error = str(e)[:300]
+            return result
+
+        result.text = text or None
+        result.truncated = truncated
+        if not text:
+            result.error = 'No text could be extracted'
+        return result
+
+
+def resolve_resume(user_id, resume_text, resume_link):
+    """Resume text to match with: the pasted text, else the stored extraction of resume_link.
+
+    Returns None when neither yields any text.
+    """
+    if resume_text:
+        return resume_text
+    if not resume_link:
+        return None
+
+    extract = ResumeExtract.query.get(user_id)
+    if extract is not None and extract.source_url != resume_link:
+        extract = None
+    now = datetime.utcnow()
+    if extract is not None and extract.checked_at:
+        # A failed refetch keeps the old text but is retried soon, like a link that never worked
+        trusted_for = timedelta(hours=Config.RESUME_REVALIDATE_HOURS) if extract.text and not extract.error \
+            else timedelta(minutes=FAILED_RETRY_MINUTES)
+        if now - extract.checked_at < trusted_for:
+            return extract.text
+
+    previous_text = extract.text if extract is not None else None
+    fetched = fetch_resume(resume_link, previous=extract)
+    try:
+        if fetched.not_modified:
+            extract.error = None
+            if fetched.content_hash:
+                # Same bytes under new validators
+                extract.etag = fetched.etag
+                extract.last_modified = fetched.last_modified
+        elif fetched.text is None and previous_text:
+            # Keep matching against the last good text until the link works again
+            extract.error = fetched.error
+        else:
+            if extract is None:
+                extract = ResumeExtract.query.get(user_id)
+                if extract is None:
+                    extract = ResumeExtract(user_id=user_id)
+                    db.session.add(extract)
+            extract.source_url = resume_link
+            extract.text = fetched.text
+            extract.error = fetched.error
+            extract.etag = fetched.etag
+            extract.last_modified = fetched.last_modified
+            extract.content_hash = fetched.content_hash
+            extract.content_type = fetched.content_type
+            extract.truncated = fetched.truncated
+            extract.extracted_at = now
+        extract.checked_at = now
+        db.session.commit()
+        return extract.text
+    except Exception as e:
+        # e.g. a concurrent request stored this user's extract first
+        print(f"⚠️ [Resume] Could not store extracted text for user {user_id}: {e}")
+        db.session.rollback()
+        return fetched.text or previous_text
+
+
+def forget_resume(user_id, commit=True):
+    """Drop the stored extraction (call when the user changes their resume)"""
+    ResumeExtract.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+    if commit:
+        db.session.commit()
@@ -0,0 +1,188 @@
+"""
+Per-scan measurements, persisted as scan_runs rows
+A ScanRecorder is active while a scan runs. The scanner marks its stages
+(with stage()), and the network layers report into whichever recorder is
+active: page fetches and link checks (record_fetch) and Gemini requests
+(record_gemini), from any pipeline thread. At most one scan runs per process
+(the job queue keeps a single active scan), so the active recorder is a
+process-wide slot rather than thread-local state.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from models import db, ScanRun
+
+# Slowest URLs kept in a run's fetch stats
+SLOWEST_URLS = 10
+
+_active = None
+_active_lock = threading.Lock()
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+
+def _latency_summary(latencies):
+    ordered = sorted(latencies)
+    return {
+        'p50': _percentile(ordered, 0.5),
+        'p95': _percentile(ordered, 0.95),
+        'max': round(ordered[-1], 3) if ordered else None,
+        'total': round(sum(ordered), 3)
+    }
+
+
+class ScanRecorder:
+    """Thread-safe counters for one scan"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = datetime.utcnow()
+        self._started = time.monotonic()
+        self.stages = []
+        self._stage = None
+        self.dedup_hits = 0
+        self.rows_written = {'hackathon': 0, 'internship': 0}
+        self.fetches = []  # (url, kind, seconds, status)
+        self.gemini = {'requests': 0, 'calls': 0, 'errors': 0, 'latencies': []}
+
+    @contextmanager
+    def stage(self, name, event_type=None):
+        """Time one stage of the scan; dedup hits, candidates and saves are attributed to it"""
+        record = {'name': name, 'event_type': event_type, 'seconds': None,
+                  'candidates': 0, 'dedup_hits': 0, 'saved': 0}
+        self._stage = record
+        started = time.monotonic()
+        try:
+            yield record
+        finally:
+            record['seconds'] = round(time.monotonic() - started, 3)
+            self.stages.append(record)
+            self._stage = None
+
+    def dedup_hit(self):
+        self.dedup_hits += 1
+        if self._stage is not None:
+            self._stage['dedup_hits'] += 1
+
+    def candidates(self, count):
+        if self._stage is not None:
+            self._stage['candidates'] += count
+
+    def saved(self, event_type):
+        self.rows_written[event_type] = self.rows_written.get(event_type, 0) + 1
+        if self._stage is not None:
+            self._stage['saved'] += 1
+
+    def fetch(self, url, kind, seconds, status):
+        with self._lock:
+            self.fetches.append((url, kind, seconds, status))
+
+    def gemini_request(self, called, seconds=None, ok=True):
+        """One scanner request for generated content; called=False when the AI cache answered"""
+        with self._lock:
+            self.gemini['requests'] += 1
+            if called:
+                self.gemini['calls'] += 1
+                self.gemini['latencies'].append(seconds)
+            if not ok:
+                self.gemini['errors'] += 1
+
+    def fetch_stats(self):
+        with self._lock:
+            fetches = list(self.fetches)
+        by_kind = {}
+        for _, kind, seconds, status in fetches:
+            stats = by_kind.setdefault(kind, {'count': 0, 'errors': 0, 'latencies': []})
+            stats['count'] += 1
+            stats['latencies'].append(seconds)
+            if not status or status >= 400:
+                stats['errors'] += 1
+        for stats in by_kind.values():
+            stats.update(_latency_summary(stats.pop('latencies')))
+        slowest = sorted(fetches, key=lambda fetch: fetch[2], reverse=True)[:SLOWEST_URLS]
+        return dict(
+            _latency_summary([fetch[2] for fetch in fetches]),
+            count=len(fetches),
+            errors=sum(stats['errors'] for stats in by_kind.values()),
+            by_kind=by_kind,
+            slowest=[{'url': url, 'kind': kind, 'seconds': round(seconds, 3), 'status': status}
+                     for url, kind, seconds, status in slowest]
+        )
+
+    def gemini_stats(self):
+        with self._lock:
+            gemini = dict(self.gemini, latencies=list(self.gemini['latencies']))
+        latencies = gemini.pop('latencies')
+        gemini['cache_hits'] = gemini['requests'] - gemini['calls']
+        gemini['latency'] = _latency_summary(latencies)
+        return gemini
+
+    @property
+    def duration_seconds(self):
+        return round(time.monotonic() - self._started, 3)
+
+
+@contextmanager
+def recording():
+    """Make a new recorder the active one for the duration of a scan"""
+    global _active
+    recorder = ScanRecorder()
+    with _active_lock:
+        _active = recorder
+    try:
+        yield recorder
+    finally:
+        with _active_lock:
+            if _active is recorder:
+                _active = None
+
+
+def active_recorder():
+    return _active
+
+
+def record_fetch(url, kind, seconds, status):
+    """Report one network fetch (status 0 for connection errors) to the running scan, if any"""
+    recorder = _active
+    if recorder is not None:
+        recorder.fetch(url, kind, seconds, status)
+
+
+def record_gemini(called, seconds=None, ok=True):
+    recorder = _active
+    if recorder is not None:
+        recorder.gemini_request(called, seconds, ok)
+
+
+def start_run():
+    """Insert the scan_runs row for a scan that is starting"""
+    run = ScanRun(status='running', started_at=datetime.utcnow())
+    db.session.add(run)
+    db.session.commit()
+    return run.id
+
+
+def finish_run(run_id, recorder, status, error=None):
+    """Store the recorder's measurements on the run (own transaction; the scan's is done by now)"""
+    run = ScanRun.query.get(run_id)
+    if run is None:
+        return None
+    run.status = status
+    run.error = error[:2000] if error else None
+    run.finished_at = datetime.utcnow()
+    run.duration_seconds = recorder.duration_seconds
+    run.new_hackathons = recorder.rows_written.get('hackathon', 0)
+    run.new_internships = recorder.rows_written.get('internship', 0)
+    run.rows_written = run.new_hackathons + run.new_internships
+    run.dedup_hits = recorder.dedup_hits
+    run.stages = json.dumps(recorder.stages)
+    run.fetch_stats = json.dumps(recorder.fetch_stats())
+    run.gemini_stats = json.dumps(recorder.gemini_stats())
+    db.session.commit()
+    return run
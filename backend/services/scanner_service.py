@@ -1,6 +1,6 @@
 
 import os
-import requests
+from services import http_client
 import json
 from datetime import datetime, timedelta
 from models import db, Hackathon, Internship
@@ -31,7 +31,7 @@ class AIScannerService:
         try:
             print(f"🔍 Searching Google for: {query}")
             self.log(f"Searching Google: {query}")
-            response = requests.get(url, params=params)
+            response = http_client.get(url, params=params)
             
             if response.status_code != 200:
                 error_data = response.json() if response.content else {"error": {"message": "Empty response"}}
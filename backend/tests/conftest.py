@@ -0,0 +1,126 @@
+"""
+Shared fixtures: an in-memory SQLite app with the API blueprints, and a local
+HTTP server for code that fetches pages.
+
+    cd backend && pip install -r requirements-dev.txt && python -m pytest
+"""
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+# Point the models at a throwaway database before anything creates an engine
+Config.SQLALCHEMY_DATABASE_URI = 'sqlite://'
+Config.SQLALCHEMY_ENGINE_OPTIONS = {}
+Config.JOB_WORKER_EMBEDDED = False
+
+
+@pytest.fixture(autouse=True)
+def fast_host_limiter(monkeypatch):
+    """A per-test host limiter that doesn't make local requests wait"""
+    from services import host_limiter
+    limiter = host_limiter.HostLimiter(rate=1000, burst=1000, max_wait=5)
+    monkeypatch.setattr(host_limiter, '_host_limiter', limiter)
+    return limiter
+
+
+@pytest.fixture
+def app():
+    from flask_jwt_extended import JWTManager
+    from models import db
+    from worker import create_worker_app
+    from routes.hackathons import hackathons_bp
+    from routes.internships import internships_bp
+    from routes.admin import admin_bp
+    from routes.notifications import notifications_bp
+    from routes.scanner import scanner_bp
+    from routes.tracker import tracker_bp
+    from routes.applications import applications_bp
+
+    app = create_worker_app()
+    app.config['TESTING'] = True
+    JWTManager(app)
+    app.register_blueprint(hackathons_bp, url_prefix='/api/hackathons')
+    app.register_blueprint(internships_bp, url_prefix='/api/internships')
+    app.register_blueprint(admin_bp, url_prefix='/api/admin')
+    app.register_blueprint(notifications_bp, url_prefix='/api/notifications')
+    app.register_blueprint(scanner_bp, url_prefix='/api/scanner')
+    app.register_blueprint(tracker_bp, url_prefix='/api/tracker')
+    app.register_blueprint(applications_bp, url_prefix='/api/applications')
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    """make_user(role='participant') -> (user, Authorization headers)"""
+    from flask_jwt_extended import create_access_token
+    from models import db, User
+
+    def make(role='participant'):
+        count = User.query.count()
+        user = User(username=f'user{count}', email=f'user{count}@example.com', role=role)
+        db.session.add(user)
+        db.session.commit()
+        token = create_access_token(identity=str(user.id))
+        return user, {'Authorization': f'Bearer {token}'}
+    return make
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so the client's pooled connections can be reused
+
+    def _respond(self, with_body):
+        route = self.server.routes.get(self.path)
+        self.server.hits.append((self.command, self.path, dict(self.headers)))
+        if route is None:
+            status, headers, body = 404, {}, b'not found'
+        else:
+            status, headers, body = route(self) if callable(route) else route
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if with_body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond(True)
+
+    def do_HEAD(self):
+        self._respond(False)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    """A local server; set server.routes[path] = (status, headers, body) or a callable(handler)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.routes = {}
+    server.hits = []
+    server.page_hits = lambda: [hit for hit in server.hits if hit[1] != '/robots.txt']
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
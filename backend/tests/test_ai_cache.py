@@ -0,0 +1,74 @@
+import pytest
+
+from models import db, AICacheEntry
+from services import ai_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_queues(monkeypatch):
+    monkeypatch.setattr(ai_cache, '_pending_hits', {})
+    monkeypatch.setattr(ai_cache, '_pending_stores', {})
+    monkeypatch.setattr(ai_cache, '_stores_since_evict', 0)
+
+
+def test_make_cache_key_ignores_whitespace_but_not_version():
+    key = ai_cache.make_cache_key('analyze-v1:2026-10-17', 'Title:  Foo\n\nBar ')
+    assert key == ai_cache.make_cache_key('analyze-v1:2026-10-17', 'Title: Foo Bar')
+    assert key != ai_cache.make_cache_key('analyze-v1:2026-10-18', 'Title: Foo Bar')
+
+
+def test_cached_generate_calls_model_once(app):
+    calls = []
+
+    def generate(prompt):
+        calls.append(prompt)
+        return '{"name": "Foo"}'
+
+    first = ai_cache.cached_generate('v1', 'input', 'prompt', generate)
+    second = ai_cache.cached_generate('v1', 'input', 'prompt', generate)
+    assert first == second == '{"name": "Foo"}'
+    assert len(calls) == 1
+
+
+def test_non_json_answers_are_not_stored(app):
+    calls = []
+    ai_cache.cached_generate('v1', 'other', 'prompt', lambda p: calls.append(p) or 'sorry')
+    ai_cache.cached_generate('v1', 'other', 'prompt', lambda p: calls.append(p) or 'sorry')
+    assert len(calls) == 2
+
+
+def test_stores_and_hits_are_written_only_on_flush(app):
+    ai_cache.store_response('v1', 'page', '{"ok": true}')
+    key = ai_cache.make_cache_key('v1', 'page')
+
+    assert ai_cache.get_cached_response('v1', 'page') == '{"ok": true}'  # served before it is written
+    assert ai_cache.get_cached_response('v1', 'page') == '{"ok": true}'
+    assert db.session.get(AICacheEntry, key) is None
+
+    assert ai_cache.flush() == 1
+    db.session.commit()
+    db.session.expire_all()
+    assert db.session.get(AICacheEntry, key).hits == 2
+
+    assert ai_cache.get_cached_response('v1', 'page') == '{"ok": true}'
+    assert ai_cache.flush() == 1
+    db.session.commit()
+    db.session.expire_all()
+    assert db.session.get(AICacheEntry, key).hits == 3
+    assert ai_cache.flush() == 0
+
+
+def test_flush_evicts_every_evict_every_stores(app, monkeypatch):
+    monkeypatch.setattr(ai_cache.Config, 'AI_CACHE_MAX_ENTRIES', 2)
+    monkeypatch.setattr(ai_cache, 'EVICT_EVERY', 3)
+    for name in ('a', 'b'):
+        ai_cache.store_response('v1', name, '{}')
+    ai_cache.flush()
+    db.session.commit()
+    assert AICacheEntry.query.count() == 2
+
+    ai_cache.store_response('v1', 'c', '{}')
+    ai_cache.flush()
+    db.session.commit()
+    assert AICacheEntry.query.count() == 2
+    assert ai_cache.get_cached_response('v1', 'a') is None  # least recently used
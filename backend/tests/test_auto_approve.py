@@ -0,0 +1,44 @@
+import pytest
+
+from models import db, AppSetting, Hackathon, Internship
+from routes import admin, scanner
+
+
+@pytest.fixture
+def changed(monkeypatch):
+    calls = []
+    record = lambda event_type, event: calls.append((event_type, event.id, event.status))
+    monkeypatch.setattr(admin, 'opportunity_changed', record)
+    monkeypatch.setattr(scanner, 'opportunity_changed', record)
+    return calls
+
+
+def add_pending():
+    db.session.add(Hackathon(title='Open', description='d', location='Online', status='pending',
+                             registration_link='https://example.com/open'))
+    db.session.add(Hackathon(title='Closed', description='d', location='Online', status='pending',
+                             registration_link='https://example.com/closed'))
+    db.session.add(Internship(title='Intern', company='Acme', description='d', location='Remote',
+                              status='pending', application_link='https://example.com/intern'))
+    db.session.commit()
+
+
+def test_admin_auto_approve_refreshes_every_changed_row(client, make_user, changed, monkeypatch):
+    add_pending()
+    monkeypatch.setattr(admin, 'is_opportunity_expired_centralized', lambda url: url.endswith('/closed'))
+    _, headers = make_user('admin')
+
+    response = client.post('/api/admin/auto-approve', headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()['hackathons_count'] == 1
+    assert sorted((kind, status) for kind, _, status in changed) == [
+        ('hackathon', 'approved'), ('hackathon', 'rejected'), ('internship', 'approved')]
+
+
+def test_scheduled_auto_approve_refreshes_approved_rows(app, changed):
+    add_pending()
+    AppSetting.set('auto_approve_enabled', 'true')
+
+    scanner.auto_approve_oldest_5(app)
+    assert [(kind, status) for kind, _, status in changed] == [
+        ('hackathon', 'approved'), ('hackathon', 'approved'), ('internship', 'approved')]
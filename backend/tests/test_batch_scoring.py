@@ -0,0 +1,125 @@
+import json
+import time
+
+import pytest
+
+from models import db, Hackathon, TrackedEvent
+from services import match_jobs, match_service
+from services.match_jobs import MatchJobRunner
+from services.match_service import MatchService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(match_service, 'SDK_AVAILABLE', False)
+    return MatchService('key')
+
+
+def opportunities(count):
+    return [(i, {'title': f'Role {i}', 'description': 'Python and React', 'company': 'Acme'})
+            for i in range(1, count + 1)]
+
+
+def test_one_prompt_scores_every_item(service, monkeypatch):
+    prompts = []
+
+    def generate(prompt):
+        prompts.append(prompt)
+        return '```json\n' + json.dumps({'matches': [
+            {'id': 1, 'score': 91, 'explanation': 'Strong'},
+            {'id': 2, 'score': 140, 'explanation': 'Clamped'},
+            {'id': 3, 'score': 10, 'explanation': 'Weak'},
+        ]}) + '\n```'
+
+    monkeypatch.setattr(service, 'generate_content', generate)
+    results = service.calculate_scores_batch('Python developer', opportunities(3))
+    assert len(prompts) == 1
+    assert prompts[0].count('Python developer') == 1
+    assert results == {1: (91, 'Strong'), 2: (100, 'Clamped'), 3: (10, 'Weak')}
+
+
+def test_items_missing_from_the_answer_are_scored_alone(service, monkeypatch):
+    monkeypatch.setattr(service, 'generate_content',
+                        lambda prompt: '{"matches": [{"id": 1, "score": 70, "explanation": "ok"}]}')
+    single = []
+    monkeypatch.setattr(service, 'calculate_score', lambda resume, details: single.append(details['title']) or (5, 'alone'))
+    results = service.calculate_scores_batch('resume', opportunities(2))
+    assert results == {1: (70, 'ok'), 2: (5, 'alone')}
+    assert single == ['Role 2']
+
+
+def test_failed_generation_falls_back_to_keywords(service, monkeypatch):
+    monkeypatch.setattr(service, 'generate_content', lambda prompt: '')
+    monkeypatch.setattr(service, 'calculate_score', lambda *a: pytest.fail('should not retry per item'))
+    results = service.calculate_scores_batch('python react', opportunities(2))
+    assert set(results) == {1, 2}
+
+
+def test_no_resume_short_circuits(service):
+    results = service.calculate_scores_batch('', opportunities(2))
+    assert all(score == 0 for score, _ in results.values())
+
+
+def test_job_runner_batches_and_saves(app, make_user, monkeypatch):
+    user, _ = make_user()
+    hackathon = Hackathon(title='H', description='d', location='Online')
+    db.session.add(hackathon)
+    db.session.flush()
+    tracked = [TrackedEvent(user_id=user.id, event_type='hackathon', event_id=hackathon.id) for _ in range(5)]
+    db.session.add_all(tracked)
+    db.session.commit()
+    ids = [item.id for item in tracked]
+
+    batches = []
+
+    class FakeService:
+        def calculate_scores_batch(self, resume_text, batch):
+            batches.append([key for key, _ in batch])
+            return {key: (50 + key % 10, 'fine') for key, _ in batch}
+
+    monkeypatch.setattr(match_jobs, 'get_match_service', lambda: FakeService())
+    monkeypatch.setattr(match_jobs, 'resolve_resume', lambda user_id, text, link: text)
+
+    runner = MatchJobRunner(batch_size=2, concurrency=2)
+    job, created = runner.start(app, user.id, 'resume', None, [(i, {'title': 'H'}) for i in ids])
+    assert created
+
+    deadline = time.monotonic() + 5
+    while job.active and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.status == 'done', job.error
+    assert sorted(len(batch) for batch in batches) == [1, 2, 2]
+    db.session.expire_all()
+    assert {item.match_score for item in TrackedEvent.query.all()} == {50 + i % 10 for i in ids}
+    assert runner.get(job.id, user.id + 1) is None
+
+
+def test_failed_batch_keeps_the_other_scores(app, make_user, monkeypatch):
+    user, _ = make_user()
+    hackathon = Hackathon(title='H', description='d', location='Online')
+    db.session.add(hackathon)
+    db.session.flush()
+    tracked = [TrackedEvent(user_id=user.id, event_type='hackathon', event_id=hackathon.id) for _ in range(4)]
+    db.session.add_all(tracked)
+    db.session.commit()
+    ids = [item.id for item in tracked]
+
+    class FlakyService:
+        def calculate_scores_batch(self, resume_text, batch):
+            if ids[0] in [key for key, _ in batch]:
+                raise RuntimeError('model unavailable')
+            return {key: (70, 'fine') for key, _ in batch}
+
+    monkeypatch.setattr(match_jobs, 'get_match_service', lambda: FlakyService())
+    monkeypatch.setattr(match_jobs, 'resolve_resume', lambda user_id, text, link: text)
+
+    job, _ = MatchJobRunner(batch_size=2, concurrency=2).start(
+        app, user.id, 'resume', None, [(i, {'title': 'H'}) for i in ids])
+    deadline = time.monotonic() + 5
+    while job.active and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.status == 'partial'
+    assert sorted(job.failed_ids) == ids[:2]
+    assert 'model unavailable' in job.error
+    db.session.expire_all()
+    assert [db.session.get(TrackedEvent, i).match_score for i in ids] == [None, None, 70, 70]
@@ -0,0 +1,49 @@
+import pytest
+
+from models import db, Internship
+from services.dedup_index import DedupIndex, canonical_url, normalize_title, title_hash
+
+
+@pytest.mark.parametrize('title', [
+    'ETHIndia 2026 | Devfolio',
+    'ETHIndia 2026 - Unstop',
+    'ethindia   2026',
+    'ETHIndia 2026 | Devfolio - LinkedIn',
+    'ETHIndia, 2026!',
+])
+def test_platform_suffixes_and_punctuation_collapse(title):
+    assert normalize_title(title) == 'ethindia 2026'
+
+
+def test_empty_title_has_no_hash():
+    assert title_hash('  | ') is None
+
+
+def test_canonical_url_drops_scheme_www_tracking_and_slash():
+    assert canonical_url('https://www.Devfolio.co/hack/?utm_source=x&ref=abc&b=2&a=1#top') == 'devfolio.co/hack?a=1&b=2'
+    assert canonical_url('http://devfolio.co/hack') == 'devfolio.co/hack'
+    assert canonical_url('not a url') is None
+
+
+def test_claim_rejects_repeats_by_title_or_url():
+    index = DedupIndex()
+    assert index.claim('Smart Hack 2026', url='https://a.com/x')
+    assert not index.claim('Smart Hack 2026 | Devpost')
+    assert not index.claim('A different name', url='https://www.a.com/x/?utm_medium=mail')
+    assert index.contains('') == 'title'
+
+
+def test_internships_are_keyed_by_company():
+    index = DedupIndex(track_company=True)
+    assert index.claim('SDE Intern', company='Acme')
+    assert index.claim('SDE Intern', company='Globex')
+    assert index.contains('SDE Intern', company='ACME') == 'title+company'
+
+
+def test_load_reads_existing_rows(app):
+    db.session.add(Internship(title='Data Intern', company='Acme', description='d', location='Remote',
+                              application_link='https://jobs.acme.com/1'))
+    db.session.commit()
+    index = DedupIndex.load(Internship, 'application_link', 'company')
+    assert index.contains('Data Intern', company='Acme') == 'title+company'
+    assert index.contains('Other', url='http://jobs.acme.com/1/') == 'url'
@@ -0,0 +1,39 @@
+from services.expiry_classifier import ExpiryClassifier, classify_page
+
+
+def test_open_page_without_anchor_words():
+    verdict = classify_page('Register now\nPrizes worth $10,000', 'https://example.com/h')
+    assert not verdict
+    assert verdict.signal is None
+
+
+def test_generic_signal_names_the_match():
+    verdict = classify_page('Hackathon\nRegistrations are closed.\nSee you next year', 'https://example.com/h')
+    assert verdict.expired
+    assert verdict.signal == 'registration_closed'
+    assert verdict.snippet == 'registrations are closed'
+
+
+def test_domain_pack_applies_only_to_its_hosts():
+    text = 'This hackathon has ended'
+    assert classify_page(text, 'https://foo.devfolio.co/').signal == 'devfolio_hackathon_ended'
+    assert not classify_page(text, 'https://example.com/')
+    assert ExpiryClassifier().pack_for('https://www.unstop.com/hackathons/x') == 'unstop'
+
+
+def test_pack_signals_match_whole_words_only():
+    assert not classify_page('Registration Overview\nPrizes', 'https://unstop.com/hackathons/x')
+    assert classify_page('Registrations are over', 'https://unstop.com/hackathons/x').signal == \
+        'unstop_registrations_over'
+    assert not classify_page('Applications closedown notes', 'https://foo.devfolio.co/')
+    assert classify_page('Applications have closed', 'https://foo.devfolio.co/').expired
+
+
+def test_earliest_match_wins():
+    text = 'Applications are closed. This opportunity has expired.'
+    assert classify_page(text).signal == 'applications_closed'
+
+
+def test_only_the_top_of_the_page_is_scanned():
+    classifier = ExpiryClassifier(scan_chars=50)
+    assert not classifier.classify('x' * 100 + ' registrations closed')
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import db, Hackathon
+from services import link_health, page_cache
+from services.expiry_sweeper import ExpirySweeper, next_check_at
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    monkeypatch.setattr(page_cache, '_page_cache', page_cache.PageCache())
+    monkeypatch.setattr(link_health, '_link_health', link_health.LinkHealth())
+
+
+def add(link, **values):
+    hackathon = Hackathon(title=link, description='d', location='Online', status='approved',
+                          registration_link=link, **values)
+    db.session.add(hackathon)
+    db.session.commit()
+    return hackathon.id
+
+
+def sweep(app, full=False):
+    result = ExpirySweeper(app, max_workers=2).run(full=full)
+    db.session.expire_all()
+    return result
+
+
+def test_next_check_follows_the_deadline():
+    now = datetime(2026, 1, 1)
+    assert next_check_at(now + timedelta(days=1), now) == now + timedelta(hours=6)
+    assert next_check_at(None, now) == now + timedelta(days=3)
+
+
+def test_closed_page_expires_and_open_page_is_rescheduled(app, http_server):
+    http_server.routes['/open'] = (200, {}, '<p>Register now</p>')
+    http_server.routes['/closed'] = (200, {}, '<p>Registrations are closed</p>')
+    open_id = add(http_server.url + '/open')
+    closed_id = add(http_server.url + '/closed')
+    past_id = add(http_server.url + '/open?past', deadline=datetime.utcnow() - timedelta(days=1))
+
+    result = sweep(app)
+    assert result['expired_ids']['hackathon'] == [past_id, closed_id]
+    assert result['signals'] == {'registration_closed': 1}
+    opened = db.session.get(Hackathon, open_id)
+    assert opened.status == 'approved'
+    assert opened.expiry_checked_at is not None
+    assert opened.next_expiry_check_at > datetime.utcnow() + timedelta(days=2)
+
+
+def test_unfetched_page_stays_due_without_a_check(app, http_server):
+    http_server.routes['/down'] = (500, {}, 'error')
+    item_id = add(http_server.url + '/down')
+
+    result = sweep(app)
+    assert result['not_checked'] == 1
+    item = db.session.get(Hackathon, item_id)
+    assert item.status == 'approved'
+    assert item.expiry_checked_at is None
+    assert item.next_expiry_check_at < datetime.utcnow() + timedelta(hours=1)
+
+
+def test_dead_link_expires_only_on_the_second_dead_check(app, http_server):
+    item_id = add(http_server.url + '/gone')
+
+    result = sweep(app)
+    assert result['dead_unconfirmed'] == 1
+    item = db.session.get(Hackathon, item_id)
+    assert item.status == 'approved'
+    assert item.link_dead_at is not None
+
+    hits = len(http_server.page_hits())
+    result = sweep(app, full=True)
+    assert len(http_server.page_hits()) > hits  # confirmed against the server, not the caches
+    assert result['signals'] == {'link_dead': 1}
+    assert db.session.get(Hackathon, item_id).status == 'expired'
+
+
+def test_dead_link_that_comes_back_is_cleared(app, http_server):
+    item_id = add(http_server.url + '/flaky')
+    sweep(app)
+    assert db.session.get(Hackathon, item_id).link_dead_at is not None
+
+    http_server.routes['/flaky'] = (200, {}, '<p>Register now</p>')
+    sweep(app, full=True)
+    item = db.session.get(Hackathon, item_id)
+    assert item.status == 'approved'
+    assert item.link_dead_at is None
+
+
+def test_throttled_host_leaves_the_item_due(app, http_server, fast_host_limiter):
+    item_id = add(http_server.url + '/busy')
+    fast_host_limiter.report(http_server.url, 429, '60')
+
+    result = sweep(app)
+    assert result['not_checked'] == 1
+    assert http_server.page_hits() == []
+    item = db.session.get(Hackathon, item_id)
+    assert (item.status, item.expiry_checked_at, item.link_dead_at) == ('approved', None, None)
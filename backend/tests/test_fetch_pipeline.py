@@ -0,0 +1,49 @@
+import threading
+import time
+
+from services.fetch_pipeline import FetchPipeline, domain_of
+
+
+def test_domain_of_strips_www_and_case():
+    assert domain_of('https://WWW.Devpost.com/hackathons') == 'devpost.com'
+    assert domain_of('') == ''
+    assert domain_of(None) == ''
+
+
+def test_map_unordered_returns_every_item():
+    pipeline = FetchPipeline(max_workers=4)
+    results = dict(pipeline.map_unordered(lambda n: n * n, range(10), lambda n: f'https://h{n}.com/'))
+    assert results == {n: n * n for n in range(10)}
+
+
+def test_failed_task_yields_none():
+    def work(n):
+        if n == 3:
+            raise ValueError('boom')
+        return n
+
+    results = dict(FetchPipeline(max_workers=4).map_unordered(work, range(5), lambda n: f'https://h{n}.com/'))
+    assert results[3] is None
+    assert results[4] == 4
+
+
+def test_per_domain_limit_caps_concurrency():
+    lock = threading.Lock()
+    running = {'now': 0, 'peak': 0}
+
+    def work(n):
+        with lock:
+            running['now'] += 1
+            running['peak'] = max(running['peak'], running['now'])
+        time.sleep(0.02)
+        with lock:
+            running['now'] -= 1
+        return n
+
+    pipeline = FetchPipeline(max_workers=8, per_domain_limit=2)
+    list(pipeline.map_unordered(work, range(8), lambda n: 'https://same-host.com/page'))
+    assert running['peak'] <= 2
+
+
+def test_empty_batch_yields_nothing():
+    assert list(FetchPipeline().map_unordered(lambda n: n, [])) == []
@@ -0,0 +1,90 @@
+import threading
+import time
+from email.utils import formatdate
+
+import pytest
+
+from services.host_limiter import HostLimiter, HostThrottled, parse_crawl_delay, retry_after_seconds
+
+
+def test_retry_after_seconds():
+    assert retry_after_seconds('120') == 120.0
+    assert retry_after_seconds(formatdate(time.time() - 60, usegmt=True)) == 0.0
+    assert 50 < retry_after_seconds(formatdate(time.time() + 60, usegmt=True)) <= 60
+    assert retry_after_seconds('soon') is None
+    assert retry_after_seconds(None) is None
+
+
+def test_parse_crawl_delay_prefers_our_agent():
+    robots = """
+User-agent: Googlebot
+Crawl-delay: 10
+
+User-agent: *
+Disallow: /private
+Crawl-delay: 2  # everyone else
+
+User-agent: Mozilla
+User-agent: Other
+Crawl-delay: 0.5
+"""
+    assert parse_crawl_delay(robots, 'Mozilla/5.0 (X11; Linux x86_64)') == 0.5
+    assert parse_crawl_delay(robots, 'SomeBot/1.0') == 2.0
+    assert parse_crawl_delay('User-agent: *\nDisallow: /', 'x') is None
+
+
+def test_burst_then_throttled(http_server):
+    limiter = HostLimiter(rate=10, burst=2, max_wait=0.05)
+    url = http_server.url + '/page'
+    limiter.acquire(url)
+    limiter.acquire(url)
+    with pytest.raises(HostThrottled):
+        limiter.acquire(url)
+    host = limiter.get_stats()['hosts'][0]
+    assert (host['requests'], host['throttled']) == (2, 1)
+
+
+def test_robots_is_fetched_and_read_for_the_same_agent(http_server):
+    http_server.routes['/robots.txt'] = lambda handler: (
+        200, {}, 'User-agent: *\nCrawl-delay: 60\n\nUser-agent: Mozilla\nCrawl-delay: 0.5\n')
+    limiter = HostLimiter(rate=10, burst=5, max_wait=5)
+    limiter.acquire(http_server.url + '/page')
+
+    robots_hit = next(hit for hit in http_server.hits if hit[1] == '/robots.txt')
+    assert robots_hit[2]['User-Agent'] == limiter.user_agent
+    host = limiter.get_stats()['hosts'][0]
+    assert (host['crawl_delay'], host['rate_per_second']) == (0.5, 2.0)
+
+
+def test_backoff_blocks_the_host_until_retry_after(http_server):
+    limiter = HostLimiter(rate=100, burst=5, max_wait=1)
+    url = http_server.url + '/page'
+    limiter.acquire(url)
+    limiter.report(url, 429, '30')
+    with pytest.raises(HostThrottled):
+        limiter.acquire(url)
+
+
+def test_callers_woken_by_a_backoff_resume_one_slot_apart(http_server):
+    limiter = HostLimiter(rate=2, burst=2, max_wait=5)
+    url = http_server.url + '/page'
+    limiter.acquire(url)
+    limiter.acquire(url)  # bucket empty: the next slots are 0.5s and 1s away
+
+    started = time.monotonic()
+    resumed = []
+    waiters = []
+    for _ in range(2):
+        waiter = threading.Thread(target=lambda: (limiter.acquire(url), resumed.append(time.monotonic() - started)))
+        waiter.start()
+        waiters.append(waiter)
+        time.sleep(0.02)
+    time.sleep(0.1)
+    limiter.report(url, 503, '1')  # blocks the host until ~1.1s, voiding both reservations
+    for waiter in waiters:
+        waiter.join(5)
+
+    # The first resumes as the backoff ends, the second one slot (0.5s) later: no slot lost, no burst
+    first, second = sorted(resumed)
+    assert 1.0 <= first < 1.4
+    assert 1.5 <= second < 1.9
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from services.html_text import CHUNK_BYTES, TextExtractor, html_to_text, response_text
+
+pytest.importorskip('bs4')
+from benchmarks.bench_html_text import generate_page, legacy_clean_html_text  # noqa: E402
+
+
+PAGES = [
+    '<html><head><title>T</title><style>p{}</style></head><body><p>Hello  world</p>\n<p> Bye </p></body></html>',
+    '<div><script>var a = "<p>no</p>";</script><nav>Menu</nav>Text &amp; more<footer>F</footer></div>',
+    'plain text\r\nsecond line\n\n\nthird',
+    '<p>split across</p><p>nodes</p><br>tail without newline',
+]
+
+
+@pytest.mark.parametrize('html', PAGES)
+def test_matches_the_beautifulsoup_version(html):
+    assert html_to_text(html) == legacy_clean_html_text(html)
+
+
+def test_matches_on_generated_listing_pages():
+    rng = random.Random(3)
+    for _ in range(3):
+        html = generate_page(rng, rng.randint(50, 200))
+        assert html_to_text(html, 4000) == legacy_clean_html_text(html, 4000)
+
+
+def test_budget_stops_parsing_early():
+    extractor = TextExtractor(max_chars=20)
+    extractor.feed('<p>' + 'word ' * 10 + '</p>\n' * 2 + '<p>more</p>\n')
+    assert extractor.done
+    assert len(extractor.text()) == 20
+
+
+class FakeResponse:
+    def __init__(self, body, encoding='utf-8'):
+        self.body = body
+        self.encoding = encoding
+        self.chunks_read = 0
+
+    def iter_content(self, size):
+        for start in range(0, len(self.body), size):
+            self.chunks_read += 1
+            yield self.body[start:start + size]
+
+
+def test_response_text_stops_reading_once_the_budget_is_full():
+    body = ('<p>café line</p>\n' * 20000).encode('utf-8')
+    response = FakeResponse(body)
+    text, size, truncated = response_text(response, max_chars=100)
+    assert truncated
+    assert text == legacy_clean_html_text(body.decode('utf-8'), 100)
+    assert text.endswith('\n')  # the budget ends right after a line
+    assert size < len(body)
+    assert response.chunks_read == 1
+
+
+def test_response_text_caps_bytes():
+    body = b'<script>' + b'x' * (CHUNK_BYTES * 4) + b'</script><p>late</p>'
+    text, size, truncated = response_text(FakeResponse(body), max_bytes=CHUNK_BYTES * 2)
+    assert truncated
+    assert size == CHUNK_BYTES * 2
+    assert text == ''
+
+
+def test_response_text_reads_short_bodies_fully():
+    text, size, truncated = response_text(FakeResponse(b'<p>one</p><p>two</p>', encoding=None))
+    assert (text, size, truncated) == ('onetwo', 20, False)
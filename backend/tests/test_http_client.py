@@ -0,0 +1,26 @@
+from services import http_client
+
+
+def test_session_is_shared():
+    assert http_client.get_session() is http_client.get_session()
+
+
+def test_session_does_not_keep_cookies(http_server):
+    http_server.routes['/login'] = (200, {'Set-Cookie': 'sid=secret; Path=/'}, 'ok')
+    http_server.routes['/next'] = lambda handler: (200, {}, handler.headers.get('Cookie') or '')
+
+    first = http_client.get(http_server.url + '/login')
+    assert first.status_code == 200
+    second = http_client.get(http_server.url + '/next')
+    assert second.text == ''
+    assert len(http_client.get_session().cookies) == 0
+
+
+def test_stats_count_reused_connections(http_server):
+    http_server.routes['/page'] = (200, {}, 'hello')
+    for _ in range(3):
+        assert http_client.get(http_server.url + '/page').text == 'hello'
+    stats = http_client.get_stats()
+    host = next(h for h in stats['hosts'] if h['host'].endswith(f":{http_server.server_address[1]}"))
+    assert host['requests'] == 3
+    assert host['reused_connections'] >= 2  # one connection, kept alive for the next two requests
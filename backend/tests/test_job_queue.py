@@ -0,0 +1,79 @@
+import json
+from datetime import datetime, timedelta
+
+from models import db, BackgroundJob
+from services.job_queue import JobWorker, active_job, enqueue, job_handler
+
+runs = []
+
+
+@job_handler('test_echo')
+def echo(payload):
+    runs.append(payload)
+    return {'echo': payload.get('value')}
+
+
+@job_handler('test_flaky')
+def flaky(payload):
+    raise RuntimeError('boom')
+
+
+def make_worker(app, worker_id='w1', kinds=('test_echo', 'test_flaky')):
+    return JobWorker(app, worker_id=worker_id, kinds=list(kinds), lease_seconds=60, heartbeat_seconds=30,
+                     retry_base_seconds=60)
+
+
+def reload(job_id):
+    db.session.expire_all()  # the worker ran in its own app context and session
+    return db.session.get(BackgroundJob, job_id)
+
+
+def test_enqueue_keeps_one_active_job_per_kind(app):
+    job, created = enqueue('test_echo', {'value': 1})
+    again, created_again = enqueue('test_echo', {'value': 2})
+    assert created and not created_again
+    assert again.id == job.id
+    assert active_job('test_echo').id == job.id
+
+
+def test_worker_runs_job_and_frees_the_kind(app):
+    runs.clear()
+    job, _ = enqueue('test_echo', {'value': 7})
+    worker = make_worker(app)
+
+    assert worker.run_once() is True
+    assert worker.run_once() is False
+    assert runs == [{'value': 7}]
+    job = reload(job.id)
+    assert job.status == 'done'
+    assert json.loads(job.result) == {'echo': 7}
+    assert job.lease_owner is None
+    assert active_job('test_echo') is None
+
+
+def test_failed_job_is_requeued_with_backoff(app):
+    job, _ = enqueue('test_flaky', max_attempts=2)
+    make_worker(app).run_once()
+
+    job = reload(job.id)
+    assert job.status == 'queued'
+    assert job.attempts == 1
+    assert 'boom' in job.error
+    assert job.run_after > datetime.utcnow() + timedelta(seconds=30)
+    assert make_worker(app).run_once() is False  # not due yet
+
+
+def test_expired_lease_is_claimed_by_another_worker(app):
+    runs.clear()
+    job, _ = enqueue('test_echo', {'value': 3})
+    job.status = 'running'
+    job.attempts = 1
+    job.lease_owner = 'dead-worker'
+    job.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+
+    assert make_worker(app, worker_id='w2').run_once() is True
+    job = reload(job.id)
+    assert job.status == 'done'
+    assert job.attempts == 2
+    assert runs == [{'value': 3}]
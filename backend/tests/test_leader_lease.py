@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+from models import db, AppSetting
+from services.leader_lease import LeaderLease
+
+
+def test_only_one_process_holds_the_lease(app):
+    first = LeaderLease(app, 'scheduler')
+    second = LeaderLease(app, 'scheduler')
+
+    assert first.try_acquire() is True
+    assert second.try_acquire() is False
+    assert first.try_acquire() is True  # renewal
+    assert second.current_holder()['owner'] == first.owner_id
+
+
+def test_expired_lease_is_taken_over(app):
+    first = LeaderLease(app, 'scheduler', lease_seconds=90)
+    second = LeaderLease(app, 'scheduler', lease_seconds=90)
+    first.try_acquire()
+
+    row = db.session.get(AppSetting, first.key)
+    row.updated_at = datetime.utcnow() - timedelta(seconds=120)
+    db.session.commit()
+
+    assert first.current_holder() is None
+    assert second.try_acquire() is True
+    assert first.try_acquire() is False
+
+
+def test_release_hands_over_immediately(app):
+    first = LeaderLease(app, 'scheduler')
+    second = LeaderLease(app, 'scheduler')
+    first.try_acquire()
+    first.release()
+
+    assert first.current_holder() is None
+    assert second.try_acquire() is True
+
+
+def test_transitions_fire_callbacks_once(app):
+    events = []
+    lease = LeaderLease(app, 'scheduler', on_elected=lambda: events.append('elected'),
+                        on_deposed=lambda: events.append('deposed'))
+    lease._transition(True)
+    lease._transition(True)
+    lease._transition(False)
+    lease._transition(False)
+    assert events == ['elected', 'deposed']
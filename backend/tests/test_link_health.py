@@ -0,0 +1,85 @@
+import pytest
+
+from services import page_cache
+from services.link_health import ALIVE, DEAD, ERROR, THROTTLED, LinkHealth
+
+
+@pytest.fixture(autouse=True)
+def fresh_page_cache(monkeypatch):
+    cache = page_cache.PageCache()
+    monkeypatch.setattr(page_cache, '_page_cache', cache)
+    return cache
+
+
+def test_head_answer_is_cached(http_server):
+    http_server.routes['/ok'] = (200, {}, 'body')
+    health = LinkHealth()
+    url = http_server.url + '/ok'
+
+    verdict = health.check(url)
+    assert (verdict.outcome, verdict.method) == (ALIVE, 'head')
+    assert health.check(url + '/') is verdict  # same canonical URL
+    assert [hit[0] for hit in http_server.page_hits()] == ['HEAD']
+    assert health.get_stats()['hits'] == 1
+
+
+def test_refused_head_falls_back_to_a_ranged_get(http_server):
+    def page(handler):
+        if handler.command == 'HEAD':
+            return 405, {}, b''
+        assert handler.headers.get('Range') == 'bytes=0-0'
+        return 206, {'Content-Range': 'bytes 0-0/4'}, b'b'
+
+    http_server.routes['/no-head'] = page
+    verdict = LinkHealth().check(http_server.url + '/no-head')
+    assert (verdict.outcome, verdict.status, verdict.method) == (ALIVE, 206, 'range')
+
+
+def test_missing_page_is_dead_after_the_get_confirms_it(http_server):
+    verdict = LinkHealth().check(http_server.url + '/gone')
+    assert verdict.dead
+    assert [hit[0] for hit in http_server.page_hits()] == ['HEAD', 'GET']
+
+
+def test_server_errors_are_not_dead(http_server):
+    http_server.routes['/broken'] = (500, {}, 'oops')
+    health = LinkHealth(error_ttl=0)
+    verdict = health.check(http_server.url + '/broken')
+    assert verdict.outcome == ERROR
+    assert not verdict.dead
+    assert health.peek(http_server.url + '/broken') is None  # errors are retried soon
+
+
+def test_recent_page_fetch_answers_without_a_request(http_server, fresh_page_cache):
+    http_server.routes['/page'] = (200, {}, '<p>Hi</p>')
+    url = http_server.url + '/page'
+    fresh_page_cache.fetch(url)
+
+    verdict = LinkHealth().check(url)
+    assert (verdict.outcome, verdict.method) == (ALIVE, 'page')
+    assert len(http_server.page_hits()) == 1
+
+
+def test_check_many_checks_each_canonical_url_once(http_server):
+    http_server.routes['/a'] = (200, {}, 'a')
+    health = LinkHealth()
+    urls = [http_server.url + '/a', http_server.url + '/a/', http_server.url + '/b', 'mailto:x@example.com']
+
+    verdicts = health.check_many(urls)
+    assert verdicts[urls[0]].alive and verdicts[urls[1]].alive
+    assert verdicts[urls[2]].outcome == DEAD
+    assert verdicts[urls[3]].outcome == ERROR
+    assert sum(1 for hit in http_server.page_hits() if hit[1] == '/a') == 1
+
+
+def test_throttled_check_sends_nothing_and_is_not_cached(http_server, fast_host_limiter):
+    url = http_server.url + '/busy'
+    fast_host_limiter.report(url, 429, '60')
+    health = LinkHealth()
+
+    verdict = health.check(url)
+    assert verdict.throttled
+    assert not verdict.alive and not verdict.dead
+    assert http_server.page_hits() == []  # no ranged GET after the refused HEAD
+    assert health.peek(url) is None
+    assert health.get_stats()[THROTTLED] == 1
@@ -0,0 +1,21 @@
+from services import link_health, page_cache
+from routes.scanner import _live_candidates
+
+
+def test_throttled_links_are_deferred_not_judged(http_server, fast_host_limiter, monkeypatch, capsys):
+    monkeypatch.setattr(page_cache, '_page_cache', page_cache.PageCache())
+    monkeypatch.setattr(link_health, '_link_health', link_health.LinkHealth())
+    http_server.routes['/open'] = (200, {}, 'ok')
+    candidates = [
+        {'title': 'Open', 'registration_link': http_server.url + '/open'},
+        {'title': 'Gone', 'registration_link': http_server.url + '/gone'},
+        {'title': 'Busy', 'application_link': 'http://localhost:1/busy'},
+        {'title': 'No link'},
+    ]
+    fast_host_limiter.report('http://localhost:1/busy', 429, '60')
+
+    live = _live_candidates(candidates)
+    assert [candidate['title'] for candidate in live] == ['Open']
+    output = capsys.readouterr().out
+    assert 'Deferred (host rate limited): http://localhost:1/busy' in output
+    assert 'Invalid Link' in output and '/gone' in output
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('scipy')
+
+from models import db, Hackathon, Internship
+from services.match_engine import MatchEngine, MatchIndex, local_score, tokenize
+
+
+def test_tokenize_keeps_tech_tokens_and_adds_bigrams():
+    terms = tokenize('Node.js and C++ for the Machine Learning team.')
+    assert 'node.js' in terms and 'c++' in terms
+    assert 'the' not in terms
+    assert 'machine learning' in terms
+
+
+def test_rank_prefers_the_closest_document_and_skips_past_deadlines():
+    future = datetime.utcnow() + timedelta(days=10)
+    past = datetime.utcnow() - timedelta(days=1)
+    index = MatchIndex.build([
+        (('hackathon', 1), 'Machine learning hackathon with Python and PyTorch', future),
+        (('internship', 2), 'Frontend internship React TypeScript CSS', future),
+        (('hackathon', 3), 'Python machine learning challenge (finished)', past),
+    ])
+    ranked = index.rank(index.vectorize('Python developer, machine learning with PyTorch'))
+    assert [key for key, _ in ranked] == [('hackathon', 1)]
+    assert 0 < ranked[0][1] <= 1.0
+
+    with_past = index.rank(index.vectorize('python machine learning'), include_past=True)
+    assert ('hackathon', 3) in [key for key, _ in with_past]
+    assert index.rank(index.vectorize('react typescript'), event_type='hackathon') == []
+
+
+def test_with_row_and_without_edit_a_copy():
+    index = MatchIndex.build([(('hackathon', 1), 'rust systems programming', None)])
+    added = index.with_row(('hackathon', 2), index.vectorize('golang backend services'), None)
+    assert len(added) == 2 and len(index) == 1
+    assert added.rank(added.vectorize('golang'))[0][0] == ('hackathon', 2)
+    assert not added.without(('hackathon', 2)).is_open(('hackathon', 2))
+
+
+def test_local_score_scale():
+    assert local_score(0.456) == 46
+    assert local_score(1.7) == 100
+    assert local_score(-1) == 0
+
+
+def test_engine_applies_catalog_changes_in_place(app):
+    db.session.add(Hackathon(title='AI Hackathon', description='machine learning', location='Online',
+                             status='approved'))
+    db.session.add(Internship(title='Backend Intern', company='Acme', description='django postgres',
+                              location='Remote', status='approved'))
+    db.session.add(Hackathon(title='Pending', description='machine learning', location='Online', status='pending'))
+    db.session.commit()
+
+    engine = MatchEngine(check_interval=3600)
+    assert len(engine.get_index()) == 2
+    assert engine.rank_resume('django developer')[0][0][0] == 'internship'
+
+    pending = Hackathon.query.filter_by(status='pending').one()
+    pending.status = 'approved'
+    db.session.commit()
+    engine.upsert('hackathon', pending)
+    engine._checked_at = float('-inf')
+    assert len(engine.get_index()) == 3
+    assert engine.get_stats()['synced_changes'] == 0  # already applied by upsert()
+
+    # Committed elsewhere: found by the next catalog check
+    db.session.delete(Internship.query.one())
+    db.session.add(Hackathon(title='Other', description='rust', location='Online', status='approved'))
+    db.session.commit()
+    engine._checked_at = float('-inf')
+    index, changes, _ = engine.changes_since(1)
+    assert sorted(key[0] for key in index.keys) == ['hackathon'] * 3
+    assert [(key[0], vector is None) for key, vector in changes] == [('hackathon', False), ('internship', True)]
+    stats = engine.get_stats()
+    assert (stats['builds'], stats['synced_changes']) == (1, 2)
+    assert engine.changes_since(0)[1] is not None
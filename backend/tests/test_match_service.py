@@ -0,0 +1,76 @@
+import pytest
+
+from config import Config
+from services import match_service
+from services.match_service import MatchService, get_match_service
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.text = str(payload)
+
+    def json(self):
+        return self._payload
+
+
+@pytest.fixture
+def rest_only(monkeypatch):
+    monkeypatch.setattr(match_service, 'SDK_AVAILABLE', False)
+    monkeypatch.setattr(match_service, '_match_service', None)
+
+
+def test_service_is_shared_until_the_key_changes(rest_only, monkeypatch):
+    monkeypatch.setattr(Config, 'GEMINI_API_KEY', 'key-one')
+    first = get_match_service()
+    assert get_match_service() is first
+
+    monkeypatch.setattr(Config, 'GEMINI_API_KEY', 'key-two')
+    second = get_match_service()
+    assert second is not first
+    assert second.api_key == 'key-two'
+
+
+def test_discovery_is_cached_and_filters_candidates(rest_only, monkeypatch):
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        return FakeResponse(200, {'models': [
+            {'name': 'models/gemini-2.0-flash', 'supportedGenerationMethods': ['generateContent']},
+            {'name': 'models/embedding-001', 'supportedGenerationMethods': ['embedContent']},
+        ]})
+
+    monkeypatch.setattr(match_service.http_client, 'get', fake_get)
+    service = MatchService('key')
+    preferred = ['gemini-1.5-flash', 'gemini-2.0-flash']
+
+    assert service._candidate_models(preferred) == ['gemini-2.0-flash']
+    assert service._candidate_models(preferred) == ['gemini-2.0-flash']
+    assert len(calls) == 1
+
+
+def test_repeated_404s_trigger_rediscovery(rest_only, monkeypatch):
+    calls = []
+    monkeypatch.setattr(match_service.http_client, 'get',
+                        lambda url, **kwargs: calls.append(url) or FakeResponse(200, {'models': []}))
+    service = MatchService('key')
+    service._candidate_models(['gemini-2.0-flash'])
+    for _ in range(Config.MODEL_REFRESH_AFTER_404S):
+        service._record_result('gemini-2.0-flash', 404)
+    service._candidate_models(['gemini-2.0-flash'])
+    assert len(calls) == 2
+
+
+def test_working_model_is_tried_first(rest_only, monkeypatch):
+    monkeypatch.setattr(match_service.http_client, 'get', lambda url, **kwargs: FakeResponse(500))
+    service = MatchService('key')
+    service._record_result('gemini-pro', 200)
+    assert service._candidate_models(['gemini-2.0-flash', 'gemini-pro']) == ['gemini-pro', 'gemini-2.0-flash']
+
+
+def test_disabled_without_key(rest_only):
+    service = MatchService('')
+    assert not service.enabled
+    assert service._candidate_models(['gemini-2.0-flash']) == []
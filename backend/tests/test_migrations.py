@@ -0,0 +1,33 @@
+from sqlalchemy import inspect, text
+
+from migrations import load_migrations, pending_migrations, run_migrations
+from migrations import m0002_hot_filter_indexes, m0004_expiry_schedule
+from models import db
+
+
+def test_versions_are_unique_and_ordered():
+    versions = [module.VERSION for module in load_migrations()]
+    assert versions == sorted(set(versions))
+
+
+def test_worker_app_leaves_nothing_pending(app):
+    assert pending_migrations(db.engine) == []
+    assert run_migrations(db.engine) == []
+
+
+def test_index_migrations_are_safe_to_repeat(app):
+    with db.engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_hackathons_status_deadline"))
+    for _ in range(2):
+        with db.engine.begin() as conn:
+            m0002_hot_filter_indexes.upgrade(conn)
+            m0004_expiry_schedule.upgrade(conn)
+    names = {index['name'] for index in inspect(db.engine).get_indexes('hackathons')}
+    assert {'ix_hackathons_status_deadline', 'ix_hackathons_status_next_check'} <= names
+
+
+def test_create_index_does_not_fail_when_index_appears_concurrently(app, monkeypatch):
+    # Another runner created the index after this one inspected the table
+    monkeypatch.setattr(inspect(db.engine).__class__, 'get_indexes', lambda self, table, **kw: [])
+    with db.engine.begin() as conn:
+        m0002_hot_filter_indexes.upgrade(conn)
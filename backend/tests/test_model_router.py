@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+from services import model_router
+from services.model_router import CLOSED, HALF_OPEN, OPEN, ModelRouter, parse_retry_after
+
+
+@pytest.fixture
+def router(monkeypatch):
+    monkeypatch.setattr(model_router.random, 'uniform', lambda low, high: 1.0)
+    return ModelRouter(failure_threshold=2, base_backoff=10, unavailable_backoff=100)
+
+
+def expire(router, *names):
+    for name in names:
+        router._models[name].open_until = time.monotonic() - 1
+
+
+def test_fastest_healthy_model_first(router):
+    router.record_success('slow', 2.0)
+    router.record_success('fast', 0.2)
+    assert router.order(['slow', 'fast', 'new']) == ['fast', 'slow', 'new']
+
+
+def test_breaker_opens_after_threshold_and_on_404(router):
+    router.record_failure('flaky', 500)
+    assert router.order(['flaky']) == ['flaky']
+    router.record_failure('flaky', 500)
+    router.record_failure('gone', 404)
+    assert router.order(['flaky', 'gone', 'ok']) == ['ok']
+    assert router._models['gone'].open_until - time.monotonic() > 90
+
+
+def test_quota_uses_retry_after(router):
+    router.record_failure('m', 429, retry_after=30)
+    assert router.all_quota_limited(['m'])
+    assert 25 < router.retry_in(['m']) <= 30
+
+
+def test_one_probe_per_call_and_it_goes_first(router):
+    router.record_success('healthy', 0.1)
+    for name in ('a', 'b'):
+        router.record_failure(name, 404)
+    expire(router, 'a', 'b')
+
+    first = router.order(['healthy', 'a', 'b'])
+    assert first[0] in ('a', 'b') and first[1:] == ['healthy']
+    probe = first[0]
+    other = 'b' if probe == 'a' else 'a'
+    assert router._models[probe].state == HALF_OPEN
+    assert router._models[other].state == OPEN and not router._models[other].probing
+
+    # The next caller may probe the other model, not the one already being probed
+    assert router.order(['healthy', 'a', 'b']) == [other, 'healthy']
+    assert router.order(['healthy', 'a', 'b']) == ['healthy']
+
+
+def test_probe_result_closes_or_reopens(router):
+    router.record_failure('m', 404)
+    expire(router, 'm')
+    assert router.order(['m']) == ['m']
+    router.record_success('m', 0.5)
+    assert router._models['m'].state == CLOSED
+
+    router.record_failure('n', 404)
+    expire(router, 'n')
+    router.order(['n'])
+    router.record_failure('n', 500)
+    assert router._models['n'].state == OPEN
+    assert router.order(['n']) == []
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('12') == 12.0
+    assert parse_retry_after('') is None
+    assert parse_retry_after('soon') is None
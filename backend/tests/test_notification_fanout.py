@@ -0,0 +1,25 @@
+from models import Notification
+from services.notification_service import fan_out_notification
+
+
+def test_fan_out_creates_one_row_per_user(app, make_user):
+    users = [make_user()[0] for _ in range(3)]
+
+    created = fan_out_notification('hackathon', 7, 'New Hackathon Available!', 'Check out: Foo')
+
+    assert created == 3
+    rows = Notification.query.order_by(Notification.user_id).all()
+    assert [row.user_id for row in rows] == [user.id for user in users]
+    assert all(row.event_id == 7 and row.is_read is False for row in rows)
+
+
+def test_fan_out_by_role(app, make_user):
+    make_user()
+    admin, _ = make_user(role='admin')
+
+    assert fan_out_notification('internship', 1, 'Title', 'Message', role='admin') == 1
+    assert [row.user_id for row in Notification.query.all()] == [admin.id]
+
+
+def test_fan_out_with_no_users(app):
+    assert fan_out_notification('hackathon', 1, 'Title', 'Message') == 0
@@ -0,0 +1,154 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from config import Config
+from models import db, Notification
+from services import notification_bus
+from services.notification_bus import NotificationBus, group_rows
+from services.notification_service import fan_out_notification, mark_all_read, notify_user
+
+
+@pytest.fixture
+def bus(app, monkeypatch):
+    """A fresh bus whose poller never fires on its own; tests call poll_once()"""
+    bus = NotificationBus(buffer_size=3, poll_seconds=3600)
+    monkeypatch.setattr(notification_bus, '_bus', bus)
+    monkeypatch.setattr(Config, 'SSE_HEARTBEAT_SECONDS', 0.05)
+    monkeypatch.setattr(Config, 'SSE_MAX_STREAM_SECONDS', 60)
+    return bus
+
+
+def parse(chunk):
+    """{'id', 'event', 'data'} of one SSE message, or None for comments and retry lines"""
+    fields = {}
+    for line in (chunk.decode() if isinstance(chunk, bytes) else chunk).splitlines():
+        if line.startswith(':') or ':' not in line:
+            continue
+        name, value = line.split(':', 1)
+        fields[name] = value.strip()
+    if 'event' not in fields:
+        return None
+    return {'id': fields.get('id'), 'event': fields['event'], 'data': json.loads(fields['data'])}
+
+
+def next_event(chunks):
+    for chunk in chunks:
+        message = parse(chunk)
+        if message:
+            return message
+
+
+def test_group_rows_collapses_a_fan_out():
+    row = lambda id, user, title: SimpleNamespace(id=id, user_id=user, event_type='hackathon', event_id=1,
+                                                  title=title, message='m')
+    groups = group_rows([row(1, 10, 'A'), row(2, 11, 'A'), row(3, 10, 'B')])
+    assert [(g[0], g[2]) for g in groups] == [(2, {10, 11}), (3, {10})]
+
+
+def test_poll_buffers_rows_written_by_any_process(bus, make_user):
+    user, _ = make_user()
+    bus.subscribe()
+    fan_out_notification('hackathon', 1, 'New', 'One')
+    assert bus.poll_once() == 1
+
+    events, cursor = bus.wait(0, user.id, 'participant', timeout=0)
+    assert [event.data['title'] for event in events] == ['New']
+    assert events[0].id == Notification.query.first().id
+    assert bus.wait(cursor, user.id, 'participant', timeout=0) == ([], cursor)
+
+
+def test_replay_reports_gap_once_events_left_the_buffer(bus, make_user):
+    user, _ = make_user()
+    bus.subscribe()
+    for i in range(5):
+        notify_user(user.id, 'hackathon', i, f'N{i}', 'm')
+    bus.poll_once()
+    ids = [n.id for n in Notification.query.order_by(Notification.id)]
+
+    missed, gap, _ = bus.replay(ids[2], user.id, 'participant')
+    assert [event.id for event in missed] == ids[3:]
+    assert not gap
+    assert bus.replay(ids[0], user.id, 'participant')[1] is True
+
+
+def test_stream_sends_counter_only_with_events(bus, client, make_user):
+    user, headers = make_user()
+    chunks = iter(client.get('/api/notifications/stream', headers=headers, buffered=False).response)
+
+    assert next_event(chunks) == {'id': None, 'event': 'unread_count', 'data': {'count': 0}}
+    heartbeat = next(chunks)
+    assert (heartbeat.decode() if isinstance(heartbeat, bytes) else heartbeat) == ': heartbeat\n\n'
+
+    notify_user(user.id, 'hackathon', 1, 'New', 'Hi')
+    bus.poll_once()
+    event = next_event(chunks)
+    assert event['event'] == 'notification'
+    assert int(event['id']) == Notification.query.first().id
+    assert next_event(chunks) == {'id': None, 'event': 'unread_count', 'data': {'count': 1}}
+
+    mark_all_read(user.id)  # published in-process
+    assert next_event(chunks)['event'] == 'read'
+    assert next_event(chunks)['data'] == {'count': 0}
+
+
+def test_stream_resumes_from_last_event_id(bus, client, make_user):
+    user, headers = make_user()
+    bus.subscribe()
+    notify_user(user.id, 'hackathon', 1, 'First', 'm')
+    notify_user(user.id, 'hackathon', 2, 'Second', 'm')
+    bus.poll_once()
+    first, second = [n.id for n in Notification.query.order_by(Notification.id)]
+
+    chunks = iter(client.get('/api/notifications/stream', buffered=False,
+                             headers=dict(headers, **{'Last-Event-ID': str(first)})).response)
+    event = next_event(chunks)
+    assert (event['event'], int(event['id']), event['data']['title']) == ('notification', second, 'Second')
+    assert next_event(chunks)['data'] == {'count': 2}
+
+
+def test_stream_asks_for_resync_when_the_id_is_too_old(bus, client, make_user):
+    user, headers = make_user()
+    notify_user(user.id, 'hackathon', 1, 'Written before any stream', 'm')
+    chunks = iter(client.get('/api/notifications/stream?last_event_id=0', headers=headers,
+                             buffered=False).response)
+    assert next_event(chunks)['event'] == 'resync'
+
+
+
+def commit_with_id(notification_id, user_id, title):
+    """Insert a notification with a chosen id, as a transaction that got its id earlier would"""
+    db.session.add(Notification(id=notification_id, user_id=user_id, event_type='hackathon',
+                                event_id=notification_id, title=title, message='m'))
+    db.session.commit()
+
+
+def test_rows_committed_out_of_id_order_are_not_skipped(bus, make_user):
+    user, _ = make_user()
+    bus.subscribe()
+
+    commit_with_id(2, user.id, 'Committed first')  # id 1 is taken but its transaction is still open
+    assert bus.poll_once() == 1
+    events, cursor = bus.wait(0, user.id, 'participant', timeout=0)
+    assert [event.id for event in events] == [2]
+
+    commit_with_id(1, user.id, 'Committed late')
+    assert bus.poll_once() == 1
+    events, _ = bus.wait(cursor, user.id, 'participant', timeout=0)
+    assert [(event.id, event.data['title']) for event in events] == [(1, 'Committed late')]
+    assert [event.id for event in bus.replay(2, user.id, 'participant')[0]] == [1]
+    assert bus.poll_once() == 0
+    assert bus.get_stats()['pending_gaps'] == 0
+
+
+def test_skipped_ids_are_given_up_after_the_lookback(bus, make_user):
+    user, _ = make_user()
+    bus.subscribe()
+    bus.lookback_seconds = 0
+
+    commit_with_id(5, user.id, 'After a rollback')
+    assert bus.poll_once() == 1
+    assert bus.get_stats()['pending_gaps'] == 4
+    bus.poll_once()
+    assert bus.get_stats()['pending_gaps'] == 0
@@ -0,0 +1,59 @@
+import pytest
+
+from services.host_limiter import HostThrottled
+from services.page_cache import PageCache
+
+
+def test_fresh_entry_is_served_from_cache(http_server):
+    http_server.routes['/p'] = (200, {}, '<html><body><p>Hello</p><script>x()</script></body></html>')
+    cache = PageCache(ttl=60)
+    url = http_server.url + '/p'
+
+    assert cache.fetch(url).text == 'Hello'
+    assert cache.fetch(url).text == 'Hello'
+    assert len(http_server.page_hits()) == 1
+    assert cache.get_stats()['hits'] == 1
+
+
+def test_stale_entry_is_revalidated_with_etag(http_server):
+    def page(handler):
+        if handler.headers.get('If-None-Match') == '"v1"':
+            return 304, {'ETag': '"v1"'}, b''
+        return 200, {'ETag': '"v1"'}, '<p>Body</p>'
+
+    http_server.routes['/p'] = page
+    cache = PageCache(ttl=0)
+    url = http_server.url + '/p'
+
+    cache.fetch(url)
+    page_entry = cache.fetch(url)
+    assert page_entry.text == 'Body'
+    assert http_server.page_hits()[1][2].get('If-None-Match') == '"v1"'
+    assert cache.get_stats()['revalidated'] == 1
+
+
+def test_error_pages_are_cached_without_text(http_server):
+    cache = PageCache(ttl=60, error_ttl=60)
+    page = cache.fetch(http_server.url + '/missing')
+    assert page.status == 404
+    assert not page.ok
+    assert cache.peek(http_server.url + '/missing') is page
+
+
+def test_lru_evicts_oldest(http_server):
+    for name in 'abc':
+        http_server.routes['/' + name] = (200, {}, name)
+    cache = PageCache(max_entries=2)
+    for name in 'abc':
+        cache.fetch(f'{http_server.url}/{name}')
+    assert cache.peek(http_server.url + '/a') is None
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_throttled_fetch_is_raised_not_cached(http_server, fast_host_limiter):
+    url = http_server.url + '/busy'
+    fast_host_limiter.report(url, 429, '60')
+    cache = PageCache(ttl=60, error_ttl=60)
+    with pytest.raises(HostThrottled):
+        cache.fetch(url)
+    assert cache.peek(url) is None
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import db, Hackathon
+from services.pagination import decode_cursor, encode_cursor, parse_limit, MAX_PAGE_SIZE
+
+
+def add_hackathons(count, with_null_deadlines=0):
+    base = datetime(2026, 1, 1)
+    for i in range(count):
+        deadline = None if i < with_null_deadlines else base + timedelta(days=i % 5)
+        db.session.add(Hackathon(title=f'Hack {i}', description='d', location='Online',
+                                 deadline=deadline, status='approved'))
+    db.session.commit()
+
+
+def walk(client, url):
+    ids, cursor = [], None
+    while True:
+        response = client.get(url + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        page = response.get_json()
+        ids += [item['id'] for item in page['items']]
+        cursor = page['next_cursor']
+        if not page['has_more']:
+            return ids
+
+
+def test_cursor_round_trip():
+    when = datetime(2026, 3, 4, 5, 6, 7)
+    assert decode_cursor(encode_cursor(when, 42)) == (when, 42)
+    assert decode_cursor(encode_cursor(None, 7)) == (None, 7)
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor')
+
+
+def test_parse_limit_clamps():
+    assert parse_limit(None) == 20
+    assert parse_limit('0') == 1
+    assert parse_limit('100000') == MAX_PAGE_SIZE
+    with pytest.raises(ValueError):
+        parse_limit('ten')
+
+
+@pytest.mark.parametrize('order', ['asc', 'desc'])
+def test_pages_cover_every_row_once(client, order):
+    add_hackathons(23, with_null_deadlines=4)
+    ids = walk(client, f'/api/hackathons?limit=5&order={order}')
+    assert sorted(ids) == sorted(h.id for h in Hackathon.query.all())
+    assert len(ids) == len(set(ids))
+
+
+def test_default_request_is_paged(client):
+    add_hackathons(30)
+    page = client.get('/api/hackathons').get_json()
+    assert len(page['items']) == 20
+    assert page['has_more'] is True
+    assert client.get('/api/hackathons?limit=500').get_json()['limit'] == MAX_PAGE_SIZE
+
+
+def test_fields_projection(client):
+    add_hackathons(2)
+    item = client.get('/api/hackathons?fields=title').get_json()['items'][0]
+    assert set(item) == {'id', 'title'}
+    assert client.get('/api/hackathons?fields=nope').status_code == 400
+
+
+def test_filters_apply_before_paging(client):
+    add_hackathons(6)
+    db.session.add_all([
+        Hackathon(title=f'Robotics {i}', description='embedded', location='Pune', status='approved')
+        for i in range(3)
+    ])
+    db.session.add(Hackathon(title='CTF night', description='security', location='Online', status='approved'))
+    db.session.commit()
+
+    ids = walk(client, '/api/hackathons?limit=2&keywords=robotics,iot')
+    assert sorted(ids) == sorted(h.id for h in Hackathon.query.filter(Hackathon.title.like('Robotics%')))
+    ids = walk(client, '/api/hackathons?limit=2&keywords=security,robotics&location=online')
+    assert [db.session.get(Hackathon, i).title for i in ids] == ['CTF night']
+    assert walk(client, '/api/internships?limit=2&keywords=robotics') == []
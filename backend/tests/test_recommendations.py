@@ -0,0 +1,117 @@
+import pytest
+
+pytest.importorskip('scipy')
+
+from models import db, Hackathon
+from services.match_engine import MatchEngine
+from services.recommendations import RecommendationFeed
+
+
+def add_hackathon(title, description, status='approved'):
+    hackathon = Hackathon(title=title, description=description, location='Online', status=status)
+    db.session.add(hackathon)
+    db.session.commit()
+    return hackathon
+
+
+@pytest.fixture
+def feed(app, make_user):
+    add_hackathon('ML Hackathon', 'python machine learning pytorch')
+    add_hackathon('Web Jam', 'react frontend css design')
+    add_hackathon('Data Sprint', 'python pandas data analysis')
+    user, _ = make_user()
+    user.resume_text = 'Python developer working on machine learning with PyTorch'
+    db.session.commit()
+    return RecommendationFeed(MatchEngine(check_interval=3600), size=2), user.id
+
+
+def titles(results):
+    return [db.session.get(Hackathon, key[1]).title for key, _ in results]
+
+
+def test_feed_is_ranked_and_capped(feed):
+    feed, user_id = feed
+    results = feed.get_feed(user_id, lambda: None)
+    assert titles(results) == ['ML Hackathon', 'Data Sprint']
+    assert results[0][1] > results[1][1]
+    assert feed.get_feed(user_id, lambda: None, limit=1) == results[:1]
+    assert feed.get_stats()['feed_builds'] == 1
+
+
+def test_new_opportunity_is_merged_without_a_rebuild(feed):
+    feed, user_id = feed
+    feed.get_feed(user_id, lambda: None)
+
+    new = add_hackathon('Deep Learning Cup', 'machine learning pytorch python deep learning')
+    feed.engine.upsert('hackathon', new)
+
+    assert titles(feed.get_feed(user_id, lambda: None)) == ['ML Hackathon', 'Deep Learning Cup']
+    stats = feed.get_stats()
+    assert (stats['feed_builds'], stats['incremental_inserts']) == (1, 1)
+
+
+def test_removed_opportunity_leaves_and_the_feed_is_refilled(feed):
+    feed, user_id = feed
+    top_key = feed.get_feed(user_id, lambda: None)[0][0]
+
+    feed.engine.remove(top_key)
+    assert titles(feed.get_feed(user_id, lambda: None)) == ['Data Sprint']  # rebuilt from the index
+    assert feed.get_stats()['feed_builds'] == 2
+
+
+def test_link_only_resume_is_loaded_once(feed, make_user):
+    feed, _ = feed
+    other, _ = make_user()
+    calls = []
+    loader = lambda: calls.append(1) or 'react frontend developer'
+
+    assert titles(feed.get_feed(other.id, loader))[0] == 'Web Jam'
+    feed.get_feed(other.id, loader)
+    assert len(calls) == 1
+    assert feed.get_feed(other.id + 100, lambda: None) is None
+
+    feed.resume_changed(other.id, 'pandas data analysis in python')
+    assert titles(feed.get_feed(other.id, loader))[0] == 'Data Sprint'
+
+
+def test_approval_committed_by_another_process_reaches_the_feed(app, feed):
+    """The worker's auto-approve updates only its own engine; this process finds it in the database"""
+    from routes import scanner
+    from models import AppSetting
+    from services import recommendations
+
+    feed, user_id = feed
+    feed.engine.check_interval = 0
+    feed.get_feed(user_id, lambda: None)
+    add_hackathon('Deep Learning Cup', 'machine learning pytorch python deep learning', status='pending')
+    AppSetting.set('auto_approve_enabled', 'true')
+
+    worker_feed = RecommendationFeed(MatchEngine(check_interval=3600), size=2)
+    original = recommendations._feed
+    recommendations._feed = worker_feed
+    try:
+        scanner.auto_approve_oldest_5(app)
+    finally:
+        recommendations._feed = original
+    db.session.expire_all()
+
+    assert titles(feed.get_feed(user_id, lambda: None)) == ['ML Hackathon', 'Deep Learning Cup']
+    stats = feed.get_stats()
+    assert (stats['feed_builds'], stats['incremental_inserts'], stats['resets']) == (1, 1, 0)
+    assert feed.engine.get_stats()['builds'] == 1  # applied in place, not rebuilt
+
+
+def test_removal_committed_by_another_process_leaves_the_feed(feed):
+    feed, user_id = feed
+    feed.engine.check_interval = 0
+    top_key = feed.get_feed(user_id, lambda: None)[0][0]
+
+    hackathon = db.session.get(Hackathon, top_key[1])
+    hackathon.status = 'expired'  # e.g. by the worker's expiry sweep, with no call into this process
+    db.session.commit()
+    assert titles(feed.get_feed(user_id, lambda: None)) == ['Data Sprint']
+    assert feed.get_stats()['resets'] == 0
+
+    db.session.delete(db.session.get(Hackathon, top_key[1]))
+    db.session.commit()
+    assert titles(feed.get_feed(user_id, lambda: None)) == ['Data Sprint']
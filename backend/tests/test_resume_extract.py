@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+from models import db, ResumeExtract
+from services.resume_extract import FAILED_RETRY_MINUTES, resolve_resume
+
+
+def test_pasted_text_wins(app):
+    assert resolve_resume(1, 'pasted', 'https://example.com/cv') == 'pasted'
+    assert resolve_resume(1, None, None) is None
+
+
+def test_unchanged_resume_is_revalidated_not_reparsed(app, make_user, http_server):
+    def page(handler):
+        if handler.headers.get('If-None-Match') == '"v1"':
+            return 304, {'ETag': '"v1"'}, b''
+        return 200, {'ETag': '"v1"', 'Content-Type': 'text/html'}, '<p>Python developer</p>'
+
+    http_server.routes['/cv'] = page
+    user, _ = make_user()
+    link = http_server.url + '/cv'
+
+    assert resolve_resume(user.id, None, link) == 'Python developer'
+    assert resolve_resume(user.id, None, link) == 'Python developer'
+    assert len(http_server.hits) == 1  # second call trusted the stored text
+
+    extract = db.session.get(ResumeExtract, user.id)
+    extract.checked_at = datetime.utcnow() - timedelta(days=30)
+    db.session.commit()
+    assert resolve_resume(user.id, None, link) == 'Python developer'
+    assert http_server.hits[-1][2].get('If-None-Match') == '"v1"'
+
+
+def test_failed_refetch_keeps_old_text_but_retries_soon(app, make_user, http_server):
+    http_server.routes['/cv'] = (200, {'Content-Type': 'text/html'}, '<p>Python developer</p>')
+    user, _ = make_user()
+    link = http_server.url + '/cv'
+    resolve_resume(user.id, None, link)
+
+    extract = db.session.get(ResumeExtract, user.id)
+    extract.checked_at = datetime.utcnow() - timedelta(days=30)
+    db.session.commit()
+    http_server.routes['/cv'] = (503, {}, 'down')
+
+    assert resolve_resume(user.id, None, link) == 'Python developer'
+    assert db.session.get(ResumeExtract, user.id).error == 'HTTP 503'
+    hits = len(http_server.hits)
+    assert resolve_resume(user.id, None, link) == 'Python developer'
+    assert len(http_server.hits) == hits  # inside the retry window
+
+    extract = db.session.get(ResumeExtract, user.id)
+    extract.checked_at = datetime.utcnow() - timedelta(minutes=FAILED_RETRY_MINUTES + 1)
+    db.session.commit()
+    http_server.routes['/cv'] = (200, {'Content-Type': 'text/html'}, '<p>Go developer</p>')
+    assert resolve_resume(user.id, None, link) == 'Go developer'
+    assert db.session.get(ResumeExtract, user.id).error is None
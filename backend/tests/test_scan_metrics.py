@@ -0,0 +1,57 @@
+import json
+
+from models import db, ScanRun
+from services.scan_metrics import (
+    active_recorder, finish_run, record_fetch, record_gemini, recording, start_run
+)
+
+
+def test_reports_go_to_the_active_recorder_only():
+    record_fetch('https://example.com/ignored', 'page', 0.1, 200)
+    with recording() as recorder:
+        assert active_recorder() is recorder
+        record_fetch('https://example.com/a', 'page', 0.2, 200)
+        record_fetch('https://example.com/b', 'link_check', 1.5, 0)
+        record_gemini(True, 0.8)
+        record_gemini(False)
+        record_gemini(True, 2.0, ok=False)
+    assert active_recorder() is None
+    record_gemini(True, 1.0)
+
+    fetches = recorder.fetch_stats()
+    assert fetches['count'] == 2
+    assert fetches['errors'] == 1
+    assert fetches['by_kind']['link_check']['errors'] == 1
+    assert fetches['slowest'][0]['url'] == 'https://example.com/b'
+
+    gemini = recorder.gemini_stats()
+    assert (gemini['requests'], gemini['calls'], gemini['cache_hits'], gemini['errors']) == (3, 2, 1, 1)
+    assert gemini['latency']['max'] == 2.0
+
+
+def test_stages_attribute_candidates_and_saves():
+    with recording() as recorder:
+        with recorder.stage('discovery', 'hackathon'):
+            recorder.candidates(4)
+            recorder.dedup_hit()
+            recorder.saved('hackathon')
+        recorder.saved('internship')
+    stage = recorder.stages[0]
+    assert (stage['candidates'], stage['dedup_hits'], stage['saved']) == (4, 1, 1)
+    assert recorder.rows_written == {'hackathon': 1, 'internship': 1}
+    assert recorder.dedup_hits == 1
+
+
+def test_finished_run_stores_the_measurements(app):
+    run_id = start_run()
+    with recording() as recorder:
+        with recorder.stage('extract'):
+            recorder.saved('hackathon')
+        record_fetch('https://example.com/a', 'page', 0.3, 200)
+    finish_run(run_id, recorder, 'done')
+
+    run = db.session.get(ScanRun, run_id)
+    assert run.status == 'done'
+    assert run.new_hackathons == 1 and run.rows_written == 1
+    assert json.loads(run.stages)[0]['name'] == 'extract'
+    assert json.loads(run.fetch_stats)['count'] == 1
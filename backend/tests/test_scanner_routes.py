@@ -0,0 +1,26 @@
+import pytest
+
+ENDPOINTS = [
+    ('post', '/api/scanner/scan'),
+    ('get', '/api/scanner/jobs'),
+    ('get', '/api/scanner/jobs/1'),
+    ('get', '/api/scanner/results'),
+    ('get', '/api/scanner/http-stats'),
+    ('get', '/api/scanner/cache-stats'),
+    ('get', '/api/scanner/ai-status'),
+    ('get', '/api/scanner/schedule'),
+]
+
+
+@pytest.mark.parametrize('method,path', ENDPOINTS)
+def test_scanner_endpoints_are_admin_only(client, make_user, method, path):
+    assert getattr(client, method)(path).status_code == 401
+    _, headers = make_user()
+    assert getattr(client, method)(path, headers=headers).status_code == 403
+
+
+def test_admin_sees_jobs(client, make_user):
+    _, headers = make_user('admin')
+    response = client.get('/api/scanner/jobs', headers=headers)
+    assert response.status_code == 200
+    assert response.get_json() == {'jobs': []}
@@ -0,0 +1,64 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from models import db, Hackathon, Internship, TrackedEvent, load_events
+
+
+@contextmanager
+def count_queries():
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+
+def make_tracked(user, count):
+    hackathons = [Hackathon(title=f'H{i}', description='d', location='Online', status='approved')
+                  for i in range(count)]
+    internships = [Internship(title=f'I{i}', company='Acme', description='d', location='Remote')
+                   for i in range(count)]
+    db.session.add_all(hackathons + internships)
+    db.session.flush()
+    items = [TrackedEvent(user_id=user.id, event_type='hackathon', event_id=h.id) for h in hackathons]
+    items += [TrackedEvent(user_id=user.id, event_type='internship', event_id=i.id) for i in internships]
+    items.append(TrackedEvent(user_id=user.id, event_type='hackathon', event_id=99999))
+    db.session.add_all(items)
+    db.session.commit()
+    return items
+
+
+def test_load_events_maps_by_type_and_id(app, make_user):
+    user, _ = make_user()
+    items = make_tracked(user, 2)
+    events = load_events(items)
+    assert len(events) == 4
+    assert events[('hackathon', items[0].event_id)].title == 'H0'
+
+
+def test_serialize_many_uses_a_constant_number_of_queries(app, make_user):
+    user, _ = make_user()
+    items = make_tracked(user, 20)
+    db.session.expire_all()
+    items = TrackedEvent.query.order_by(TrackedEvent.id).all()
+
+    with count_queries() as statements:
+        data = TrackedEvent.serialize_many(items)
+    assert len(statements) <= 2
+    assert data[0]['event_details']['title'] == 'H0'
+    assert data[20]['event_details']['company'] == 'Acme'
+    assert data[-1]['event_details'] == {'deleted': True}
+    assert data == [item.to_dict() for item in items]
+
+
+def test_tracker_endpoint(client, make_user):
+    user, headers = make_user()
+    make_tracked(user, 3)
+    with count_queries() as statements:
+        response = client.get('/api/tracker', headers=headers)
+    assert response.status_code == 200
+    assert len(response.get_json()) == 7
+    assert len(statements) <= 4
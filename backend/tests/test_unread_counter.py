@@ -0,0 +1,47 @@
+from models import db, Notification
+from services.notification_service import (
+    fan_out_notification, get_unread_count, mark_all_read, mark_read, notify_user, recount_unread
+)
+
+
+def test_counter_follows_every_write(app, make_user):
+    user, _ = make_user()
+    other, _ = make_user()
+
+    fan_out_notification('hackathon', 1, 'New', 'One')
+    notify_user(user.id, 'internship', 2, 'New', 'Two')
+    assert get_unread_count(user.id) == 2
+    assert get_unread_count(other.id) == 1
+
+    first = Notification.query.filter_by(user_id=user.id).first()
+    assert mark_read(user.id, first.id)
+    assert mark_read(user.id, first.id)  # already read: no double decrement
+    assert get_unread_count(user.id) == 1
+
+    mark_all_read(user.id)
+    assert get_unread_count(user.id) == 0
+    assert get_unread_count(other.id) == 1
+
+
+def test_mark_read_rejects_other_users_notification(app, make_user):
+    user, _ = make_user()
+    other, _ = make_user()
+    notification = notify_user(other.id, 'hackathon', 1, 'New', 'Hi')
+    assert mark_read(user.id, notification.id) is False
+    assert get_unread_count(other.id) == 1
+
+
+def test_recount_repairs_drift(app, make_user):
+    user, _ = make_user()
+    fan_out_notification('hackathon', 1, 'New', 'One')
+    user.unread_notification_count = 9
+    db.session.commit()
+    recount_unread(user.id)
+    assert get_unread_count(user.id) == 1
+
+
+def test_unread_count_endpoint(client, make_user):
+    user, headers = make_user()
+    notify_user(user.id, 'hackathon', 1, 'New', 'Hi')
+    response = client.get('/api/notifications/unread-count', headers=headers)
+    assert response.get_json() == {'count': 1}
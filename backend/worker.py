@@ -0,0 +1,60 @@
+"""
+Background job worker: python worker.py [--kinds scan,cleanup_expired]
+Consumes the background_jobs queue (scans, link cleanups, auto-approval) in
+its own process, so that work never competes with web requests. Any number
+of workers can run; each job is leased to exactly one of them.
+"""
+import signal
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from flask import Flask
+from config import Config
+from models import db
+from services.job_queue import build_worker
+
+
+def create_worker_app():
+    """A Flask app with just the config, migrated database and mail set up (no routes, no scheduler)"""
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    db.init_app(app)
+
+    from services.email_service import init_mail
+    init_mail(app)
+
+    # Importing the scanner registers its job handlers
+    import routes.scanner  # noqa: F401
+
+    with app.app_context():
+        db.create_all()
+        # The worker can start before any web process has migrated the database
+        from migrations import run_migrations
+        applied = run_migrations(db.engine)
+        if applied:
+            print(f"[Worker] Applied migrations {applied}", flush=True)
+    return app
+
+
+def main():
+    kinds = None
+    if '--kinds' in sys.argv:
+        kinds = [kind.strip() for kind in sys.argv[sys.argv.index('--kinds') + 1].split(',') if kind.strip()]
+
+    worker = build_worker(create_worker_app(), kinds=kinds)
+
+    def shutdown(signum, frame):
+        # The job in progress is left to finish; if the process is killed first
+        # its lease expires and another worker retries it
+        print(f"[Worker] Signal {signum} received, stopping after the current job", flush=True)
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    worker.run_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -15,13 +15,13 @@ export default function LiveFeed() {
     const fetchRecentActivity = async () => {
         try {
             const [hResponse, iResponse] = await Promise.all([
-                hackathonsAPI.getAll({ sort_by: 'created_at', order: 'desc', limit: 5 }),
-                internshipsAPI.getAll({ sort_by: 'created_at', order: 'desc', limit: 5 })
+                hackathonsAPI.getAll({ sort_by: 'created_at', order: 'desc', limit: 5, fields: 'title,organizer,source,created_at' }),
+                internshipsAPI.getAll({ sort_by: 'created_at', order: 'desc', limit: 5, fields: 'title,company,source,created_at' })
             ]);
 
             const combined = [
-                ...hResponse.data.map(h => ({ ...h, type: 'hackathon', time: new Date(h.created_at) })),
-                ...iResponse.data.map(i => ({ ...i, type: 'internship', time: new Date(i.created_at) }))
+                ...hResponse.data.items.map(h => ({ ...h, type: 'hackathon', time: new Date(h.created_at) })),
+                ...iResponse.data.items.map(i => ({ ...i, type: 'internship', time: new Date(i.created_at) }))
             ].sort((a, b) => b.time - a.time).slice(0, 8);
 
             setActivities(combined);
@@ -13,12 +13,38 @@ export default function Navbar() {
     const notificationBtnRef = useRef(null);
 
     useEffect(() => {
-        if (user) {
+        if (!user) return;
+
+        // Live updates over server-sent events; fall back to 30s polling if streams aren't available
+        let interval = null;
+        let source = null;
+        const startPolling = () => {
+            if (interval) return;
             fetchUnreadCount();
-            const interval = setInterval(fetchUnreadCount, 30000);
-            return () => clearInterval(interval);
+            interval = setInterval(fetchUnreadCount, 30000);
+        };
+
+        if (typeof window.EventSource === 'undefined') {
+            startPolling();
+        } else {
+            source = new EventSource(notificationsAPI.streamUrl());
+            source.addEventListener('unread_count', (event) => {
+                setUnreadCount(JSON.parse(event.data).count);
+            });
+            source.addEventListener('resync', fetchUnreadCount);
+            source.onerror = () => {
+                // The browser retries on its own unless the server refused the stream (401/503)
+                if (source.readyState === EventSource.CLOSED) {
+                    startPolling();
+                }
+            };
         }
-    }, [user]);
+
+        return () => {
+            if (source) source.close();
+            if (interval) clearInterval(interval);
+        };
+    }, [user?.id]);
 
     const fetchUnreadCount = async () => {
         try {
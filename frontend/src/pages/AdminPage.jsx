@@ -154,18 +154,39 @@ export default function AdminPage() {
     const handlePurgeExpired = async () => {
         showPopup('Purge Expired?', 'This will scan all APPROVED links and remove those that are expired or closed. Continue?', 'confirm', async () => {
             try {
-                const response = await adminAPI.purgeExpired();
-                fetchPending();
-                fetchAllOpportunities();
-                setCanUndo(true);
-                showPopup('Purge Complete', response.data.message, 'success');
+                const response = await adminAPI.purgeExpired(true);
+                showPopup('Purge Started', response.data.message, 'success');
+                waitForPurge(response.data.job.id);
             } catch (error) {
                 console.error('Error purging expired items:', error);
-                showPopup('Error', 'Failed to purge expired items.', 'error');
+                showPopup('Error', error.response?.data?.error || 'Failed to purge expired items.', 'error');
             }
         });
     };
 
+    // The purge runs as a background job; poll it until it finishes
+    const waitForPurge = (jobId) => {
+        const poll = async () => {
+            try {
+                const { data: job } = await adminAPI.getJob(jobId);
+                if (job.status === 'done') {
+                    fetchPending();
+                    fetchAllOpportunities();
+                    setCanUndo(true);
+                    showPopup('Purge Complete', job.result?.message || 'Purge finished.', 'success');
+                } else if (job.status === 'failed') {
+                    showPopup('Error', job.error || 'Failed to purge expired items.', 'error');
+                } else {
+                    setTimeout(poll, 3000);
+                }
+            } catch (error) {
+                console.error('Error checking purge job:', error);
+                setTimeout(poll, 3000);
+            }
+        };
+        setTimeout(poll, 3000);
+    };
+
     const handleUndoPurge = async () => {
         try {
             const response = await adminAPI.undoPurge();
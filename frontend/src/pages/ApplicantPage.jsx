@@ -5,10 +5,27 @@ import Card, { CardHeader, CardBody, CardFooter } from '../components/Card';
 import Modal from '../components/Modal';
 import Popup from '../components/Popup';
 
+const PAGE_SIZE = 50;
+const LIST_PARAMS = { status: 'approved', sort_by: 'deadline', order: 'desc', limit: PAGE_SIZE };
+const DOMAIN_KEYWORDS = {
+    'ai': ['ai', 'ml', 'machine learning', 'artificial intelligence', 'data science', 'nlp', 'computer vision'],
+    'cyber': ['ethical', 'security', 'hacking', 'cyber', 'ctf'],
+    'hardware': ['electrical', 'workshop', 'iot', 'hardware', 'robotics', 'embedded']
+};
+
+// Filters run on the server so every page (and its cursor) only holds matching items
+const listParams = (location, domain) => ({
+    ...LIST_PARAMS,
+    ...(location.trim() ? { location: location.trim() } : {}),
+    ...(DOMAIN_KEYWORDS[domain] ? { keywords: DOMAIN_KEYWORDS[domain].join(',') } : {})
+});
+
 export default function ApplicantPage() {
     const navigate = useNavigate();
     const [searchParams, setSearchParams] = useSearchParams();
     const [opportunities, setOpportunities] = useState({ hackathons: [], internships: [] });
+    const [cursors, setCursors] = useState({ hackathons: null, internships: null });
+    const [loadingMore, setLoadingMore] = useState(false);
     const [loading, setLoading] = useState(true);
     const [selectedItem, setSelectedItem] = useState(null);
     const [modalOpen, setModalOpen] = useState(false);
@@ -18,6 +35,7 @@ export default function ApplicantPage() {
     const [popup, setPopup] = useState({ isOpen: false, title: '', message: '', type: 'info' });
     const [user, setUser] = useState(null);
     const highlightedCardRef = useRef(null);
+    const latestFetch = useRef(0);
 
     // Filter Logic
     const [domainFilter, setDomainFilter] = useState('all');
@@ -26,10 +44,16 @@ export default function ApplicantPage() {
     const [expanded, setExpanded] = useState({ hackathons: true, internships: true });
 
     useEffect(() => {
-        fetchOpportunities();
         fetchUser();
     }, []);
 
+    useEffect(() => {
+        // Refetch from the first page whenever a filter changes (typing in the location box is debounced)
+        setCursors({ hackathons: null, internships: null });
+        const timer = setTimeout(fetchOpportunities, filter.location ? 300 : 0);
+        return () => clearTimeout(timer);
+    }, [filter.location, domainFilter]);
+
     useEffect(() => {
         // Get URL parameters
         const type = searchParams.get('type');
@@ -70,13 +94,35 @@ export default function ApplicantPage() {
     };
 
     const fetchOpportunities = async () => {
+        const fetchId = ++latestFetch.current;
+        const params = listParams(filter.location, domainFilter);
         try {
-            const hackathonsResponse = await hackathonsAPI.getAll({ status: 'approved', sort_by: 'deadline', order: 'desc' });
-            const internshipsResponse = await internshipsAPI.getAll({ status: 'approved', sort_by: 'deadline', order: 'desc' });
+            const [hackathonsResponse, internshipsResponse] = await Promise.all([
+                hackathonsAPI.getAll(params),
+                internshipsAPI.getAll(params)
+            ]);
+            if (fetchId !== latestFetch.current) return; // a newer filter's results are coming
+            const hackathons = hackathonsResponse.data.items;
+            const internships = internshipsResponse.data.items;
+
+            // A notification can link to an opportunity beyond the first page
+            const type = searchParams.get('type');
+            const id = parseInt(searchParams.get('id'));
+            const firstPage = type === 'hackathon' ? hackathons : type === 'internship' ? internships : null;
+            if (firstPage && id && !firstPage.some(item => item.id === id)) {
+                try {
+                    const api = type === 'hackathon' ? hackathonsAPI : internshipsAPI;
+                    const linked = await api.getById(id);
+                    firstPage.unshift(linked.data);
+                } catch (error) {
+                    console.error('Error fetching linked opportunity:', error);
+                }
+            }
 
-            setOpportunities({
-                hackathons: hackathonsResponse.data,
-                internships: internshipsResponse.data
+            setOpportunities({ hackathons, internships });
+            setCursors({
+                hackathons: hackathonsResponse.data.next_cursor,
+                internships: internshipsResponse.data.next_cursor
             });
         } catch (error) {
             console.error('Error fetching opportunities:', error);
@@ -85,6 +131,25 @@ export default function ApplicantPage() {
         }
     };
 
+    const loadMore = async (kind) => {
+        const api = kind === 'hackathons' ? hackathonsAPI : internshipsAPI;
+        const fetchId = latestFetch.current;
+        setLoadingMore(true);
+        try {
+            const response = await api.getAll({ ...listParams(filter.location, domainFilter), cursor: cursors[kind] });
+            if (fetchId !== latestFetch.current) return; // the filters changed meanwhile
+            setOpportunities(prev => {
+                const seen = new Set(prev[kind].map(item => item.id));
+                return { ...prev, [kind]: [...prev[kind], ...response.data.items.filter(item => !seen.has(item.id))] };
+            });
+            setCursors(prev => ({ ...prev, [kind]: response.data.next_cursor }));
+        } catch (error) {
+            console.error('Error loading more opportunities:', error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const openModal = (item, type) => {
         setSelectedItem({ ...item, type });
         setModalOpen(true);
@@ -117,43 +182,6 @@ export default function ApplicantPage() {
         }
     };
 
-    const filterOpportunities = () => {
-        let filtered = { hackathons: [...opportunities.hackathons], internships: [...opportunities.internships] };
-
-        // Location Filter
-        if (filter.location) {
-            filtered.hackathons = filtered.hackathons.filter(h =>
-                h.location.toLowerCase().includes(filter.location.toLowerCase())
-            );
-            filtered.internships = filtered.internships.filter(i =>
-                i.location.toLowerCase().includes(filter.location.toLowerCase())
-            );
-        }
-
-        // Domain Filter
-        if (domainFilter !== 'all') {
-            const keywords = {
-                'ai': ['ai', 'ml', 'machine learning', 'artificial intelligence', 'data science', 'nlp', 'computer vision'],
-                'cyber': ['ethical', 'security', 'hacking', 'cyber', 'ctf'],
-                'hardware': ['electrical', 'workshop', 'iot', 'hardware', 'robotics', 'embedded']
-            };
-
-            const targetKeywords = keywords[domainFilter] || [];
-
-            const hasKeyword = (item) => {
-                const text = `${item.title} ${item.description} ${item.skills_required || ''}`.toLowerCase();
-                return targetKeywords.some(k => text.includes(k));
-            };
-
-            filtered.hackathons = filtered.hackathons.filter(hasKeyword);
-            filtered.internships = filtered.internships.filter(hasKeyword);
-        }
-
-        return filtered;
-    };
-
-    const filtered = filterOpportunities();
-
     if (loading) {
         return (
             <div className="container" style={{ paddingTop: '2rem', textAlign: 'center' }}>
@@ -220,7 +248,7 @@ export default function ApplicantPage() {
                             userSelect: 'none'
                         }}
                     >
-                        <h2 className="mb-0" style={{ flex: 1 }}>Hackathons ({filtered.hackathons.length})</h2>
+                        <h2 className="mb-0" style={{ flex: 1 }}>Hackathons ({opportunities.hackathons.length})</h2>
                         <span className="material-icons" style={{
                             transform: expanded.hackathons ? 'rotate(180deg)' : 'rotate(0deg)',
                             transition: 'transform 0.3s ease'
@@ -231,8 +259,8 @@ export default function ApplicantPage() {
 
                     {expanded.hackathons && (
                         <div className="grid grid-3">
-                            {filtered.hackathons.length > 0 ? (
-                                filtered.hackathons.map((hackathon) => {
+                            {opportunities.hackathons.length > 0 ? (
+                                opportunities.hackathons.map((hackathon) => {
                                     const isHighlighted = highlightedType === 'hackathon' && highlightedId === hackathon.id;
                                     return (
                                         <Card
@@ -292,6 +320,17 @@ export default function ApplicantPage() {
                             )}
                         </div>
                     )}
+                    {expanded.hackathons && cursors.hackathons && (
+                        <div style={{ textAlign: 'center', marginTop: '1rem' }}>
+                            <button
+                                onClick={() => loadMore('hackathons')}
+                                className="premium-btn-secondary"
+                                disabled={loadingMore}
+                            >
+                                {loadingMore ? 'Loading...' : 'Load more'}
+                            </button>
+                        </div>
+                    )}
                 </div>
             )}
 
@@ -307,7 +346,7 @@ export default function ApplicantPage() {
                             userSelect: 'none'
                         }}
                     >
-                        <h2 className="mb-0" style={{ flex: 1 }}>Internships ({filtered.internships.length})</h2>
+                        <h2 className="mb-0" style={{ flex: 1 }}>Internships ({opportunities.internships.length})</h2>
                         <span className="material-icons" style={{
                             transform: expanded.internships ? 'rotate(180deg)' : 'rotate(0deg)',
                             transition: 'transform 0.3s ease'
@@ -318,8 +357,8 @@ export default function ApplicantPage() {
 
                     {expanded.internships && (
                         <div className="grid grid-3">
-                            {filtered.internships.length > 0 ? (
-                                filtered.internships.map((internship) => {
+                            {opportunities.internships.length > 0 ? (
+                                opportunities.internships.map((internship) => {
                                     const isHighlighted = highlightedType === 'internship' && highlightedId === internship.id;
                                     return (
                                         <Card
@@ -380,6 +419,17 @@ export default function ApplicantPage() {
                             )}
                         </div>
                     )}
+                    {expanded.internships && cursors.internships && (
+                        <div style={{ textAlign: 'center', marginTop: '1rem' }}>
+                            <button
+                                onClick={() => loadMore('internships')}
+                                className="premium-btn-secondary"
+                                disabled={loadingMore}
+                            >
+                                {loadingMore ? 'Loading...' : 'Load more'}
+                            </button>
+                        </div>
+                    )}
                 </div>
             )}
 
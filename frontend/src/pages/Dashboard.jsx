@@ -27,10 +27,10 @@ export default function Dashboard() {
                 const statsResponse = await adminAPI.getStats();
                 setStats(statsResponse.data);
             }
-            const hackathonsResponse = await hackathonsAPI.getAll({ status: 'approved', sort_by: 'created_at', order: 'desc' });
-            setRecentHackathons(hackathonsResponse.data.slice(0, 6));
-            const internshipsResponse = await internshipsAPI.getAll({ status: 'approved', sort_by: 'created_at', order: 'desc' });
-            setRecentInternships(internshipsResponse.data.slice(0, 6));
+            const hackathonsResponse = await hackathonsAPI.getAll({ status: 'approved', sort_by: 'created_at', order: 'desc', limit: 6 });
+            setRecentHackathons(hackathonsResponse.data.items);
+            const internshipsResponse = await internshipsAPI.getAll({ status: 'approved', sort_by: 'created_at', order: 'desc', limit: 6 });
+            setRecentInternships(internshipsResponse.data.items);
         } catch (error) {
             console.error('Error fetching data:', error);
         } finally {
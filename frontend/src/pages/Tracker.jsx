@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { trackerAPI } from '../services/api';
 import Card, { CardHeader, CardBody, CardFooter } from '../components/Card';
 import Popup from '../components/Popup';
@@ -25,9 +25,12 @@ export default function Tracker() {
     });
     const [popup, setPopup] = useState({ isOpen: false, title: '', message: '', type: 'info' });
     const [matchingItems, setMatchingItems] = useState({}); // Tracking which item IDs are currently matching
+    const [matchJob, setMatchJob] = useState(null); // Batch "Analyze All" job progress
+    const matchJobTimer = useRef(null);
 
     useEffect(() => {
         fetchTrackedItems();
+        return () => clearTimeout(matchJobTimer.current);
     }, []);
 
     const toggleSection = (sectionId) => {
@@ -128,6 +131,51 @@ export default function Tracker() {
         }
     };
 
+    const applyMatchResults = (results) => {
+        setItems(prev => prev.map(item =>
+            results[item.id] ? { ...item, ...results[item.id] } : item
+        ));
+    };
+
+    const pollMatchJob = async (jobId) => {
+        try {
+            const response = await trackerAPI.getMatchJob(jobId);
+            const job = response.data;
+            setMatchJob(job);
+            applyMatchResults(job.results);
+            if (job.status === 'queued' || job.status === 'running') {
+                matchJobTimer.current = setTimeout(() => pollMatchJob(jobId), 2000);
+            } else if (job.status === 'failed') {
+                setPopup({ isOpen: true, title: 'AI Error', message: job.error || 'Batch scoring failed.', type: 'error' });
+            } else if (job.status === 'partial') {
+                setPopup({ isOpen: true, title: 'Partially Analyzed', message: job.error, type: 'info' });
+            }
+        } catch (err) {
+            console.error('Error polling match job:', err);
+            setMatchJob(null);
+        }
+    };
+
+    const handleMatchAll = async () => {
+        try {
+            const response = await trackerAPI.matchAll({ only_missing: false });
+            const job = response.data.job;
+            if (!job) {
+                setPopup({ isOpen: true, title: 'Nothing to Analyze', message: response.data.message, type: 'info' });
+                return;
+            }
+            setMatchJob(job);
+            clearTimeout(matchJobTimer.current);
+            pollMatchJob(job.id);
+        } catch (err) {
+            console.error('Error starting batch match:', err);
+            const errorMsg = err.response?.data?.error || 'Failed to start batch match scoring.';
+            setPopup({ isOpen: true, title: 'AI Error', message: errorMsg, type: 'error' });
+        }
+    };
+
+    const isMatchJobActive = matchJob && (matchJob.status === 'queued' || matchJob.status === 'running');
+
     const renderCard = (item) => {
         const { event_details, event_type, id, status, match_score, match_explanation } = item;
         if (!event_details || event_details.deleted || event_details.global_status === 'rejected') return null;
@@ -217,6 +265,11 @@ export default function Tracker() {
             <header className="tracker-header">
                 <h1>Application Tracker</h1>
                 <p>Manage your journey from discovery to offer.</p>
+                <button className="mini-btn match-all-btn" onClick={handleMatchAll} disabled={isMatchJobActive}>
+                    {isMatchJobActive
+                        ? `Analyzing ${matchJob.scored}/${matchJob.total}...`
+                        : 'Analyze All Matches'}
+                </button>
             </header>
 
             <div className="tracker-rows">
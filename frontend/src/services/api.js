@@ -101,7 +101,8 @@ export const adminAPI = {
     bulkAction: (data) => api.post('/admin/bulk-action', data),
     purgeAll: (type) => api.delete(`/admin/purge-all?type=${type}`),
     autoApprove: () => api.post('/admin/auto-approve'),
-    purgeExpired: () => api.post('/admin/purge-expired'),
+    purgeExpired: (full = false) => api.post(`/admin/purge-expired${full ? '?full=true' : ''}`),
+    getJob: (jobId) => api.get(`/scanner/jobs/${jobId}`),
     undoPurge: () => api.post('/admin/undo-purge'),
     getAutoApproveStatus: () => api.get('/admin/auto-approve/status'),
     toggleAutoApprove: (enabled) => api.post('/admin/auto-approve/toggle', { enabled }),
@@ -125,6 +126,8 @@ export const notificationsAPI = {
     getUnreadCount: () => api.get('/notifications/unread-count'),
     markAsRead: (id) => api.put(`/notifications/${id}/read`),
     markAllAsRead: () => api.put('/notifications/mark-all-read'),
+    // EventSource can't send headers, so the token goes in the query string
+    streamUrl: () => `${api.defaults.baseURL}/notifications/stream?jwt=${encodeURIComponent(localStorage.getItem('token') || '')}`,
 };
 
 // Tracker API
@@ -134,6 +137,10 @@ export const trackerAPI = {
     update: (id, data) => api.patch(`/tracker/${id}`, data),
     delete: (id) => api.delete(`/tracker/${id}`),
     calculateMatch: (id) => api.post(`/tracker/${id}/match`),
+    matchAll: (data) => api.post('/tracker/match-all', data),
+    getMatchJob: (jobId) => api.get(`/tracker/match-all/${jobId}`),
+    bestMatches: (params) => api.get('/tracker/best-matches', { params }),
+    recommended: (params) => api.get('/tracker/recommended', { params }),
 };
 
 export default api;